@@ -0,0 +1,60 @@
+"""
+Mede o tempo de importação a frio dos scripts de ingestão (JSON -> CSV).
+
+Cada medição roda em um interpretador novo. O script falha (código de saída 1)
+se a mediana passar do orçamento ou se algum módulo puxar o matplotlib, o que
+indica que uma constante voltou a ser importada de src.charts_common.
+
+Uso (na raiz do repositório):
+    python benchmarks/cold_start.py [--repeat N] [--budget SEGUNDOS]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = ["process_lighthouse", "generate_consolidated_csv", "run_pipeline"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "matplotlib": "matplotlib" in sys.modules}}))
+"""
+
+
+def measure(module: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tempo de importação dos scripts de ingestão")
+    parser.add_argument("--repeat", type=int, default=5, help="medições por módulo (padrão: 5)")
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="orçamento da mediana em segundos (padrão: 0.5)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        samples = [measure(module) for _ in range(args.repeat)]
+        median = statistics.median(s["seconds"] for s in samples)
+        loads_mpl = any(s["matplotlib"] for s in samples)
+        ok = median <= args.budget and not loads_mpl
+        failed |= not ok
+        print(f"{module:28s} {median * 1000:7.1f} ms  matplotlib={'sim' if loads_mpl else 'não'}  "
+              f"{'OK' if ok else 'FALHOU'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
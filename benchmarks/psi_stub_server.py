@@ -0,0 +1,179 @@
+"""
+Servidor HTTP local que imita a API do PageSpeed Insights com relatórios
+prontos, para testar collect_pagespeed.py sem gastar cota.
+
+Responde a GET .../runPagespeed?url=...&strategy=... com um relatório de
+--reports (padrão: data/PageSpeed) da mesma URL e estratégia (ou, sem um, de
+qualquer página da estratégia, com a URL trocada) e fetchTime do momento da
+resposta. Simula a latência da API (--latency), falhas do Lighthouse
+(--error-rate, HTTP 500) e a cota (--quota req/s, HTTP 429 com Retry-After).
+Ao encerrar (Ctrl+C ou SIGTERM), imprime quantas requisições atendeu,
+conexões abertas e o pico de requisições simultâneas.
+
+Uso (na raiz do repositório):
+    python benchmarks/psi_stub_server.py --port 8765 --latency 2 --quota 10
+"""
+import argparse
+import collections
+import gzip
+import json
+import random
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+
+class CannedReports:
+    """Relatórios por (URL, estratégia), lidos uma vez na inicialização."""
+
+    def __init__(self, root: Path):
+        self.by_key = collections.defaultdict(list)
+        self.by_strategy = collections.defaultdict(list)
+        for path in sorted(Path(root).rglob("*.json")):
+            report = json.loads(path.read_text(encoding="utf-8"))
+            strategy = report.get("configSettings", {}).get("formFactor", "desktop")
+            self.by_key[(report.get("requestedUrl"), strategy)].append(report)
+            self.by_strategy[strategy].append(report)
+        self._lock = threading.Lock()
+        self._last_fetch = datetime.min.replace(tzinfo=timezone.utc)
+
+    def _fetch_time(self) -> str:
+        # fetchTime único por resposta: os nomes dos arquivos dependem dele.
+        with self._lock:
+            now = max(datetime.now(timezone.utc), self._last_fetch + timedelta(milliseconds=1))
+            self._last_fetch = now
+        return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
+
+    def report(self, url: str, strategy: str):
+        candidates = self.by_key.get((url, strategy)) or self.by_strategy.get(strategy)
+        if not candidates:
+            return None
+        report = dict(random.choice(candidates))
+        report["fetchTime"] = self._fetch_time()
+        report["requestedUrl"] = report["finalUrl"] = report["finalDisplayedUrl"] = url
+        return report
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, reports: CannedReports, latency: float, error_rate: float, quota: float):
+        super().__init__(address, StubHandler)
+        self.reports = reports
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota = quota
+        self.lock = threading.Lock()
+        self.recent = collections.deque()
+        self.counts = collections.Counter()
+        self.active = 0
+        self.peak_active = 0
+
+    def handle_error(self, request, client_address):
+        # Cliente que desiste no meio da resposta (ex.: coletor interrompido) não é erro do servidor.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def over_quota(self) -> bool:
+        """Janela deslizante de 1 s: acima de `quota` requisições, responde 429."""
+        if not self.quota:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] > 1:
+                self.recent.popleft()
+            if len(self.recent) >= self.quota:
+                return True
+            self.recent.append(now)
+            return False
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.counts["conexões"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: dict, headers=None):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body, 1)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+        try:
+            query = parse_qs(urlsplit(self.path).query)
+            url = query.get("url", [""])[0]
+            strategy = query.get("strategy", ["desktop"])[0].lower()
+            if server.over_quota():
+                server.counts["429"] += 1
+                self._send(429, {"error": {"code": 429, "message": "Quota exceeded"}}, {"Retry-After": "1"})
+                return
+            if server.latency:
+                time.sleep(random.uniform(0.5, 1.5) * server.latency)
+            if random.random() < server.error_rate:
+                server.counts["500"] += 1
+                self._send(500, {"error": {"code": 500, "message": "Lighthouse returned error: FAILED_DOCUMENT_REQUEST"}})
+                return
+            report = server.reports.report(url, strategy)
+            if report is None:
+                server.counts["400"] += 1
+                self._send(400, {"error": {"code": 400, "message": f"sem relatório para {strategy}"}})
+                return
+            server.counts["200"] += 1
+            self._send(200, {"kind": "pagespeedonline#result", "id": url, "lighthouseResult": report,
+                             "analysisUTCTimestamp": report["fetchTime"]})
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reports", type=Path, default=Path("data/PageSpeed"),
+                        help="diretório com os relatórios servidos (padrão: data/PageSpeed)")
+    parser.add_argument("--latency", type=float, default=0.0, help="latência média por relatório, em s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas HTTP 500")
+    parser.add_argument("--quota", type=float, default=0.0, help="requisições por segundo antes do HTTP 429")
+    args = parser.parse_args()
+
+    reports = CannedReports(args.reports)
+    server = StubServer(("127.0.0.1", args.port), reports, args.latency, args.error_rate, args.quota)
+    print(f"Servindo {sum(len(r) for r in reports.by_key.values())} relatórios em "
+          f"http://127.0.0.1:{args.port}/pagespeedonline/v5/runPagespeed", flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        print(f"Respostas: {dict(server.counts)}; pico de {server.peak_active} requisições simultâneas")
+
+
+if __name__ == "__main__":
+    main()
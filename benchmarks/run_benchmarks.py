@@ -0,0 +1,200 @@
+"""
+Benchmark ponta a ponta do pipeline sobre um corpus sintético.
+
+Gera (ou reaproveita) um corpus com benchmarks/synthetic_corpus.py em um
+diretório de trabalho e mede separadamente cada etapa, rodando de dentro desse
+diretório (data/, results/ e figs/ são caminhos relativos):
+
+- scan: list_page_files para todos os módulos/apps (scan_corpus);
+- extract: extract_runs sem cache (decodificação dos JSONs);
+- run_table: gravação da tabela de execuções (results/runs.npy);
+- process_app_module: CSVs por página (process_lighthouse);
+- process_module: CSVs consolidados (generate_consolidated_csv);
+- read_results: ResultsStore.load (a partir de results/runs.npy);
+- read_scores / read_performance: leitura dos CSVs por página (o caminho de
+  ResultsStore quando não há results/runs.npy);
+- charts_<gerador>: cada um dos cinco geradores descrevendo as suas figuras
+  (como as etapas de generate_charts.py);
+- charts_render: rasterização (render_plots, sem manifesto).
+
+Com --apps N o corpus tem N apps (os de src/config.py e, além deles, app-4,
+app-5...) e as etapas percorrem esses apps. Os CSVs consolidados e os
+gráficos entre apps continuam com as colunas dos apps de src/config.py.
+
+O resultado sai em JSON (--output). Com --baseline, cada etapa é comparada com
+um JSON anterior e o script sai com código 1 se alguma ficar mais lenta que a
+tolerância.
+
+Uso (na raiz do repositório):
+    python benchmarks/run_benchmarks.py --files 1000 --output bench.json
+    python benchmarks/run_benchmarks.py --files 1000 --baseline bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import synthetic_corpus  # noqa: E402
+
+
+def _timed(stages: dict, name: str, items: Optional[int], func, *args, **kwargs):
+    """Mede `func`; com items=None, os itens são len() do resultado."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    if items is None:
+        items = len(result)
+    stages[name] = {"seconds": round(seconds, 4), "items": items,
+                    "items_per_s": round(items / seconds, 1) if seconds > 0 else None}
+    print(f"  {name:26s} {seconds:8.3f} s  ({items} itens)")
+    return result
+
+
+def run_stages(jobs: int = 1, render: bool = True, apps: Optional[Sequence[str]] = None) -> dict:
+    """Mede as etapas no diretório atual (que precisa ter data/), para `apps` (padrão: os de src/config.py)."""
+    # Importados aqui para que o tempo de importação não entre na primeira etapa medida.
+    import generate_consolidated_csv
+    import process_lighthouse
+    from src import (generate_app_summary_chart, generate_compartive_charts,
+                     generate_module_summary_chart, generate_overall_category_chart,
+                     generate_overall_performance_chart)
+    from src.charts_common import ResultsStore, collect_plots, read_performance, read_scores, render_plots
+    from src.config import APPS, MODULES
+    from src.data_loader import corpus_files, extract_runs, scan_corpus
+    from src.run_table import write_run_table
+
+    apps = list(apps or APPS)
+    stages = {}
+    corpus = _timed(stages, "scan", len(apps) * len(MODULES), scan_corpus, apps=apps)
+    files = corpus_files(corpus)
+    runs = dict(zip(files, _timed(stages, "extract", len(files), extract_runs, files, jobs=jobs)))
+    _timed(stages, "run_table", len(files), write_run_table, corpus, runs)
+
+    def per_page():
+        for app in apps:
+            for module in MODULES:
+                process_lighthouse.process_app_module(app, module, runs, corpus[(module, app)])
+
+    def consolidated():
+        # Os CSVs consolidados têm uma coluna por app de src/config.py; os ausentes do corpus ficam vazios.
+        full = {**{(module, app): {} for module in MODULES for app in APPS}, **corpus}
+        for module, (metrics_csv, scores_csv) in generate_consolidated_csv.OUTPUTS.items():
+            generate_consolidated_csv.process_module(module, metrics_csv, scores_csv, runs, full)
+
+    _timed(stages, "process_app_module", len(files), per_page)
+    _timed(stages, "process_module", len(files), consolidated)
+
+    n_pages = sum(len(pages) for pages in corpus.values())
+    store = _timed(stages, "read_results", n_pages, ResultsStore.load)
+    _timed(stages, "read_scores", None, read_scores)
+    _timed(stages, "read_performance", None, read_performance)
+
+    plots = []
+    with collect_plots() as collected:
+        for name, generator in (("charts_comparative", generate_compartive_charts),
+                                ("charts_app_summary", generate_app_summary_chart),
+                                ("charts_module_summary", generate_module_summary_chart),
+                                ("charts_overall_category", generate_overall_category_chart),
+                                ("charts_overall_performance", generate_overall_performance_chart)):
+            def describe(generator=generator):
+                before = len(collected)
+                generator.main(store)
+                return collected[before:]
+
+            plots.extend(_timed(stages, name, None, describe))
+    if render:
+        _timed(stages, "charts_render", len(plots), render_plots, plots, jobs=jobs)
+    return stages
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta: float = 0.05) -> list:
+    """
+    Etapas em que o tempo passou de baseline * (1 + tolerance). Diferenças
+    absolutas abaixo de `min_delta` segundos são tratadas como ruído.
+    """
+    regressions = []
+    for name, stage in current["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if (previous and stage["seconds"] > previous["seconds"] * (1 + tolerance)
+                and stage["seconds"] - previous["seconds"] >= min_delta):
+            regressions.append((name, previous["seconds"], stage["seconds"]))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline sobre um corpus sintético.")
+    parser.add_argument("--files", type=int, default=1000, help="relatórios no corpus (padrão: 1000)")
+    parser.add_argument("--apps", type=int, default=len(synthetic_corpus.APPS),
+                        help=f"apps no corpus (padrão: {len(synthetic_corpus.APPS)}, os de src/config.py)")
+    parser.add_argument("--pages", type=int, default=4, help="páginas por app (padrão: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="semente do corpus (padrão: 0)")
+    parser.add_argument("--screenshot-kb", type=int, default=70,
+                        help="KB de capturas de tela por relatório (padrão: 70)")
+    parser.add_argument("--jobs", type=int, default=1, help="processos para extração e rasterização")
+    parser.add_argument("--workdir", type=Path,
+                        help="diretório do corpus; reaproveitado se já tiver data/ (padrão: temporário)")
+    parser.add_argument("--no-render", action="store_true", help="não mede a rasterização dos gráficos")
+    parser.add_argument("--output", type=Path, help="grava o resultado em JSON neste arquivo")
+    parser.add_argument("--baseline", type=Path, help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="aumento relativo tolerado por etapa (padrão: 0.2 = 20%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="diferença mínima em segundos para contar como regressão (padrão: 0.05)")
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="tcc-bench-"))
+    corpus_info = None
+    if not (workdir / "data").exists():
+        print(f"Gerando {args.files} relatórios em {workdir}...")
+        start = time.perf_counter()
+        corpus_info = synthetic_corpus.generate(workdir, args.files, args.pages, args.seed, args.screenshot_kb,
+                                                apps=args.apps)
+        corpus_info["generate_seconds"] = round(time.perf_counter() - start, 2)
+
+    previous_cwd = Path.cwd()
+    os.chdir(workdir)
+    try:
+        print("Etapas:")
+        stages = run_stages(jobs=args.jobs, render=not args.no_render, apps=synthetic_corpus.app_names(args.apps))
+    finally:
+        os.chdir(previous_cwd)
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "corpus": corpus_info or {"workdir": str(workdir)},
+        "jobs": args.jobs,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "stages": stages,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Resultado gravado em {args.output}")
+
+    if args.baseline:
+        regressions = compare(result, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance,
+                              args.min_delta)
+        for name, before, after in regressions:
+            print(f"REGRESSÃO {name}: {before:.3f} s -> {after:.3f} s")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Gera um corpus sintético de relatórios Lighthouse/PageSpeed no mesmo layout de
+data/ (data/<modulo>/<app>/<pagina>/[mobile/]*.json), para medir como o
+pipeline escala com 1k, 10k ou 100k arquivos.
+
+Os relatórios seguem o esquema do Lighthouse 13: auditorias de métricas com
+numericValue/score/scoringOptions, diagnostics, network-requests, categorias
+com auditRefs e pesos, além das cargas que dominam o tamanho real dos arquivos
+(screenshot-thumbnails, final-screenshot, fullPageScreenshot em base64 e
+auditorias/i18n de texto). Como nos dados reais, o módulo Lighthouse grava JSON
+indentado com nomes <host>-<AAAAMMDDTHHMMSS>.json e o PageSpeed grava JSON
+compacto com nomes https-<url>-<plataforma>-<ISO>.json.
+
+Os módulos são os de src/config.py. Os apps também, por padrão; com --apps N
+o corpus tem os N primeiros deles ou, passando do total, app-4, app-5... além
+dos configurados. Para o pipeline percorrer esses apps extras, passe a lista
+de app_names(N) em `apps` (scan_corpus/load_runs), como faz
+benchmarks/run_benchmarks.py. A escala vem do número de arquivos, de apps e de
+páginas por app.
+
+Uso (na raiz do repositório):
+    python benchmarks/synthetic_corpus.py DESTINO --files 10000 [--apps 3] [--pages 4] [--seed 0]
+"""
+import argparse
+import base64
+import json
+import math
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import APPS, CATEGORIES, MODULES  # noqa: E402
+
+LIGHTHOUSE_VERSION = "13.0.1"
+START_TIME = datetime(2026, 1, 6, 12, 0, 0, tzinfo=timezone.utc)
+
+HOSTS = {
+    "ufc-hub": "ufc-hub.vercel.app",
+    "sigaa": "si3.ufc.br",
+    "ufc-noticias": "www.ufc.br",
+}
+
+USER_AGENTS = {
+    "desktop": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+               "(KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+    "mobile": "Mozilla/5.0 (Linux; Android 11; moto g power (2022)) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/143.0.0.0 Mobile Safari/537.36",
+}
+
+# Curvas log-normais (p10, mediana) das métricas do Lighthouse 10+.
+SCORING = {
+    "desktop": {
+        "first-contentful-paint": (934, 1600),
+        "speed-index": (1311, 2300),
+        "largest-contentful-paint": (1200, 2400),
+        "total-blocking-time": (150, 350),
+        "cumulative-layout-shift": (0.1, 0.25),
+    },
+    "mobile": {
+        "first-contentful-paint": (1800, 3000),
+        "speed-index": (3387, 5800),
+        "largest-contentful-paint": (2500, 4000),
+        "total-blocking-time": (200, 600),
+        "cumulative-layout-shift": (0.1, 0.25),
+    },
+}
+
+PERFORMANCE_REFS = [
+    ("first-contentful-paint", 10, "FCP"),
+    ("largest-contentful-paint", 25, "LCP"),
+    ("total-blocking-time", 30, "TBT"),
+    ("cumulative-layout-shift", 25, "CLS"),
+    ("speed-index", 10, "SI"),
+]
+
+# Valores típicos (mediana) por plataforma; cada página/execução varia em torno deles.
+TYPICAL = {
+    "desktop": {"ttfb": 120, "fcp": 700, "lcp": 1100, "si": 1300, "tbt": 40, "cls": 0.02},
+    "mobile": {"ttfb": 450, "fcp": 2200, "lcp": 3500, "si": 4200, "tbt": 250, "cls": 0.05},
+}
+
+TEXT_AUDITS = 140
+RESOURCE_TYPES = ["Script", "Stylesheet", "Image", "Font", "XHR", "Fetch", "Other"]
+
+
+def log_normal_score(value: float, p10: float, median: float) -> float:
+    """Score do Lighthouse para uma métrica (curva log-normal complementar)."""
+    if value <= 0:
+        return 1.0
+    shape = abs(math.log(p10 / median)) / (math.sqrt(2) * 0.9061938024368232)
+    standardized = (math.log(value) - math.log(median)) / (math.sqrt(2) * shape)
+    score = 0.5 * math.erfc(standardized)
+    return round(min(max(score, 0.0), 1.0), 2)
+
+
+class PayloadPool:
+    """Bytes aleatórios em base64; cada relatório recorta um trecho diferente."""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.data = base64.b64encode(rng.randbytes(size * 3 // 4 + 3)).decode("ascii")[:size]
+        self.rng = rng
+
+    def image(self, size: int) -> str:
+        size = max(16, min(size, len(self.data)))
+        start = self.rng.randrange(0, len(self.data) - size + 1)
+        return "data:image/jpeg;base64,/9j/4AAQ" + self.data[start:start + size]
+
+
+def _metric_audit(audit_id: str, title: str, value: float, unit: str, form_factor: str) -> dict:
+    p10, median = SCORING[form_factor][audit_id]
+    display = f"{value:.3f}" if unit == "unitless" else f"{value / 1000:.1f} s"
+    return {
+        "id": audit_id,
+        "title": title,
+        "description": f"{title} (relatório sintético).",
+        "score": log_normal_score(value, p10, median),
+        "scoreDisplayMode": "numeric",
+        "displayValue": display,
+        "numericValue": value,
+        "numericUnit": unit,
+        "scoringOptions": {"p10": p10, "median": median},
+    }
+
+
+def _network_items(rng: random.Random, url: str, host: str, document_size: int, n_requests: int):
+    items = [{
+        "url": url, "protocol": "h2", "networkRequestTime": 1.3, "networkEndTime": 180.0,
+        "transferSize": document_size, "resourceSize": document_size * 3, "statusCode": 200,
+        "mimeType": "text/html", "resourceType": "Document", "priority": "VeryHigh",
+        "entity": host, "finished": True, "experimentalFromMainFrame": True,
+        "sessionTargetType": "page", "rendererStartTime": 0,
+    }]
+    for i in range(1, n_requests):
+        resource_type = rng.choice(RESOURCE_TYPES)
+        transfer = int(rng.lognormvariate(9, 1.2))
+        start = rng.uniform(5, 2500)
+        items.append({
+            "url": f"https://{host}/static/{resource_type.lower()}/{i}-{rng.getrandbits(32):08x}",
+            "protocol": "h2", "networkRequestTime": start, "networkEndTime": start + rng.uniform(5, 400),
+            "transferSize": transfer, "resourceSize": transfer * 2, "statusCode": 200,
+            "mimeType": "application/octet-stream", "resourceType": resource_type, "priority": "Low",
+            "entity": host, "finished": True, "experimentalFromMainFrame": True,
+            "sessionTargetType": "page", "rendererStartTime": start - 1,
+        })
+    return items
+
+
+def make_report(rng: random.Random, pool: PayloadPool, app: str, page: str, form_factor: str,
+                fetch_time: datetime, page_factor: float, screenshot_kb: int) -> dict:
+    """Um relatório no esquema do Lighthouse 13 para app/página/plataforma."""
+    host = HOSTS.get(app, f"{app}.example.org")
+    url = f"https://{host}/{page}"
+    typical = TYPICAL[form_factor]
+
+    def draw(key: str) -> float:
+        return typical[key] * page_factor * rng.lognormvariate(0, 0.25)
+
+    ttfb, fcp, tbt = draw("ttfb"), draw("fcp"), draw("tbt")
+    lcp = max(fcp, draw("lcp"))
+    si = max(fcp, draw("si"))
+    cls = round(typical["cls"] * page_factor * rng.lognormvariate(0, 0.8), 6)
+
+    n_requests = max(5, int(rng.gauss(45, 15)))
+    network = _network_items(rng, url, host, int(rng.uniform(8e3, 40e3)), n_requests)
+    total_bytes = sum(item["transferSize"] for item in network)
+
+    audits = {
+        "server-response-time": {
+            "id": "server-response-time", "title": "Initial server response time was short",
+            "description": "Keep the server response time for the main document short.",
+            "score": 1 if ttfb < 600 else 0, "scoreDisplayMode": "metricSavings",
+            "numericValue": ttfb, "numericUnit": "millisecond",
+            "displayValue": f"Root document took {ttfb:.0f} ms",
+            "details": {"type": "opportunity", "items": [{"url": url, "responseTime": ttfb}],
+                        "overallSavingsMs": max(0.0, ttfb - 600)},
+        },
+        "first-contentful-paint": _metric_audit("first-contentful-paint", "First Contentful Paint",
+                                                fcp, "millisecond", form_factor),
+        "largest-contentful-paint": _metric_audit("largest-contentful-paint", "Largest Contentful Paint",
+                                                  lcp, "millisecond", form_factor),
+        "total-blocking-time": _metric_audit("total-blocking-time", "Total Blocking Time",
+                                             tbt, "millisecond", form_factor),
+        "cumulative-layout-shift": _metric_audit("cumulative-layout-shift", "Cumulative Layout Shift",
+                                                 cls, "unitless", form_factor),
+        "speed-index": _metric_audit("speed-index", "Speed Index", si, "millisecond", form_factor),
+        "diagnostics": {
+            "id": "diagnostics", "title": "Diagnostics", "description": "Collection of useful page vitals.",
+            "score": 1, "scoreDisplayMode": "informative",
+            "details": {"type": "debugdata", "items": [{
+                "numRequests": n_requests, "numScripts": n_requests // 3, "numStylesheets": 3,
+                "numFonts": 2, "numTasks": int(rng.uniform(800, 4000)), "numTasksOver10ms": 8,
+                "numTasksOver25ms": 4, "numTasksOver50ms": 1, "numTasksOver100ms": 0,
+                "numTasksOver500ms": 0, "rtt": 1.0, "throughput": 1.2e10, "maxRtt": 15.8,
+                "maxServerLatency": 1, "totalByteWeight": total_bytes,
+                "totalTaskTime": rng.uniform(200, 2000), "mainDocumentTransferSize": network[0]["transferSize"],
+            }]},
+        },
+        "network-requests": {
+            "id": "network-requests", "title": "Network Requests",
+            "description": "Lists the network requests that were made during page load.",
+            "score": 1, "scoreDisplayMode": "informative",
+            "details": {"type": "table", "headings": [], "items": network},
+        },
+    }
+
+    # Cargas em base64 nas mesmas proporções dos relatórios reais.
+    budget = screenshot_kb * 1024
+    frames = [{"timing": int(si * (i + 1) / 8), "timestamp": 96391740618 + i * 375000,
+               "data": pool.image(int(budget * 0.6 / 8))} for i in range(8)]
+    audits["screenshot-thumbnails"] = {
+        "id": "screenshot-thumbnails", "title": "Screenshot Thumbnails",
+        "description": "This is what the load of your site looked like.", "score": 1,
+        "scoreDisplayMode": "informative",
+        "details": {"type": "filmstrip", "scale": int(si), "items": frames},
+    }
+    audits["final-screenshot"] = {
+        "id": "final-screenshot", "title": "Final Screenshot",
+        "description": "The last screenshot captured of the pageload.", "score": 1,
+        "scoreDisplayMode": "informative",
+        "details": {"type": "screenshot", "timing": int(lcp), "timestamp": 96392107219,
+                    "data": pool.image(int(budget * 0.17))},
+    }
+    for i in range(TEXT_AUDITS):
+        audits[f"synthetic-audit-{i}"] = {
+            "id": f"synthetic-audit-{i}", "title": f"Synthetic audit {i}",
+            "description": "Auditoria de preenchimento com o tamanho médio das auditorias reais. " * 8,
+            "score": rng.choice([0, 0.5, 1, None]), "scoreDisplayMode": "binary",
+            "details": {"type": "table", "headings": [], "items": []},
+        }
+
+    performance = sum(audits[ref]["score"] * weight for ref, weight, _ in PERFORMANCE_REFS) / 100
+    categories = {
+        "performance": {
+            "title": "Performance", "id": "performance", "score": round(performance, 2),
+            "auditRefs": [{"id": ref, "weight": weight, "group": "metrics", "acronym": acronym}
+                          for ref, weight, acronym in PERFORMANCE_REFS],
+        },
+    }
+    for category in CATEGORIES[1:]:
+        categories[category] = {
+            "title": category, "id": category,
+            "score": round(min(1.0, rng.betavariate(18, 2)), 2),
+            "auditRefs": [{"id": f"synthetic-audit-{i}", "weight": 1} for i in range(0, TEXT_AUDITS, 7)],
+        }
+
+    return {
+        "lighthouseVersion": LIGHTHOUSE_VERSION,
+        "requestedUrl": url,
+        "mainDocumentUrl": url,
+        "finalDisplayedUrl": url,
+        "finalUrl": url,
+        "fetchTime": fetch_time.strftime("%Y-%m-%dT%H:%M:%S.") + f"{fetch_time.microsecond // 1000:03d}Z",
+        "gatherMode": "navigation",
+        "runWarnings": [],
+        "userAgent": USER_AGENTS[form_factor],
+        "environment": {"networkUserAgent": USER_AGENTS[form_factor],
+                        "hostUserAgent": USER_AGENTS[form_factor], "benchmarkIndex": 4100},
+        "audits": audits,
+        "configSettings": {"output": "json", "formFactor": form_factor, "throttlingMethod": "simulate",
+                           "locale": "pt-BR", "onlyCategories": CATEGORIES},
+        "categories": categories,
+        "categoryGroups": {"metrics": {"title": "Metrics"}},
+        "stackPacks": [],
+        "entities": [{"name": host, "origins": [f"https://{host}"], "isFirstParty": True}],
+        "fullPageScreenshot": {
+            "screenshot": {"data": pool.image(int(budget * 0.23)), "width": 412, "height": 3200},
+            "nodes": {},
+        },
+        "timing": {"entries": [], "total": rng.uniform(8000, 20000)},
+        "i18n": {"rendererFormattedStrings": {},
+                 "icuMessagePaths": {f"core/audits/synthetic-audit-{i}.js | title":
+                                     [f"audits[synthetic-audit-{i}].title"] for i in range(TEXT_AUDITS)}},
+    }
+
+
+def report_filename(module: str, app: str, page: str, form_factor: str, fetch_time: datetime) -> str:
+    """Nome do arquivo no padrão de cada módulo (CLI do Lighthouse ou coletor do PageSpeed)."""
+    host = HOSTS.get(app, f"{app}.example.org")
+    if module == "Lighthouse":
+        return f"{host}-{fetch_time:%Y%m%dT%H%M%S}.json"
+    slug = f"https-{host.replace('.', '-')}{page.replace('-', '')}"
+    iso = fetch_time.strftime("%Y-%m-%dT%H-%M-%S-") + f"{fetch_time.microsecond // 1000:03d}Z"
+    return f"{slug}-{form_factor}-{iso}.json"
+
+
+def app_names(count: int) -> List[str]:
+    """Os `count` primeiros apps de src/config.py, completados com app-4, app-5... se preciso."""
+    return list(APPS[:count]) + [f"app-{i + 1}" for i in range(len(APPS), count)]
+
+
+def generate(dest: Path, files: int, pages: int = 4, seed: int = 0, screenshot_kb: int = 70,
+             apps: int = len(APPS)) -> dict:
+    """
+    Escreve `files` relatórios em dest/data, distribuídos igualmente entre
+    módulos, `apps` apps (ver app_names), páginas e plataformas. Retorna um
+    resumo do corpus gerado.
+    """
+    rng = random.Random(seed)
+    names = app_names(apps)
+    pool = PayloadPool(max(screenshot_kb, 1) * 1024 * 4, rng)
+    slots = [(module, app, f"page-{p}", form_factor)
+             for module in MODULES for app in names for p in range(pages)
+             for form_factor in ("desktop", "mobile")]
+    page_factors = {(app, f"page-{p}"): rng.uniform(0.6, 1.8) for app in names for p in range(pages)}
+
+    total_bytes = 0
+    for i in range(files):
+        module, app, page, form_factor = slots[i % len(slots)]
+        run = i // len(slots)
+        fetch_time = START_TIME + timedelta(seconds=20 * run, milliseconds=i % len(slots) * 7)
+        directory = dest / "data" / module / app / page
+        if form_factor == "mobile":
+            directory = directory / "mobile"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        report = make_report(rng, pool, app, page, form_factor, fetch_time,
+                             page_factors[(app, page)], screenshot_kb)
+        if module == "Lighthouse":
+            text = json.dumps(report, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(report, separators=(",", ":"), ensure_ascii=False)
+        path = directory / report_filename(module, app, page, form_factor, fetch_time)
+        path.write_text(text, encoding="utf-8")
+        total_bytes += len(text.encode("utf-8"))
+
+    return {"files": files, "pages_per_app": pages, "apps": len(names), "modules": len(MODULES),
+            "bytes": total_bytes, "seed": seed, "screenshot_kb": screenshot_kb}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera relatórios Lighthouse/PageSpeed sintéticos.")
+    parser.add_argument("dest", type=Path, help="diretório de destino (os JSONs vão para DESTINO/data)")
+    parser.add_argument("--files", type=int, default=1000, help="número de relatórios (padrão: 1000)")
+    parser.add_argument("--apps", type=int, default=len(APPS),
+                        help=f"número de apps (padrão: {len(APPS)}, os de src/config.py)")
+    parser.add_argument("--pages", type=int, default=4, help="páginas por app (padrão: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador (padrão: 0)")
+    parser.add_argument("--screenshot-kb", type=int, default=70,
+                        help="KB de capturas de tela em base64 por relatório (padrão: 70)")
+    args = parser.parse_args()
+
+    summary = generate(args.dest, args.files, args.pages, args.seed, args.screenshot_kb, apps=args.apps)
+    print(f"{summary['files']} relatórios ({summary['bytes'] / 1e6:.1f} MB) em {args.dest / 'data'}")
+
+
+if __name__ == "__main__":
+    main()
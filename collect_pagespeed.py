@@ -0,0 +1,89 @@
+"""
+Coleta relatórios do PageSpeed Insights para as páginas dos apps e os grava em
+data/PageSpeed/<app>/<página>/[mobile/], prontos para process_lighthouse.py.
+
+As requisições saem em paralelo (--concurrency conexões keep-alive), limitadas
+a --rate requisições por segundo (a cota da API; o padrão de 4/s corresponde a
+400 consultas por 100 s). Falhas temporárias (429, 5xx, rede) são repetidas
+com backoff exponencial. Cada job concluído vai para o checkpoint do lote
+(data/.psi_checkpoints/<lote>.jsonl): rodar de novo com o mesmo --batch retoma
+de onde parou.
+
+As páginas vêm de --targets (JSON com [{"app", "page", "url"}, ...]) ou, por
+padrão, das URLs dos relatórios já existentes em <--data-root>/PageSpeed/.
+
+Para testar sem a API, suba o servidor de exemplo e aponte --endpoint para ele:
+    python benchmarks/psi_stub_server.py --port 8765 &
+    python collect_pagespeed.py --endpoint http://127.0.0.1:8765/pagespeedonline/v5/runPagespeed --data-root /tmp/psi --targets benchmarks/psi_targets.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+from pathlib import Path
+from typing import List
+
+from src.config import APPS
+from src.data_loader import DATA_ROOT, INDEX_PATH, CorpusIndex
+from src.pagespeed import PSI_ENDPOINT, STRATEGIES, Checkpoint, Collector, Target, build_jobs
+
+
+def targets_from_corpus(apps: List[str], data_root: Path = DATA_ROOT) -> List[Target]:
+    """Uma URL por app/página, tirada dos relatórios do PageSpeed já coletados em `data_root`."""
+    targets = {}
+    with CorpusIndex(Path(data_root) / INDEX_PATH.name, root=data_root) as index:
+        for entry in index.entries(modules=["PageSpeed"], apps=apps):
+            if entry.final_url:
+                targets.setdefault((entry.app, entry.page), entry.final_url)
+    return [Target(app, page, url) for (app, page), url in targets.items()]
+
+
+def load_targets(path: Path, apps: List[str]) -> List[Target]:
+    targets = [Target(**item) for item in json.loads(path.read_text(encoding="utf-8"))]
+    return [target for target in targets if target.app in apps]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", type=Path, help="JSON com as páginas a coletar")
+    parser.add_argument("--apps", nargs="+", default=APPS, help="apps a coletar (padrão: todos)")
+    parser.add_argument("--strategies", nargs="+", default=STRATEGIES, choices=STRATEGIES)
+    parser.add_argument("--runs", type=int, default=5, help="execuções por página e estratégia (padrão: 5)")
+    parser.add_argument("--batch", default=date.today().isoformat(),
+                        help="nome do lote, usado no checkpoint (padrão: data de hoje)")
+    parser.add_argument("--data-root", type=Path, default=DATA_ROOT, help="raiz dos relatórios (padrão: data)")
+    parser.add_argument("--endpoint", default=PSI_ENDPOINT, help="URL da API (ou de um servidor de teste)")
+    parser.add_argument("--key", default=os.environ.get("PSI_API_KEY"),
+                        help="chave da API (padrão: variável PSI_API_KEY)")
+    parser.add_argument("--concurrency", type=int, default=16, help="conexões simultâneas (padrão: 16)")
+    parser.add_argument("--rate", type=float, default=4.0, help="requisições por segundo (padrão: 4)")
+    parser.add_argument("--burst", type=int, default=4, help="rajada máxima do limitador (padrão: 4)")
+    parser.add_argument("--max-attempts", type=int, default=5, help="tentativas por relatório (padrão: 5)")
+    args = parser.parse_args()
+
+    targets = load_targets(args.targets, args.apps) if args.targets else targets_from_corpus(args.apps, args.data_root)
+    if not targets:
+        print("Nenhuma página para coletar.")
+        return 1
+    jobs = build_jobs(targets, args.strategies, args.runs)
+    checkpoint = Checkpoint(args.data_root / ".psi_checkpoints" / f"{args.batch}.jsonl")
+    print(f"Lote {args.batch}: {len(targets)} páginas, {len(jobs)} relatórios "
+          f"({len(checkpoint.done)} já concluídos)")
+    collector = Collector(args.data_root, checkpoint, endpoint=args.endpoint, key=args.key,
+                          concurrency=args.concurrency, rate=args.rate, burst=args.burst,
+                          max_attempts=args.max_attempts)
+    try:
+        stats = asyncio.run(collector.run(jobs))
+    except KeyboardInterrupt:
+        print("Interrompido; rode de novo com o mesmo --batch para continuar.")
+        return 130
+    finally:
+        checkpoint.close()
+    print(stats.line())
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Compacta os relatórios de data/ em um arquivo por módulo/app
+(data/<módulo>/<app>.lharchive, ver src/archive.py), com índice para acesso
+aleatório a cada execução. Depois de gravar, extrai métricas e scores de cada
+membro e confere com a extração dos JSONs de origem; o arquivo só substitui o
+anterior se tudo bater.
+
+Com --drop-screenshots, as capturas de tela (base64) são removidas dos
+relatórios. Com --delete-raw, os JSONs soltos já arquivados são apagados.
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from src.archive import ARCHIVE_SUFFIX, archive_path, close_archives, drop_screenshots, write_archive
+from src.config import APPS, MODULES
+from src.data_loader import DATA_ROOT, CorpusIndex, extract_run, read_report_bytes
+
+
+def _extracted(filepath: Path):
+    run = extract_run(filepath)
+    if run is None:
+        return None
+    fields = asdict(run)
+    del fields["path"]
+    return fields
+
+
+def compact_app(module: str, app: str, index: CorpusIndex, drop: bool, level: int):
+    """
+    Grava o arquivo de um módulo/app e confere a extração membro a membro.
+    Retorna (relatórios, bytes de origem, bytes do arquivo, JSONs soltos arquivados)
+    ou None se não houver relatórios.
+    """
+    base = DATA_ROOT / module / app
+    reports, expected, raw_files = [], {}, []
+    source_bytes = 0
+    for page, files_by_platform in index.page_files(module, app).items():
+        for platform, files in files_by_platform.items():
+            for filepath in files:
+                sub = ("mobile",) if platform == "Mobile" else ()
+                name = "/".join((page, *sub, filepath.name))
+                # O JSON solto, se ainda existir, é a fonte; senão o membro do arquivo atual.
+                raw = base.joinpath(page, *sub, filepath.name)
+                source = raw if raw.exists() else filepath
+                if source == raw:
+                    raw_files.append(raw)
+                size, mtime_ns, fetch_time, final_url = index.stat(filepath)
+                content = read_report_bytes(source)
+                source_bytes += len(content)
+                if drop:
+                    report = drop_screenshots(json.loads(content))
+                    content = json.dumps(report, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                reports.append((name, content, mtime_ns, fetch_time, final_url))
+                expected[name] = _extracted(source)
+    if not reports:
+        return None
+
+    dest = archive_path(DATA_ROOT / module, app)
+    tmp = dest.with_name(f"{app}.tmp{ARCHIVE_SUFFIX}")
+    write_archive(tmp, reports, level=level, screenshots_dropped=drop)
+    mismatches = [name for name in expected if _extracted(tmp / name) != expected[name]]
+    # Nada fica aberto apontando para o temporário nem para o arquivo substituído.
+    close_archives(tmp)
+    close_archives(dest)
+    if mismatches:
+        tmp.unlink()
+        raise RuntimeError(f"{module}/{app}: extração diverge em {len(mismatches)} membros "
+                           f"(ex.: {mismatches[0]}); arquivo não gravado")
+    os.replace(tmp, dest)
+    return len(reports), source_bytes, dest.stat().st_size, raw_files
+
+
+def delete_raw(files) -> None:
+    """Apaga os JSONs soltos já arquivados e os diretórios que ficarem vazios."""
+    dirs = set()
+    for filepath in files:
+        filepath.unlink()
+        dirs.add(filepath.parent)
+    for directory in sorted(dirs, key=lambda d: len(d.parts), reverse=True):
+        for candidate in (directory, *directory.parents):
+            if candidate == DATA_ROOT or not candidate.exists() or any(candidate.iterdir()):
+                break
+            candidate.rmdir()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drop-screenshots", action="store_true",
+                        help="remove as capturas de tela dos relatórios arquivados")
+    parser.add_argument("--delete-raw", action="store_true",
+                        help="apaga os JSONs soltos depois de arquivados e conferidos")
+    parser.add_argument("--level", type=int, default=9, help="nível de compressão zlib (padrão: 9)")
+    parser.add_argument("--modules", nargs="+", default=MODULES, choices=MODULES)
+    parser.add_argument("--apps", nargs="+", default=APPS, choices=APPS)
+    args = parser.parse_args()
+
+    total_source = total_archive = 0
+    with CorpusIndex() as index:
+        for module in args.modules:
+            for app in args.apps:
+                try:
+                    result = compact_app(module, app, index, args.drop_screenshots, args.level)
+                except RuntimeError as exc:
+                    print(f"ERRO: {exc}")
+                    return 1
+                if result is None:
+                    continue
+                count, source_bytes, archive_bytes, raw_files = result
+                total_source += source_bytes
+                total_archive += archive_bytes
+                print(f"{module}/{app}: {count} relatórios, {source_bytes / 1e6:.1f} MB -> "
+                      f"{archive_bytes / 1e6:.1f} MB ({source_bytes / archive_bytes:.1f}x), extração conferida")
+                if args.delete_raw:
+                    delete_raw(raw_files)
+    if total_archive:
+        print(f"Total: {total_source / 1e6:.1f} MB -> {total_archive / 1e6:.1f} MB "
+              f"({total_source / total_archive:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
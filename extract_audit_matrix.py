@@ -0,0 +1,80 @@
+"""
+Extrai score e numericValue de todos os audits de cada execução para a matriz
+execuções × audits (results/audits.npz + results/audits.json) e imprime os
+audits mais reprovados por grupo ou os mais correlacionados com o score de
+performance.
+
+Com a matriz já gravada, --failing e --correlate só consultam a matriz, sem
+reler os relatórios (--extract força a reextração).
+
+Uso:
+    python extract_audit_matrix.py --jobs 4
+    python extract_audit_matrix.py --failing --by app --top 10
+    python extract_audit_matrix.py --correlate --module Lighthouse --platform Mobile
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from src.audit_matrix import AUDITS_PATH, PASS_THRESHOLD, AuditMatrix, write_audit_matrix
+from src.config import APPS, MODULES, PLATFORMS
+from src.data_loader import load_runs
+from src.run_table import CODE_FIELDS
+
+
+def print_failing(matrix: AuditMatrix, by, top: int, threshold: float):
+    keys, rates, n_runs = matrix.failure_rates(by, threshold)
+    for key, group_rates, count in zip(keys, rates, n_runs):
+        print(f"\n{' / '.join(key) or 'Todas as execuções'} ({count} execuções)")
+        for column in np.argsort(-group_rates, kind="stable")[:top]:
+            if group_rates[column] == 0:
+                break
+            print(f"  {group_rates[column] * 100:6.1f}%  {matrix.audits[column]}: {matrix.titles[column]}")
+
+
+def print_correlations(matrix: AuditMatrix, top: int, values: bool):
+    r = matrix.correlations(matrix="values" if values else "scores")
+    order = np.argsort(-np.abs(np.nan_to_num(r)), kind="stable")[:top]
+    print(f"Correlação com o score de performance ({len(matrix)} execuções, "
+          f"{'numericValue' if values else 'score'} dos audits)")
+    for column in order:
+        if np.isnan(r[column]):
+            break
+        print(f"  {r[column]:+.3f}  {matrix.audits[column]}: {matrix.titles[column]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1, help="processos para ler os relatórios (padrão: 1)")
+    parser.add_argument("--extract", action="store_true", help="reextrai a matriz mesmo que ela já exista")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--failing", action="store_true", help="audits mais reprovados em cada grupo")
+    query.add_argument("--correlate", action="store_true", help="audits mais correlacionados com a performance")
+    parser.add_argument("--by", nargs="*", default=["app"], choices=CODE_FIELDS,
+                        help="campos dos grupos de --failing (padrão: app)")
+    parser.add_argument("--threshold", type=float, default=PASS_THRESHOLD,
+                        help=f"score mínimo para aprovação (padrão: {PASS_THRESHOLD})")
+    parser.add_argument("--values", action="store_true", help="--correlate usa numericValue em vez do score")
+    parser.add_argument("--top", type=int, default=10, help="audits impressos por grupo (padrão: 10)")
+    parser.add_argument("--module", choices=MODULES)
+    parser.add_argument("--app", choices=APPS)
+    parser.add_argument("--platform", choices=PLATFORMS)
+    args = parser.parse_args()
+
+    matrix = None if args.extract or not (args.failing or args.correlate) else AuditMatrix.load()
+    if matrix is None:
+        corpus, runs = load_runs(jobs=args.jobs)
+        n_runs, n_audits = write_audit_matrix(corpus, runs, jobs=args.jobs)
+        print(f"Matriz de {n_runs} execuções × {n_audits} audits gravada em {AUDITS_PATH}")
+        matrix = AuditMatrix.load()
+    matrix = matrix.select(module=args.module, app=args.app, platform=args.platform)
+    if args.failing:
+        print_failing(matrix, args.by, args.top, args.threshold)
+    elif args.correlate:
+        print_correlations(matrix, args.top, args.values)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Extrai as requisições de rede (audit network-requests) de todas as execuções
+para results/network_requests.npy (+ .json com as strings internadas) e
+imprime agrupamentos por campos categóricos.
+
+A linha de cada requisição aponta para a execução correspondente em
+results/runs.npy (coluna `run`). Com a tabela já gravada, --rollup sem
+--extract só agrupa, sem reler os relatórios.
+
+Uso:
+    python extract_network_requests.py --jobs 4
+    python extract_network_requests.py --rollup app platform resource_type
+    python extract_network_requests.py --rollup domain --app sigaa --top 10
+"""
+import argparse
+import sys
+
+from src.config import APPS, MODULES, PLATFORMS
+from src.data_loader import load_runs
+from src.network_requests import LABEL_FIELDS, REQUESTS_PATH, STRING_FIELDS, NetworkRequests, write_requests_table
+
+ROLLUP_FIELDS = LABEL_FIELDS + [field for field in STRING_FIELDS if field != "url"] + ["url"]
+
+
+def print_rollup(table: NetworkRequests, by, top: int):
+    groups = table.rollup(by)
+    ordered = sorted(groups.items(), key=lambda item: item[1]["transfer_size"], reverse=True)[:top]
+    print(f"{' / '.join(by)} | requisições | execuções | KB transferidos | KB por execução")
+    for key, row in ordered:
+        print(f"{' / '.join(name or '-' for name in key)} | {row['requests']} | {row['runs']} | "
+              f"{row['transfer_size'] / 1024:.2f} | {row['transfer_size_per_run'] / 1024:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1, help="processos para ler os relatórios (padrão: 1)")
+    parser.add_argument("--extract", action="store_true",
+                        help="reextrai a tabela mesmo que ela já exista (padrão com --rollup: reaproveita)")
+    parser.add_argument("--rollup", nargs="+", choices=ROLLUP_FIELDS, metavar="CAMPO",
+                        help=f"campos do agrupamento: {', '.join(ROLLUP_FIELDS)}")
+    parser.add_argument("--top", type=int, default=20, help="grupos impressos, por bytes transferidos (padrão: 20)")
+    parser.add_argument("--module", choices=MODULES)
+    parser.add_argument("--app", choices=APPS)
+    parser.add_argument("--platform", choices=PLATFORMS)
+    args = parser.parse_args()
+
+    table = None if args.extract or not args.rollup else NetworkRequests.load()
+    if table is None:
+        corpus, runs = load_runs(jobs=args.jobs)
+        count = write_requests_table(corpus, runs, jobs=args.jobs)
+        print(f"{count} requisições gravadas em {REQUESTS_PATH}")
+        table = NetworkRequests.load()
+    if args.rollup:
+        table = table.select(module=args.module, app=args.app, platform=args.platform)
+        print_rollup(table, args.rollup, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,73 @@
 """
 Orquestra a geração de todos os gráficos do projeto em uma única execução,
 reutilizando os módulos em lib/.
+
+Os geradores apenas descrevem os gráficos; a rasterização acontece no final,
+em paralelo quando --jobs > 1 (cada processo usa o backend Agg). Gráficos cujas
+entradas não mudaram (figs/.manifest.json) são pulados, exceto com --force.
+
+Ao final é impressa uma tabela com tempo, CPU, leituras, figuras e memória de
+cada etapa (--report grava o mesmo resumo em JSON; --profile, um cProfile por etapa).
+Com --ci, os comparativos entre apps e o resumo de performance usam o IC de
+bootstrap da média como barra de erro, no lugar do desvio padrão.
 """
+import argparse
+
 from src import generate_compartive_charts
 from src import generate_app_summary_chart
 from src import generate_module_summary_chart
 from src import generate_overall_category_chart
 from src import generate_overall_performance_chart
+from src import instrumentation as instr
+from src.charts_common import FIGS_MANIFEST, ResultsStore, collect_plots, render_plots
 
+GENERATORS = [
+	("Gráficos comparativos por página/app/módulo", generate_compartive_charts),
+	("Resumos gerais por app", generate_app_summary_chart),
+	("Resumos por app e módulo", generate_module_summary_chart),
+	("Comparativo por categoria (Desktop/Mobile)", generate_overall_category_chart),
+	("Resumo geral de performance", generate_overall_performance_chart),
+]
+# Geradores que aceitam intervals=True (barras de erro com os IC de bootstrap).
+CI_GENERATORS = {generate_compartive_charts, generate_overall_performance_chart}
 
-def main() -> None:
-	print("[1/5] Gráficos comparativos por página/app/módulo...")
-	generate_compartive_charts.main()
 
-	print("[2/5] Resumos gerais por app...")
-	generate_app_summary_chart.main()
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Gera todos os gráficos em figs/.")
+	parser.add_argument("--jobs", type=int, default=1,
+						help="processos usados para rasterizar os gráficos (padrão: 1)")
+	parser.add_argument("--force", action="store_true",
+						help="redesenha todos os gráficos, mesmo os que não mudaram")
+	parser.add_argument("--ci", action="store_true",
+						help="barras de erro com o IC de bootstrap da média (generate_statistics.py) "
+							 "nos comparativos entre apps e no resumo de performance")
+	instr.add_arguments(parser)
+	args = parser.parse_args()
+	instrumentation = instr.from_args(args)
 
-	print("[3/5] Resumos por app e módulo...")
-	generate_module_summary_chart.main()
+	# results/ (tabela de execuções ou CSVs) é lido uma única vez e compartilhado pelos geradores.
+	with instrumentation.stage("Leitura de results/") as stage:
+		store = ResultsStore.load()
+		stage.read(store.sources)
+		stage.records = len(store.performance()) + len(store.scores())
 
-	print("[4/5] Comparativo por categoria (Desktop/Mobile)...")
-	generate_overall_category_chart.main()
+	with collect_plots() as plots:
+		for i, (title, generator) in enumerate(GENERATORS, start=1):
+			print(f"[{i}/{len(GENERATORS)}] {title}...")
+			with instrumentation.stage(title) as stage:
+				before = len(plots)
+				if args.ci and generator in CI_GENERATORS:
+					generator.main(store, intervals=True)
+				else:
+					generator.main(store)
+				stage.records = len(plots) - before
 
-	print("[5/5] Resumo geral de performance...")
-	generate_overall_performance_chart.main()
+	print(f"{len(plots)} gráficos descritos.")
+	with instrumentation.stage("Rasterização") as stage:
+		stage.figures = render_plots(plots, jobs=args.jobs, manifest_path=FIGS_MANIFEST, force=args.force)
 
 	print("Concluído.")
+	instr.finish(instrumentation, args)
 
 
 if __name__ == "__main__":
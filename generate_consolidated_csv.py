@@ -9,49 +9,55 @@ Saídas:
     - results/pagespeed_scores_means.csv
 
 Cada linha traz a média do app inteiro, para cada métrica de desempenho
-ou categoria de score.
+ou categoria de score, seguida de P75, P90, P95 e amplitude interquartil.
 """
+import argparse
 import csv
-import statistics
 from pathlib import Path
+from typing import Dict, Optional
 
-from src.charts_common import APPS, MODULES
+from src.config import APP_LABELS, APPS, MODULES
 from src.data_loader import (
     METRIC_KEYS,
     CATEGORY_KEYS,
     list_page_files,
-    get_metrics,
-    get_category_scores,
+    extract_run,
+    load_runs,
+    RunRecord,
 )
+from src.aggregators import RunningStats
+from src import instrumentation as instr
+from src.stats import STAT_LABELS
 
 OUTPUT_DIR = Path("results")
+# módulo -> (CSV de métricas, CSV de scores)
+OUTPUTS = {
+    "Lighthouse": (OUTPUT_DIR / "lighthouse_metrics_means.csv", OUTPUT_DIR / "lighthouse_scores_means.csv"),
+    "PageSpeed": (OUTPUT_DIR / "pagespeed_metrics_means.csv", OUTPUT_DIR / "pagespeed_scores_means.csv"),
+}
 
 
 def ensure_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def mean_or_zero(values):
-    return statistics.mean(values) if values else 0.0
+# Além da média, os percentis/IQR agregando todas as execuções do app.
+EXTRA_STATS = ["p75", "p90", "p95", "iqr"]
 
 
-def process_module(module: str, output_metrics: Path, output_scores: Path) -> None:
-    header = ["Plataforma", "Métrica", "UFC Hub", "SIGAA", "UFC Notícias", "Unidade"]
-    metric_rows = []
-    score_rows = []
-
-    # Estruturas acumuladoras por plataforma -> métrica -> app -> valores
-    accum_metrics = {
-        "Desktop": {k: {app: [] for app in APPS} for k in METRIC_KEYS},
-        "Mobile": {k: {app: [] for app in APPS} for k in METRIC_KEYS},
-    }
-    accum_scores = {
-        "Desktop": {k: {app: [] for app in APPS} for k in CATEGORY_KEYS},
-        "Mobile": {k: {app: [] for app in APPS} for k in CATEGORY_KEYS},
-    }
+def process_module(module: str, output_metrics: Path, output_scores: Path,
+                   runs: Optional[Dict[Path, Optional[RunRecord]]] = None,
+                   corpus: Optional[dict] = None) -> None:
+    """
+    Gera os CSVs de médias de um módulo. `runs` e `corpus` vêm de
+    data_loader.load_runs quando o corpus já foi varrido e extraído.
+    """
+    # Acumuladores por plataforma -> app, em memória constante (ver src.aggregators)
+    accum_metrics = {p: {app: RunningStats(len(METRIC_KEYS)) for app in APPS} for p in ["Desktop", "Mobile"]}
+    accum_scores = {p: {app: RunningStats(len(CATEGORY_KEYS)) for app in APPS} for p in ["Desktop", "Mobile"]}
 
     for app in APPS:
-        page_files = list_page_files(module, app)
+        page_files = corpus[(module, app)] if corpus is not None else list_page_files(module, app)
         if not page_files:
             print(f"Pulando data/{module}/{app}: diretório não encontrado")
             continue
@@ -62,28 +68,37 @@ def process_module(module: str, output_metrics: Path, output_scores: Path) -> No
                     continue
 
                 for file in paths:
-                    metrics = get_metrics(file)
-                    if metrics:
-                        for k in METRIC_KEYS:
-                            accum_metrics[platform][k][app].append(metrics[k])
-                    scores = get_category_scores(file)
-                    if scores:
-                        for k in CATEGORY_KEYS:
-                            accum_scores[platform][k][app].append(scores[k] * 100)  # converter para %
+                    run = runs.get(file) if runs is not None else extract_run(file)
+                    if not run:
+                        continue
+                    accum_metrics[platform][app].add([run.metrics[k] for k in METRIC_KEYS])
+                    accum_scores[platform][app].add([run.scores[k] * 100 for k in CATEGORY_KEYS])  # converter para %
+    write_module_csvs(output_metrics, output_scores, accum_metrics, accum_scores)
+
+
+def write_module_csvs(output_metrics: Path, output_scores: Path,
+                      accum_metrics: Dict[str, Dict[str, RunningStats]],
+                      accum_scores: Dict[str, Dict[str, RunningStats]]) -> None:
+    """Grava os CSVs de médias a partir dos acumuladores plataforma -> app -> RunningStats."""
+    app_columns = [APP_LABELS[app] for app in APPS]
+    header = ["Plataforma", "Métrica", *app_columns,
+              *(f"{label} {STAT_LABELS[stat]}" for stat in EXTRA_STATS for label in app_columns),
+              "Unidade"]
+    metric_rows = []
+    score_rows = []
+
     # Finaliza pivotando para o formato solicitado
     for platform in ["Desktop", "Mobile"]:
-        for key in METRIC_KEYS:
-            hub_val = mean_or_zero(accum_metrics[platform][key]["ufc-hub"])
-            sigaa_val = mean_or_zero(accum_metrics[platform][key]["sigaa"])
-            noticias_val = mean_or_zero(accum_metrics[platform][key]["ufc-noticias"])
+        metric_stats = {app: acc.summary() for app, acc in accum_metrics[platform].items()}
+        score_stats = {app: acc.summary() for app, acc in accum_scores[platform].items()}
 
+        for col, key in enumerate(METRIC_KEYS):
             unit = " ms"
             fmt = "{:.2f}"
+            factor = 1
             if key == "Total Transfer Size":
                 unit = " KB"
-                hub_val /= 1024
-                sigaa_val /= 1024
-                noticias_val /= 1024
+                factor = 1024
             elif key == "CLS":
                 unit = ""
                 fmt = "{:.4f}"
@@ -91,23 +106,17 @@ def process_module(module: str, output_metrics: Path, output_scores: Path) -> No
             metric_rows.append([
                 platform,
                 key,
-                fmt.format(hub_val),
-                fmt.format(sigaa_val),
-                fmt.format(noticias_val),
+                *(fmt.format(metric_stats[app]["mean"][col] / factor) for app in APPS),
+                *(fmt.format(metric_stats[app][stat][col] / factor) for stat in EXTRA_STATS for app in APPS),
                 unit,
             ])
 
-        for key in CATEGORY_KEYS:
-            hub_val = mean_or_zero(accum_scores[platform][key]["ufc-hub"])
-            sigaa_val = mean_or_zero(accum_scores[platform][key]["sigaa"])
-            noticias_val = mean_or_zero(accum_scores[platform][key]["ufc-noticias"])
-
+        for col, key in enumerate(CATEGORY_KEYS):
             score_rows.append([
                 platform,
                 key,
-                f"{hub_val:.2f}",
-                f"{sigaa_val:.2f}",
-                f"{noticias_val:.2f}",
+                *(f"{score_stats[app]['mean'][col]:.2f}" for app in APPS),
+                *(f"{score_stats[app][stat][col]:.2f}" for stat in EXTRA_STATS for app in APPS),
                 "%",
             ])
 
@@ -128,16 +137,22 @@ def process_module(module: str, output_metrics: Path, output_scores: Path) -> No
 
 
 def main():
-    process_module(
-        "Lighthouse",
-        OUTPUT_DIR / "lighthouse_metrics_means.csv",
-        OUTPUT_DIR / "lighthouse_scores_means.csv",
-    )
-    process_module(
-        "PageSpeed",
-        OUTPUT_DIR / "pagespeed_metrics_means.csv",
-        OUTPUT_DIR / "pagespeed_scores_means.csv",
-    )
+    parser = argparse.ArgumentParser(description="Gera os CSVs de médias globais em results/.")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="processos usados para decodificar os JSONs (padrão: 1)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="lê os JSONs em fluxo: menor pico de memória, cerca de 3x mais lento")
+    instr.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation = instr.from_args(args)
+
+    corpus, runs = load_runs(jobs=args.jobs, instrumentation=instrumentation, streaming=args.streaming)
+    with instrumentation.stage("CSVs consolidados") as stage:
+        for module, (output_metrics, output_scores) in OUTPUTS.items():
+            process_module(module, output_metrics, output_scores, runs, corpus)
+        stage.records = len(runs)
+
+    instr.finish(instrumentation, args)
 
 
 if __name__ == "__main__":
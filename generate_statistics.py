@@ -0,0 +1,147 @@
+"""
+Intervalos de confiança por bootstrap e testes de significância para as
+comparações entre apps, plataformas e módulos, a partir de results/runs.npy.
+
+Saídas (ao lado dos CSVs de médias):
+    - results/<modulo>_metrics_ci.csv e results/<modulo>_scores_ci.csv: média,
+      mediana e P75 de cada app/plataforma com o IC percentil de bootstrap;
+    - results/significance_tests.csv: diferença de médias e p-valor do teste
+      de permutação para cada par de apps (por módulo e plataforma), Desktop
+      vs Mobile (por módulo e app) e Lighthouse vs PageSpeed (por app e
+      plataforma).
+
+Os IC viram barras de erro com `generate_charts.py --ci`. Reamostragem com
+semente fixa (--seed): a saída é a mesma a cada execução.
+"""
+import argparse
+import csv
+import sys
+import time
+from itertools import combinations
+
+import numpy as np
+
+from src.config import APP_LABELS, APPS, MODULES, PLATFORMS
+from src.resampling import (
+    CI_STATS,
+    DEFAULT_CONFIDENCE,
+    DEFAULT_RESAMPLES,
+    TESTS_PATH,
+    bootstrap_ci,
+    ci_paths,
+    permutation_test,
+)
+from src.run_table import METRIC_COLUMNS, SCORE_COLUMNS, SCORE_CSV_FORMAT, RunTable, csv_format
+from src.stats import STAT_LABELS
+
+
+def _columns(table: RunTable):
+    """Matriz execuções × (métricas, scores) nas unidades dos CSVs, e (nome, unidade, casas) de cada coluna."""
+    formats = [(key, *csv_format(key)) for key in METRIC_COLUMNS]
+    formats += [(key, *SCORE_CSV_FORMAT) for key in SCORE_COLUMNS]
+    columns = [column for column, _ in METRIC_COLUMNS.values()] + list(SCORE_COLUMNS.values())
+    values = np.stack([np.asarray(table.runs[column], dtype=float) * factor
+                       for column, (_, factor, _, _) in zip(columns, formats)], axis=1)
+    return values, [(name, unit, decimals) for name, _, unit, decimals in formats]
+
+
+def _rows(table: RunTable, **labels) -> np.ndarray:
+    selected = np.ones(len(table), dtype=bool)
+    for field, value in labels.items():
+        names = table.categories[field]
+        selected &= table.runs[field] == (names.index(value) if value in names else -1)
+    return selected
+
+
+def write_intervals(table: RunTable, values, formats, n_resamples: int, confidence: float, seed: int):
+    n_metrics = len(METRIC_COLUMNS)
+    for m, module in enumerate(MODULES):
+        metric_rows, score_rows = [], []
+        for p, platform in enumerate(PLATFORMS):
+            for a, app in enumerate(APPS):
+                selected = _rows(table, module=module, app=app, platform=platform)
+                intervals = bootstrap_ci(values[selected], n_resamples, confidence, seed=[seed, m, p, a])
+                for col, (name, unit, decimals) in enumerate(formats):
+                    rows = metric_rows if col < n_metrics else score_rows
+                    for stat in CI_STATS:
+                        cells = [f"{v[col]:.{decimals}f}" if selected.any() else "" for v in intervals[stat]]
+                        rows.append([platform, name, APP_LABELS[app], STAT_LABELS[stat], *cells, unit])
+        for path, rows, key_label in zip(ci_paths(module), (metric_rows, score_rows), ("Métrica", "Categoria")):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["Plataforma", key_label, "App", "Estatística", "Valor", "IC inferior", "IC superior", "Unidade"])
+                writer.writerows(rows)
+            print(f"Arquivo gerado: {path} ({len(rows)} linhas)")
+
+
+def comparisons():
+    """(fator, contexto, rótulos do grupo A, rótulos do grupo B) de cada teste."""
+    for module in MODULES:
+        for platform in PLATFORMS:
+            for app_a, app_b in combinations(APPS, 2):
+                yield ("App", f"{module} / {platform}",
+                       {"module": module, "platform": platform, "app": app_a},
+                       {"module": module, "platform": platform, "app": app_b})
+    for module in MODULES:
+        for app in APPS:
+            yield ("Plataforma", f"{module} / {APP_LABELS[app]}",
+                   {"module": module, "app": app, "platform": PLATFORMS[0]},
+                   {"module": module, "app": app, "platform": PLATFORMS[1]})
+    for app in APPS:
+        for platform in PLATFORMS:
+            yield ("Módulo", f"{APP_LABELS[app]} / {platform}",
+                   {"app": app, "platform": platform, "module": MODULES[0]},
+                   {"app": app, "platform": platform, "module": MODULES[1]})
+
+
+def _group_name(factor: str, labels: dict) -> str:
+    field = {"App": "app", "Plataforma": "platform", "Módulo": "module"}[factor]
+    return APP_LABELS[labels[field]] if field == "app" else labels[field]
+
+
+def write_tests(table: RunTable, values, formats, n_resamples: int, seed: int) -> int:
+    rows = []
+    for index, (factor, context, labels_a, labels_b) in enumerate(comparisons()):
+        a = values[_rows(table, **labels_a)]
+        b = values[_rows(table, **labels_b)]
+        if not len(a) or not len(b):
+            continue
+        difference, p_values = permutation_test(a, b, n_resamples, seed=[seed, index])
+        for col, (name, unit, decimals) in enumerate(formats):
+            rows.append([factor, context, _group_name(factor, labels_a), _group_name(factor, labels_b), name,
+                         f"{a[:, col].mean():.{decimals}f}", f"{b[:, col].mean():.{decimals}f}",
+                         f"{difference[col]:.{decimals}f}", f"{p_values[col]:.4f}", unit])
+    TESTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(TESTS_PATH, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Fator", "Contexto", "Grupo A", "Grupo B", "Métrica", "Média A", "Média B",
+                         "Diferença (A - B)", "p-valor", "Unidade"])
+        writer.writerows(rows)
+    print(f"Arquivo gerado: {TESTS_PATH} ({len(rows)} linhas)")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES,
+                        help=f"reamostras do bootstrap e das permutações (padrão: {DEFAULT_RESAMPLES})")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE,
+                        help=f"nível de confiança dos IC (padrão: {DEFAULT_CONFIDENCE})")
+    parser.add_argument("--seed", type=int, default=0, help="semente da reamostragem (padrão: 0)")
+    args = parser.parse_args()
+
+    table = RunTable.load()
+    if table is None:
+        print("results/runs.npy não encontrado (ou de outra versão); rode run_pipeline.py antes.")
+        return 1
+    values, formats = _columns(table)
+    start = time.perf_counter()
+    write_intervals(table, values, formats, args.resamples, args.confidence, args.seed)
+    write_tests(table, values, formats, args.resamples, args.seed)
+    print(f"{args.resamples} reamostras sobre {len(table)} execuções em {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
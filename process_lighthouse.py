@@ -2,32 +2,27 @@
 Processa JSONs de Lighthouse e PageSpeed para gerar CSVs por página, app e plataforma
 (Desktop/Mobile), contendo estatísticas de métricas e pontuações de categorias.
 """
+import argparse
 import csv
-import statistics
 from pathlib import Path
 
-from src.charts_common import APPS, MODULES
+from src.config import APPS, MODULES
 from src.data_loader import (
     METRIC_KEYS,
     CATEGORY_KEYS,
     list_page_files,
-    get_metrics,
-    get_category_scores,
+    extract_run,
+    load_runs,
 )
+from src.aggregators import RunningStats
+from src import instrumentation as instr
+from src.run_table import SCORE_CSV_FORMAT, csv_format, write_run_table
+from src.stats import STAT_LABELS, STAT_NAMES, column_stats, describe
 
 
 def calculate_stats(values):
-    if not values:
-        return {
-            'mean': 0, 'median': 0, 'stdev': 0, 'min': 0, 'max': 0
-        }
-    return {
-        'mean': statistics.mean(values),
-        'median': statistics.median(values),
-        'stdev': statistics.stdev(values) if len(values) > 1 else 0,
-        'min': min(values),
-        'max': max(values)
-    }
+    """Estatísticas de uma lista de valores (ver src.stats.describe)."""
+    return column_stats(describe(values), 0)
 
 
 def format_stats_row(key, stats):
@@ -65,34 +60,82 @@ def format_stats_row(key, stats):
 
 def format_stats_for_csv(key, stats):
     """Return formatted stats and unit for CSV export."""
-    if key == 'Total Transfer Size':
-        factor = 1 / 1024
-        unit = "KB"
-        decimals = 2
-    elif key == 'CLS':
-        factor = 1
-        unit = ""
-        decimals = 4
-    else:
-        factor = 1
-        unit = "ms"
-        decimals = 2
+    factor, unit, decimals = csv_format(key)
     fmt = "{:." + str(decimals) + "f}"
-    values = [fmt.format(stats[name] * factor)
-              for name in ['mean', 'median', 'stdev', 'min', 'max']]
+    values = [fmt.format(stats[name] * factor) for name in STAT_NAMES]
     return values, unit
 
 
 def format_score_stats_for_csv(stats):
     """Return formatted score stats (percentage) for CSV export."""
-    fmt = "{:.2f}"
-    values = [fmt.format(stats[name])
-              for name in ['mean', 'median', 'stdev', 'min', 'max']]
-    return values, "%"
+    _, unit, decimals = SCORE_CSV_FORMAT
+    fmt = "{:." + str(decimals) + "f}"
+    values = [fmt.format(stats[name]) for name in STAT_NAMES]
+    return values, unit
+
 
+def page_accumulators(files, runs=None):
+    """
+    Acumuladores (métricas, scores em %) por plataforma de uma página:
+    {'Desktop': (RunningStats, RunningStats), 'Mobile': (...)}.
+    """
+    accumulators = {}
+    for platform in ('Desktop', 'Mobile'):
+        # Acumuladores em memória constante; as estatísticas saem vetorizadas por coluna.
+        metric_acc = RunningStats(len(METRIC_KEYS))
+        score_acc = RunningStats(len(CATEGORY_KEYS))
+        for file in files.get(platform, []):
+            run = runs.get(file) if runs is not None else extract_run(file)
+            if not run:
+                continue
+            metric_acc.add([run.metrics[k] for k in METRIC_KEYS])
+            # scores converted to percentage
+            score_acc.add([run.scores[k] * 100 for k in CATEGORY_KEYS])
+        accumulators[platform] = (metric_acc, score_acc)
+    return accumulators
+
+
+def write_page_csvs(results_dir, page, accumulators):
+    """Grava performance_<page>.csv e scores_<page>.csv a partir de page_accumulators."""
+    csv_rows = []
+    csv_header = ['Plataforma', 'Métrica', *(STAT_LABELS[n] for n in STAT_NAMES), 'Unidade']
+    score_csv_rows = []
+    score_csv_header = ['Plataforma', 'Categoria', *(STAT_LABELS[n] for n in STAT_NAMES), 'Unidade']
+
+    for platform, (metric_acc, score_acc) in accumulators.items():
+        metric_stats = metric_acc.summary()
+        score_stats = score_acc.summary()
+
+        for col, key in enumerate(METRIC_KEYS):
+            csv_values, unit = format_stats_for_csv(key, column_stats(metric_stats, col))
+            csv_rows.append([platform, key, *csv_values, unit])
+
+        for col, key in enumerate(CATEGORY_KEYS):
+            percent_values, percent_unit = format_score_stats_for_csv(column_stats(score_stats, col))
+            score_csv_rows.append(
+                [platform, key, *percent_values, percent_unit])
 
-def process_app_module(app, module):
-    page_files = list_page_files(module, app)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    csv_output_path = results_dir / f'performance_{page}.csv'
+    with open(csv_output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(csv_header)
+        writer.writerows(csv_rows)
+
+    score_output_path = results_dir / f'scores_{page}.csv'
+    with open(score_output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(score_csv_header)
+        writer.writerows(score_csv_rows)
+
+
+def process_app_module(app, module, runs=None, page_files=None):
+    """
+    Gera os CSVs por página de um app/módulo. `runs` e `page_files` vêm de
+    data_loader.load_runs quando o corpus já foi varrido e extraído.
+    """
+    if page_files is None:
+        page_files = list_page_files(module, app)
     if not page_files:
         print(f"Skipping {module}/{app}: base path not found or empty")
         return
@@ -101,76 +144,35 @@ def process_app_module(app, module):
     results_dir.mkdir(parents=True, exist_ok=True)
 
     for page, files in page_files.items():
-        desktop_files = files.get('Desktop', [])
-        mobile_files = files.get('Mobile', [])
-
-        if not desktop_files and not mobile_files:
+        if not files.get('Desktop') and not files.get('Mobile'):
             print(f"Skipping {module}/{app}/{page}: no JSON files found")
             continue
 
-        metrics_map = {
-            'Desktop': {'files': desktop_files, 'data': {}},
-            'Mobile': {'files': mobile_files, 'data': {}}
-        }
-
-        category_map = {
-            'Desktop': {'files': desktop_files, 'data': {}},
-            'Mobile': {'files': mobile_files, 'data': {}}
-        }
-
-        for platform in ['Desktop', 'Mobile']:
-            metrics_map[platform]['data'] = {k: [] for k in METRIC_KEYS}
-            category_map[platform]['data'] = {k: [] for k in CATEGORY_KEYS}
-
-            for file in metrics_map[platform]['files']:
-                m = get_metrics(file)
-                if m:
-                    for key in METRIC_KEYS:
-                        metrics_map[platform]['data'][key].append(m[key])
-
-                c = get_category_scores(file)
-                if c:
-                    for key in CATEGORY_KEYS:
-                        category_map[platform]['data'][key].append(c[key])
-
-        csv_rows = []
-        csv_header = ['Plataforma', 'Métrica', 'Média', 'Mediana',
-                      'Desvio Padrão', 'Mínimo', 'Máximo', 'Unidade']
-        score_csv_rows = []
-        score_csv_header = ['Plataforma', 'Categoria', 'Média',
-                            'Mediana', 'Desvio Padrão', 'Mínimo', 'Máximo', 'Unidade']
-
-        for platform in ['Desktop', 'Mobile']:
-            for key in METRIC_KEYS:
-                values = metrics_map[platform]['data'][key]
-                stats = calculate_stats(values)
-                csv_values, unit = format_stats_for_csv(key, stats)
-                csv_rows.append([platform, key, *csv_values, unit])
-
-            for key in CATEGORY_KEYS:
-                values = category_map[platform]['data'][key]
-                # scores converted to percentage
-                stats = calculate_stats([v * 100 for v in values])
-                percent_values, percent_unit = format_score_stats_for_csv(
-                    stats)
-                score_csv_rows.append(
-                    [platform, key, *percent_values, percent_unit])
-
-        csv_output_path = results_dir / f'performance_{page}.csv'
-        with open(csv_output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(csv_header)
-            writer.writerows(csv_rows)
-
-        score_output_path = results_dir / f'scores_{page}.csv'
-        with open(score_output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(score_csv_header)
-            writer.writerows(score_csv_rows)
-
+        write_page_csvs(results_dir, page, page_accumulators(files, runs))
         print(f"Done: {module}/{app}/{page}")
 
 
-for app in APPS:
-    for module in MODULES:
-        process_app_module(app, module)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='processos usados para decodificar os JSONs (padrão: 1)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='lê os JSONs em fluxo: menor pico de memória, cerca de 3x mais lento')
+    instr.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation = instr.from_args(args)
+
+    corpus, runs = load_runs(jobs=args.jobs, instrumentation=instrumentation, streaming=args.streaming)
+    with instrumentation.stage('Tabela de execuções') as stage:
+        stage.records = write_run_table(corpus, runs)
+    with instrumentation.stage('CSVs por página') as stage:
+        for app in APPS:
+            for module in MODULES:
+                process_app_module(app, module, runs, corpus[(module, app)])
+        stage.records = len(runs)
+
+    instr.finish(instrumentation, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Executa todo o processamento de data/ em uma única varredura: cada JSON é
+extraído uma vez e os mesmos registros alimentam a tabela de execuções
+(results/runs.npy, usada pelos gráficos), os CSVs por página
+(process_lighthouse.py) e os CSVs de médias globais (generate_consolidated_csv.py).
+
+Em modo shard (--shard I/N) só a I-ésima fatia dos relatórios é extraída e o
+resultado vira um arquivo de agregados parciais; --merge combina os parciais
+de todos os shards nas mesmas saídas da execução única (ver src/shards.py).
+"""
+import argparse
+from pathlib import Path
+
+import generate_consolidated_csv
+import process_lighthouse
+from src import instrumentation as instr
+from src import shards
+from src.aggregators import RunningStats
+from src.config import APPS, MODULES, PLATFORMS
+from src.data_loader import CATEGORY_KEYS, METRIC_KEYS, load_runs
+from src.run_table import write_run_table
+
+
+def run_shard(args, instrumentation):
+    """Extrai a fatia do shard e grava os agregados parciais."""
+    corpus, runs = load_runs(jobs=args.jobs, instrumentation=instrumentation, shard=args.shard,
+                             streaming=args.streaming)
+    with instrumentation.stage("Agregados parciais") as stage:
+        pages, shard_runs = [], []
+        for (module, app), page_files in corpus.items():
+            for page, files in page_files.items():
+                mine = {platform: [f for f in files.get(platform, []) if f in runs] for platform in PLATFORMS}
+                if not any(mine.values()):
+                    continue
+                accumulators = process_lighthouse.page_accumulators(mine, runs)
+                pages.append(((module, app, page), {p: accumulators[p] for p in PLATFORMS if mine[p]}))
+                shard_runs.extend((module, app, page, platform, runs[f])
+                                  for platform in PLATFORMS for f in mine[platform] if runs[f])
+        path = shards.write_partial(args.partials, args.shard, pages, shard_runs)
+        stage.records = len(shard_runs)
+    print(f"Parcial gravado em {path}")
+
+
+def merge_shards(args, instrumentation):
+    """Combina os parciais de todos os shards e grava as saídas."""
+    with instrumentation.stage("Leitura dos parciais") as stage:
+        paths = shards.partial_files(args.partials)
+        stage.read(paths)
+        pages, corpus, runs = shards.merge_partials(paths)
+        stage.records = len(runs)
+
+    with instrumentation.stage("Tabela de execuções") as stage:
+        stage.records = write_run_table(corpus, runs)
+
+    with instrumentation.stage("CSVs por página") as stage:
+        for (module, app, page), accumulators in pages.items():
+            process_lighthouse.write_page_csvs(Path("results") / app / module, page, accumulators)
+            print(f"Done: {module}/{app}/{page}")
+        stage.records = len(runs)
+
+    with instrumentation.stage("CSVs consolidados") as stage:
+        for module, (output_metrics, output_scores) in generate_consolidated_csv.OUTPUTS.items():
+            accum_metrics = {p: {app: RunningStats(len(METRIC_KEYS)) for app in APPS} for p in PLATFORMS}
+            accum_scores = {p: {app: RunningStats(len(CATEGORY_KEYS)) for app in APPS} for p in PLATFORMS}
+            # Páginas na ordem do corpus, como em process_module.
+            for (page_module, app, _), accumulators in pages.items():
+                if page_module != module or app not in APPS:
+                    continue
+                for platform, (metric_acc, score_acc) in accumulators.items():
+                    accum_metrics[platform][app].merge(metric_acc)
+                    accum_scores[platform][app].merge(score_acc)
+            generate_consolidated_csv.write_module_csvs(output_metrics, output_scores, accum_metrics, accum_scores)
+        stage.records = len(runs)
+
+
+def run_all(args, instrumentation):
+    """Execução em um único processo."""
+    corpus, runs = load_runs(jobs=args.jobs, instrumentation=instrumentation, streaming=args.streaming)
+
+    # A tabela de execuções é a fonte dos gráficos; os CSVs abaixo são a exportação legível.
+    with instrumentation.stage("Tabela de execuções") as stage:
+        stage.records = write_run_table(corpus, runs)
+
+    with instrumentation.stage("CSVs por página") as stage:
+        for app in APPS:
+            for module in MODULES:
+                process_lighthouse.process_app_module(app, module, runs, corpus[(module, app)])
+        stage.records = len(runs)
+
+    with instrumentation.stage("CSVs consolidados") as stage:
+        for module, (output_metrics, output_scores) in generate_consolidated_csv.OUTPUTS.items():
+            generate_consolidated_csv.process_module(module, output_metrics, output_scores, runs, corpus)
+        stage.records = len(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="processos usados para decodificar os JSONs (padrão: 1)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="lê os JSONs em fluxo: menor pico de memória, cerca de 3x mais lento")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=shards.parse_shard, metavar="I/N",
+                      help="processa só o shard I de N e grava os agregados parciais")
+    mode.add_argument("--merge", action="store_true",
+                      help="combina os parciais de todos os shards nas saídas finais")
+    parser.add_argument("--partials", type=Path, default=shards.PARTIALS_DIR, metavar="DIR",
+                        help=f"diretório dos agregados parciais (padrão: {shards.PARTIALS_DIR})")
+    instr.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation = instr.from_args(args)
+
+    if args.shard:
+        run_shard(args, instrumentation)
+    elif args.merge:
+        merge_shards(args, instrumentation)
+    else:
+        run_all(args, instrumentation)
+    instr.finish(instrumentation, args)
+
+
+if __name__ == "__main__":
+    main()
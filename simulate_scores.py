@@ -0,0 +1,116 @@
+"""
+Simula o score de performance do Lighthouse sob variações das métricas, para
+todas as execuções de results/runs.npy de uma vez.
+
+Cada --delta METRICA=PCT muda a métrica em PCT% em todas as execuções (ex.:
+--delta LCP=-30 --delta TBT=-50 é um cenário); o script imprime, por grupo, o
+score médio gravado nos relatórios, o recalculado pelas curvas do Lighthouse e
+o do cenário. --sweep METRICA avalia a métrica de -90% a +100% (passo 10%).
+--benchmark N mede quantos cenários aleatórios por segundo são avaliados.
+
+Uso:
+    python simulate_scores.py --app sigaa --platform Mobile --delta LCP=-30
+    python simulate_scores.py --by app platform --sweep TBT
+    python simulate_scores.py --benchmark 10000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from src.config import APPS, MODULES, PLATFORMS
+from src.run_table import CODE_FIELDS, RunTable
+from src.scoring import SCORED_METRICS, ScoreSimulator, group_means, scenario, scoring_profile
+
+
+def parse_delta(text: str):
+    metric, _, percent = text.partition("=")
+    if metric not in SCORED_METRICS:
+        raise argparse.ArgumentTypeError(f"métrica inválida: {metric!r} (use {', '.join(SCORED_METRICS)})")
+    try:
+        return metric, float(percent)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"variação inválida: {text!r} (use METRICA=PCT, ex.: LCP=-30)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delta", type=parse_delta, action="append", default=[], metavar="METRICA=PCT",
+                        help="variação percentual de uma métrica (repita para combinar)")
+    parser.add_argument("--sweep", choices=list(SCORED_METRICS), help="varia a métrica de -90%% a +100%%")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="avalia N cenários aleatórios e mede o tempo")
+    parser.add_argument("--by", nargs="+", default=["app", "module", "platform"], choices=CODE_FIELDS,
+                        help="campos dos grupos (padrão: app module platform)")
+    parser.add_argument("--module", choices=MODULES)
+    parser.add_argument("--app", choices=APPS)
+    parser.add_argument("--platform", choices=PLATFORMS)
+    args = parser.parse_args()
+
+    table = RunTable.load()
+    if table is None:
+        print("results/runs.npy não encontrado (ou de outra versão); rode run_pipeline.py antes.")
+        return 1
+    selected = np.ones(len(table), dtype=bool)
+    for field in ("module", "app", "platform"):
+        value = getattr(args, field)
+        if value is not None:
+            names = table.categories[field]
+            selected &= table.runs[field] == (names.index(value) if value in names else -1)
+    if not selected.any():
+        print("Nenhuma execução com esses filtros.")
+        return 1
+    # Relatórios de versões do Lighthouse sem curvas de pontuação ficam de fora da simulação.
+    versions = table.categories["lighthouse_version"]
+    unsupported = []
+    for code, version in enumerate(versions):
+        try:
+            scoring_profile(version)
+        except ValueError:
+            unsupported.append(code)
+    skipped = selected & np.isin(table.runs["lighthouse_version"], unsupported)
+    if skipped.any():
+        skipped_versions = sorted({versions[code] for code in table.runs["lighthouse_version"][skipped].tolist()})
+        print(f"{skipped.sum()} execuções ignoradas: sem curvas de pontuação para o Lighthouse "
+              f"{', '.join(skipped_versions)}")
+        selected &= ~skipped
+    if not selected.any():
+        print("Nenhuma execução de uma versão do Lighthouse com curvas de pontuação.")
+        return 1
+    simulator = ScoreSimulator.from_run_table(table, selected)
+    stored = np.asarray(table.runs["performance"][selected])
+    baseline = simulator.scores()
+    diff = np.abs(baseline - stored)
+    print(f"{len(simulator)} execuções; recálculo igual ao score gravado em {(diff < 1e-9).sum()}, "
+          f"diferença máxima {diff.max():.2f}")
+
+    if args.benchmark:
+        factors = np.random.default_rng(0).uniform(0.5, 1.5, (args.benchmark, len(SCORED_METRICS)))
+        start = time.perf_counter()
+        simulator.scores(factors)
+        elapsed = time.perf_counter() - start
+        print(f"{args.benchmark} cenários × {len(simulator)} execuções em {elapsed:.3f} s "
+              f"({args.benchmark / elapsed:,.0f} cenários/s)")
+        return 0
+
+    if args.sweep:
+        percents = np.arange(-90, 101, 10)
+        factors = np.ones((len(percents), len(SCORED_METRICS)))
+        factors[:, list(SCORED_METRICS).index(args.sweep)] = 1 + percents / 100
+        keys, means = group_means(table, simulator.scores(factors), args.by, selected)
+        print(f"{' / '.join(args.by)} | " + " | ".join(f"{args.sweep} {p:+d}%" for p in percents))
+        for key, column in zip(keys, means.T):
+            print(f"{' / '.join(key)} | " + " | ".join(f"{value * 100:.1f}" for value in column))
+        return 0
+
+    scores = np.stack([stored, baseline, simulator.scores(scenario(dict(args.delta))[None])[0]])
+    keys, means = group_means(table, scores, args.by, selected)
+    label = ", ".join(f"{metric} {percent:+g}%" for metric, percent in args.delta) or "sem variação"
+    print(f"{' / '.join(args.by)} | gravado | recalculado | cenário ({label})")
+    for key, (saved, recomputed, simulated) in zip(keys, means.T):
+        print(f"{' / '.join(key)} | {saved * 100:.1f} | {recomputed * 100:.1f} | {simulated * 100:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
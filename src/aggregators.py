@@ -0,0 +1,220 @@
+"""
+Acumuladores de estatísticas em memória constante, combináveis entre lotes.
+
+`RunningStats` recebe execuções (linhas de métricas ou categorias) uma a uma ou
+em blocos e mantém, por coluna: contagem, média e soma dos quadrados dos desvios
+(Welford/Chan), mínimo e máximo exatos e um `QuantileSketch` para mediana e
+percentis. Dois acumuladores podem ser combinados com `merge`, o que permite
+agregar lotes (ou shards) separadamente, e serializados com `to_dict`/`from_dict`
+(JSON) para serem combinados em outro processo. O resumo tem as mesmas chaves
+de src.stats.describe.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .stats import STAT_NAMES, describe
+
+_PERCENTILES = [25, 50, 75, 90, 95]
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis por centróides (valor, peso) com tamanho limitado.
+
+    Enquanto o número de valores não passa de `capacity` o sketch guarda todos
+    e os quantis são exatos (mesma interpolação linear de np.percentile). Acima
+    disso, valores vizinhos são fundidos em centróides de peso parecido.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+
+    @property
+    def exact(self) -> bool:
+        return bool(np.all(self.weights == 1))
+
+    def add_many(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        self.values = np.concatenate([self.values, values])
+        self.weights = np.concatenate([self.weights, np.ones(len(values))])
+        if len(self.values) > self.capacity:
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        self.values = np.concatenate([self.values, other.values])
+        self.weights = np.concatenate([self.weights, other.weights])
+        if len(self.values) > self.capacity:
+            self._compress()
+        return self
+
+    def _compress(self) -> None:
+        order = np.argsort(self.values, kind="stable")
+        values = self.values[order]
+        weights = self.weights[order]
+        # Divide o peso acumulado em capacity/2 faixas e funde cada faixa em um centróide.
+        size = self.capacity // 2
+        cum = np.cumsum(weights)
+        buckets = np.minimum(((cum - weights / 2) / cum[-1] * size).astype(np.intp), size - 1)
+        bucket_weights = np.bincount(buckets, weights=weights, minlength=size)
+        bucket_sums = np.bincount(buckets, weights=values * weights, minlength=size)
+        used = bucket_weights > 0
+        self.weights = bucket_weights[used]
+        self.values = bucket_sums[used] / self.weights
+
+    def percentiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Percentis (0-100) pela interpolação linear de np.percentile."""
+        if len(self.values) == 0:
+            return np.zeros(len(qs))
+        if self.exact:
+            return np.percentile(self.values, qs)
+
+        order = np.argsort(self.values, kind="stable")
+        values = self.values[order]
+        weights = self.weights[order]
+        # Cada centróide ocupa as posições [início, fim] da amostra ordenada
+        # virtual; interpola entre os centros como np.percentile faz entre itens.
+        ends = np.cumsum(weights)
+        centers = ends - weights + (weights - 1) / 2
+        positions = np.asarray(qs, dtype=float) / 100 * (ends[-1] - 1)
+        return np.interp(positions, centers, values)
+
+    def to_dict(self) -> dict:
+        return {"capacity": self.capacity, "values": self.values.tolist(), "weights": self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["capacity"])
+        sketch.values = np.array(data["values"], dtype=float)
+        sketch.weights = np.array(data["weights"], dtype=float)
+        return sketch
+
+
+class RunningStats:
+    """
+    Estatísticas por coluna sem guardar as execuções.
+
+    As linhas recebidas ficam em um buffer de até `batch_size` execuções, que é
+    incorporado aos momentos em bloco (vetorizado). Enquanto nada foi
+    incorporado, o resumo vem direto de describe() sobre o buffer, idêntico ao
+    cálculo com todos os valores em memória.
+    """
+
+    def __init__(self, n_cols: int, batch_size: int = 1024, sketch_capacity: int = 2048):
+        self.n_cols = n_cols
+        self.batch_size = batch_size
+        self.count = 0
+        self.mean = np.zeros(n_cols)
+        self.m2 = np.zeros(n_cols)
+        self.min = np.full(n_cols, np.inf)
+        self.max = np.full(n_cols, -np.inf)
+        self.sketches = [QuantileSketch(sketch_capacity) for _ in range(n_cols)]
+        self._pending = []
+
+    def __len__(self) -> int:
+        return self.count + len(self._pending)
+
+    def add(self, row: Sequence[float]) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def update(self, rows) -> None:
+        rows = np.asarray(rows, dtype=float).reshape(-1, self.n_cols)
+        self._flush()
+        for start in range(0, len(rows), self.batch_size):
+            self._absorb(rows[start:start + self.batch_size])
+
+    def _flush(self) -> None:
+        if self._pending:
+            batch = np.array(self._pending, dtype=float).reshape(-1, self.n_cols)
+            self._pending = []
+            self._absorb(batch)
+
+    def _absorb(self, batch: np.ndarray) -> None:
+        if len(batch) == 0:
+            return
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        self._combine(len(batch), batch_mean, batch_m2, batch.min(axis=0), batch.max(axis=0))
+        for col, sketch in enumerate(self.sketches):
+            sketch.add_many(batch[:, col])
+
+    def _combine(self, count: int, mean: np.ndarray, m2: np.ndarray,
+                 col_min: np.ndarray, col_max: np.ndarray) -> None:
+        """Combinação de momentos de Chan et al. para dois conjuntos disjuntos."""
+        if self.count == 0:
+            self.count, self.mean, self.m2 = count, mean.copy(), m2.copy()
+        else:
+            total = self.count + count
+            delta = mean - self.mean
+            self.mean = self.mean + delta * (count / total)
+            self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+            self.count = total
+        self.min = np.minimum(self.min, col_min)
+        self.max = np.maximum(self.max, col_max)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Incorpora outro acumulador (ex.: de outro lote ou shard). As linhas ainda
+        no buffer do outro entram como se fossem adicionadas aqui, na mesma
+        ordem: combinando acumuladores que não incorporaram nada, o resumo é
+        idêntico ao de um único acumulador que recebesse todas as linhas.
+        """
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+            for mine, theirs in zip(self.sketches, other.sketches):
+                mine.merge(theirs)
+        for row in other._pending:
+            self.add(row)
+        return self
+
+    def to_dict(self) -> dict:
+        """Estado completo (momentos, extremos, sketches e buffer) em tipos JSON."""
+        return {
+            "n_cols": self.n_cols,
+            "batch_size": self.batch_size,
+            "count": self.count,
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+            "sketches": [sketch.to_dict() for sketch in self.sketches],
+            "pending": [list(row) for row in self._pending],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningStats":
+        acc = cls(data["n_cols"], batch_size=data["batch_size"])
+        acc.count = data["count"]
+        acc.mean = np.array(data["mean"], dtype=float)
+        acc.m2 = np.array(data["m2"], dtype=float)
+        acc.min = np.array(data["min"], dtype=float)
+        acc.max = np.array(data["max"], dtype=float)
+        acc.sketches = [QuantileSketch.from_dict(sketch) for sketch in data["sketches"]]
+        acc._pending = [list(row) for row in data["pending"]]
+        return acc
+
+    def summary(self, names: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Mesmas estatísticas (e formato) de src.stats.describe."""
+        names = names or STAT_NAMES
+        if self.count == 0:
+            pending = np.array(self._pending, dtype=float).reshape(-1, self.n_cols)
+            return {name: values for name, values in describe(pending).items() if name in names}
+
+        self._flush()
+        p25, median, p75, p90, p95 = np.array([s.percentiles(_PERCENTILES) for s in self.sketches]).T
+        stats = {
+            "mean": self.mean,
+            "median": median,
+            "stdev": np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.zeros(self.n_cols),
+            "min": self.min,
+            "max": self.max,
+            "p75": p75,
+            "p90": p90,
+            "p95": p95,
+            "iqr": p75 - p25,
+        }
+        return {name: stats[name] for name in names}
@@ -0,0 +1,215 @@
+"""
+Arquivo compactado dos relatórios brutos de um módulo/app.
+
+Cada relatório JSON vira um membro comprimido com zlib dentro de um único
+arquivo (data/<módulo>/<app>.lharchive); no fim dele fica um índice (JSON,
+também comprimido) com o deslocamento, o tamanho comprimido, o tamanho
+descomprimido, o mtime do JSON original, o SHA-1 e os campos fetchTime/finalUrl de cada membro.
+Um membro é lido com um seek e uma descompressão em fluxo, sem abrir um
+arquivo por relatório.
+
+Layout:
+    MAGIC | membro 1 | membro 2 | ... | índice | <offset do índice, tamanho do índice, MAGIC>
+
+Os membros são endereçados por caminhos "virtuais" sob o arquivo, por exemplo
+data/Lighthouse/ufc-hub.lharchive/blog/mobile/relatorio.json, para que o
+restante do pipeline continue trabalhando com Path.
+"""
+import hashlib
+import io
+import json
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+ARCHIVE_SUFFIX = ".lharchive"
+MAGIC = b"LHARCH1\n"
+FOOTER = struct.Struct("<QQ8s")
+FORMAT_VERSION = 1
+
+# Campos com capturas de tela (base64) que a extração nunca lê.
+SCREENSHOT_AUDITS = ["screenshot-thumbnails", "final-screenshot"]
+
+
+def archive_path(module_dir: Path, app: str) -> Path:
+    return Path(module_dir) / f"{app}{ARCHIVE_SUFFIX}"
+
+
+def split_member_path(path: Path) -> Optional[Tuple[Path, str]]:
+    """(arquivo, nome do membro) se `path` aponta para dentro de um .lharchive; senão None."""
+    parts = Path(path).parts
+    for i, part in enumerate(parts[:-1]):
+        if part.endswith(ARCHIVE_SUFFIX):
+            return Path(*parts[:i + 1]), "/".join(parts[i + 1:])
+    return None
+
+
+def drop_screenshots(report: dict) -> dict:
+    """Remove as capturas de tela do relatório (in-place); métricas e scores ficam intactos."""
+    report.pop("fullPageScreenshot", None)
+    audits = report.get("audits", {})
+    for audit in SCREENSHOT_AUDITS:
+        if audit in audits:
+            audits[audit].pop("details", None)
+    return report
+
+
+@dataclass
+class Member:
+    offset: int
+    length: int
+    size: int
+    mtime_ns: int
+    sha1: str
+    fetch_time: str = ""
+    final_url: str = ""
+
+
+class _MemberStream(io.RawIOBase):
+    """Leitura em fluxo (descomprimida) de um membro, a partir do arquivo aberto."""
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, f, member: Member):
+        self._f = f
+        self._pos = member.offset
+        self._remaining = member.length
+        self._inflate = zlib.decompressobj()
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if not self._remaining:
+                self._pending = self._inflate.flush()
+                if not self._pending:
+                    return 0
+                break
+            # O arquivo é compartilhado entre membros: posiciona a cada bloco.
+            self._f.seek(self._pos)
+            chunk = self._f.read(min(self.CHUNK_SIZE, self._remaining))
+            self._pos += len(chunk)
+            self._remaining -= len(chunk)
+            self._pending = self._inflate.decompress(chunk)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+class ReportArchive:
+    """Arquivo aberto para leitura: índice em memória e acesso aleatório aos membros."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        if self._f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{self.path} não é um arquivo de relatórios")
+        self._f.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, index_length, magic = FOOTER.unpack(self._f.read(FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: índice ausente ou truncado")
+        self._f.seek(index_offset)
+        index = json.loads(zlib.decompress(self._f.read(index_length)))
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: versão {index.get('version')} não suportada")
+        self.screenshots_dropped = index.get("screenshots_dropped", False)
+        self.members: Dict[str, Member] = {name: Member(**fields) for name, fields in index["members"].items()}
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def open(self, name: str):
+        """Membro como fluxo de texto (UTF-8), descomprimido sob demanda."""
+        stream = io.BufferedReader(_MemberStream(self._f, self.members[name]))
+        return io.TextIOWrapper(stream, encoding="utf-8")
+
+    def read(self, name: str) -> bytes:
+        member = self.members[name]
+        self._f.seek(member.offset)
+        return zlib.decompress(self._f.read(member.length))
+
+
+# Arquivos abertos: caminho -> (mtime_ns, PID, ReportArchive), do menos ao mais recente.
+_open_archives: "OrderedDict[str, Tuple[int, int, ReportArchive]]" = OrderedDict()
+MAX_OPEN_ARCHIVES = 32
+
+
+def open_archive(path: Path) -> ReportArchive:
+    """
+    ReportArchive reaproveitado enquanto o arquivo não mudar. Um arquivo
+    substituído (outro mtime) ou herdado de outro processo é fechado e aberto
+    de novo: workers criados por fork não podem dividir o descritor (e a
+    posição de leitura) com o processo pai. Acima de MAX_OPEN_ARCHIVES, o
+    menos usado recentemente é fechado.
+    """
+    key = str(path)
+    mtime_ns, pid = Path(path).stat().st_mtime_ns, os.getpid()
+    cached = _open_archives.get(key)
+    if cached is not None:
+        if cached[:2] == (mtime_ns, pid):
+            _open_archives.move_to_end(key)
+            return cached[2]
+        close_archives(path)
+    archive = ReportArchive(Path(path))
+    _open_archives[key] = (mtime_ns, pid, archive)
+    while len(_open_archives) > MAX_OPEN_ARCHIVES:
+        _, (_, _, evicted) = _open_archives.popitem(last=False)
+        evicted.close()
+    return archive
+
+
+def close_archives(path: Optional[Path] = None) -> None:
+    """Fecha o arquivo `path` aberto por open_archive, ou todos se `path` for None."""
+    keys = list(_open_archives) if path is None else [str(path)]
+    for key in keys:
+        cached = _open_archives.pop(key, None)
+        if cached is not None:
+            cached[2].close()
+
+
+def member(path: Path) -> Tuple[ReportArchive, str]:
+    """(arquivo aberto, nome) do membro apontado por um caminho virtual."""
+    archive, name = split_member_path(path)
+    return open_archive(archive), name
+
+
+def write_archive(dest: Path, reports: Iterable[Tuple[str, bytes, int, str, str]],
+                  level: int = 9, screenshots_dropped: bool = False) -> Dict[str, Member]:
+    """
+    Grava o arquivo (substituição atômica) a partir de tuplas (nome, conteúdo,
+    mtime_ns, fetchTime, finalUrl). Retorna o índice gravado.
+    """
+    dest = Path(dest)
+    tmp = dest.with_name(dest.name + ".tmp")
+    members: Dict[str, Member] = {}
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        for name, content, mtime_ns, fetch_time, final_url in reports:
+            compressed = zlib.compress(content, level)
+            members[name] = Member(offset=f.tell(), length=len(compressed), size=len(content),
+                                   mtime_ns=mtime_ns, sha1=hashlib.sha1(content).hexdigest(),
+                                   fetch_time=fetch_time, final_url=final_url)
+            f.write(compressed)
+        index = {
+            "version": FORMAT_VERSION,
+            "screenshots_dropped": screenshots_dropped,
+            "members": {name: vars(m) for name, m in members.items()},
+        }
+        blob = zlib.compress(json.dumps(index, ensure_ascii=False).encode("utf-8"), level)
+        index_offset = f.tell()
+        f.write(blob)
+        f.write(FOOTER.pack(index_offset, len(blob), MAGIC))
+    os.replace(tmp, dest)
+    return members
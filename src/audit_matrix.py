@@ -0,0 +1,229 @@
+"""
+Matriz execuções × audits: `score` e `numericValue` de todos os audits de
+cada relatório (cerca de 150), não só das métricas que o data_loader extrai.
+
+As linhas seguem a ordem de results/runs.npy (corpus, Desktop e depois
+Mobile) e levam os rótulos módulo/app/página/plataforma como códigos, o
+fetchTime e o score de performance. As colunas são os ids dos audits, na
+ordem em que aparecem nos relatórios; um audit que não existe no relatório,
+ou sem `score`/`numericValue` (notApplicable, manual, informative), fica NaN.
+O `scoreDisplayMode` de cada célula vai em uma terceira matriz de códigos.
+
+O armazenamento é results/audits.npz (compactado; as matrizes são quase só
+NaN nas colunas não aplicáveis) + results/audits.json com os nomes dos
+códigos, ids e títulos dos audits. Rankings de audits reprovados e
+correlações com o score de performance são operações sobre as matrizes,
+sem reler os JSONs.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import PLATFORMS, RESULTS_ROOT
+from src.data_loader import read_report_fields
+from src.run_table import CODE_FIELDS, parse_fetch_time
+
+AUDITS_PATH = RESULTS_ROOT / "audits.npz"
+FORMAT_VERSION = 1
+
+AUDIT_SPEC = {
+    "audits": {"*": {"title": True, "score": True, "numericValue": True, "scoreDisplayMode": True}},
+}
+
+# Modos em que o score é uma nota (aprovado a partir de PASS_THRESHOLD, como no relatório do Lighthouse).
+SCORED_MODES = ["binary", "numeric", "metricSavings"]
+PASS_THRESHOLD = 0.9
+MISSING_MODE = ""
+
+LABEL_DTYPE = np.dtype(
+    [(field, dtype) for field, dtype in zip(CODE_FIELDS, ("u1", "u2", "u4", "u1"))]
+    + [("fetch_time", "datetime64[ms]"), ("performance", "f8")]
+)
+
+
+def extract_audits(filepath: Path) -> Optional[Dict[str, dict]]:
+    """{id: {title, score, numericValue, scoreDisplayMode}} de um relatório."""
+    data = read_report_fields(filepath, AUDIT_SPEC)
+    if data is None:
+        return None
+    return data.get("audits", {})
+
+
+def build_audit_matrix(corpus, runs, jobs: int = 1):
+    """
+    Lê os audits de cada execução extraída (mesma ordem de results/runs.npy).
+    Retorna (rótulos, scores, valores, modos, metadados).
+    """
+    labelled = []
+    for (module, app), page_files in corpus.items():
+        for page, files_by_platform in page_files.items():
+            for platform in PLATFORMS:
+                for filepath in files_by_platform[platform]:
+                    if runs.get(filepath) is not None:
+                        labelled.append(((module, app, page, platform), filepath))
+
+    paths = [filepath for _, filepath in labelled]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            extracted = list(executor.map(extract_audits, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        extracted = [extract_audits(path) for path in paths]
+
+    categories: Dict[str, List[str]] = {field: [] for field in CODE_FIELDS}
+    categories["platform"] = list(PLATFORMS)
+    codes = {field: {name: code for code, name in enumerate(names)} for field, names in categories.items()}
+    modes = [MISSING_MODE]
+    mode_codes = {MISSING_MODE: 0}
+    audit_ids: Dict[str, int] = {}
+    titles: List[str] = []
+
+    def code(table: Dict[str, int], names: List[str], value: str) -> int:
+        if value not in table:
+            table[value] = len(names)
+            names.append(value)
+        return table[value]
+
+    for audits in extracted:
+        for audit_id, audit in (audits or {}).items():
+            if audit_id not in audit_ids:
+                audit_ids[audit_id] = len(titles)
+                titles.append(audit.get("title") or audit_id)
+
+    n_runs, n_audits = len(labelled), len(audit_ids)
+    labels = np.zeros(n_runs, dtype=LABEL_DTYPE)
+    scores = np.full((n_runs, n_audits), np.nan, dtype=np.float32)
+    values = np.full((n_runs, n_audits), np.nan, dtype=np.float64)
+    mode_matrix = np.zeros((n_runs, n_audits), dtype=np.uint8)
+    for row, ((label, filepath), audits) in enumerate(zip(labelled, extracted)):
+        run = runs[filepath]
+        for field, value in zip(CODE_FIELDS, label):
+            labels[field][row] = code(codes[field], categories[field], value)
+        labels["fetch_time"][row] = parse_fetch_time(run.fetch_time)
+        labels["performance"][row] = run.scores["performance"]
+        for audit_id, audit in (audits or {}).items():
+            column = audit_ids[audit_id]
+            if audit.get("score") is not None:
+                scores[row, column] = audit["score"]
+            if audit.get("numericValue") is not None:
+                values[row, column] = audit["numericValue"]
+            mode_matrix[row, column] = code(mode_codes, modes, audit.get("scoreDisplayMode") or MISSING_MODE)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "categories": categories,
+        "audits": list(audit_ids),
+        "titles": titles,
+        "modes": modes,
+    }
+    return labels, scores, values, mode_matrix, meta
+
+
+def write_audit_matrix(corpus, runs, path: Path = AUDITS_PATH, jobs: int = 1) -> Tuple[int, int]:
+    """Grava audits.npz e audits.json (substituição atômica). Retorna (execuções, audits)."""
+    labels, scores, values, modes, meta = build_audit_matrix(corpus, runs, jobs=jobs)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, labels=labels, scores=scores, values=values, modes=modes)
+    os.replace(tmp, path)
+    meta_path = path.with_suffix(".json")
+    tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+    tmp_meta.write_text(json.dumps(meta, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_meta, meta_path)
+    return scores.shape
+
+
+class AuditMatrix:
+    """Matriz de audits carregada, com filtros por rótulo, ranking de reprovações e correlações."""
+
+    def __init__(self, labels: np.ndarray, scores: np.ndarray, values: np.ndarray, modes: np.ndarray, meta: dict):
+        self.labels = labels
+        self.scores = scores
+        self.values = values
+        self.modes = modes
+        self.meta = meta
+        self.categories = meta["categories"]
+        self.audits = meta["audits"]
+        self.titles = meta["titles"]
+
+    @classmethod
+    def load(cls, path: Path = AUDITS_PATH) -> Optional["AuditMatrix"]:
+        """Abre a matriz; None se ela não existir ou for de outra versão do formato."""
+        path = Path(path)
+        meta_path = path.with_suffix(".json")
+        if not path.exists() or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != FORMAT_VERSION:
+            return None
+        with np.load(path) as arrays:
+            return cls(arrays["labels"], arrays["scores"], arrays["values"], arrays["modes"], meta)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def select(self, **filters: Optional[str]) -> "AuditMatrix":
+        """Execuções cujos rótulos batem com os filtros (None = qualquer valor)."""
+        selected = np.ones(len(self.labels), dtype=bool)
+        for field, value in filters.items():
+            if value is None:
+                continue
+            names = self.categories[field]
+            selected &= self.labels[field] == (names.index(value) if value in names else -1)
+        return AuditMatrix(self.labels[selected], self.scores[selected], self.values[selected],
+                           self.modes[selected], self.meta)
+
+    def failing(self, threshold: float = PASS_THRESHOLD) -> np.ndarray:
+        """Máscara (execuções, audits) dos audits com nota abaixo de `threshold`."""
+        scored = np.isin(self.modes, [self.meta["modes"].index(mode) for mode in SCORED_MODES
+                                      if mode in self.meta["modes"]])
+        with np.errstate(invalid="ignore"):
+            return scored & (self.scores < threshold)
+
+    def failure_rates(self, by: Sequence[str] = (), threshold: float = PASS_THRESHOLD):
+        """
+        Fração das execuções de cada grupo (campos de `by`, ex.: ["app"]) em que
+        cada audit foi reprovado. Retorna ([chaves], taxas (grupos, audits),
+        execuções por grupo).
+        """
+        if not len(self.labels):
+            return [], np.zeros((0, len(self.audits))), np.zeros(0, dtype=np.intp)
+        if by:
+            sizes = [max(len(self.categories[field]), 1) for field in by]
+            combined = np.ravel_multi_index([self.labels[field].astype(np.intp) for field in by], sizes)
+            unique, groups = np.unique(combined, return_inverse=True)
+            keys = list(zip(*[[self.categories[field][c] for c in group.tolist()]
+                              for field, group in zip(by, np.unravel_index(unique, sizes))]))
+        else:
+            groups, keys = np.zeros(len(self.labels), dtype=np.intp), [()]
+        groups = groups.ravel()
+        counts = np.zeros((len(keys), len(self.audits)))
+        np.add.at(counts, groups, self.failing(threshold))
+        n_runs = np.bincount(groups, minlength=len(keys))
+        return keys, counts / n_runs[:, None], n_runs
+
+    def correlations(self, target: Optional[np.ndarray] = None, matrix: str = "scores") -> np.ndarray:
+        """
+        Correlação de Pearson de cada audit (`scores` ou `values`) com `target`
+        (padrão: o score de performance), ignorando os NaN par a par. Audits com
+        menos de 3 execuções ou variância nula ficam NaN.
+        """
+        y = self.labels["performance"] if target is None else np.asarray(target, dtype=np.float64)
+        x = getattr(self, matrix).astype(np.float64)
+        present = ~np.isnan(x) & ~np.isnan(y)[:, None]
+        n = present.sum(axis=0)
+        x = np.where(present, x, 0.0)
+        y = np.where(present, np.nan_to_num(y)[:, None], 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x = x.sum(axis=0) / n
+            mean_y = y.sum(axis=0) / n
+            dx = np.where(present, x - mean_x, 0.0)
+            dy = np.where(present, y - mean_y, 0.0)
+            r = (dx * dy).sum(axis=0) / np.sqrt((dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+        r[n < 3] = np.nan
+        return r
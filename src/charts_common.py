@@ -1,52 +1,53 @@
 """
 Utilitários comuns para geração de gráficos do TCC:
-- Leitura de CSVs em results/<app>/<module>/.
-- Constantes compartilhadas (cores, rótulos, listas de apps/módulos/categorias).
-- Funções de agregação (médias/DP) e plotagem de barras agrupadas.
+- Leitura da tabela de execuções (results/runs.npy) ou dos CSVs em
+  results/<app>/<module>/ (ResultsStore carrega tudo uma vez).
+- Constantes compartilhadas (reexportadas de src/config.py).
+- Funções de agregação (médias/DP) e plotagem de barras agrupadas, que podem ser
+  coletadas (collect_plots) e rasterizadas depois em paralelo (render_plots).
 """
 import csv
-import statistics
+import hashlib
+import json
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
-import matplotlib.pyplot as plt
-
-# Estilo padrão
-plt.style.use("ggplot")
-
-APPS = ["ufc-hub", "sigaa", "ufc-noticias"]
-MODULES = ["Lighthouse", "PageSpeed"]
-CATEGORIES = ["performance", "accessibility", "best-practices", "seo"]
-PLATFORMS = ["Desktop", "Mobile"]
-
-RESULTS_ROOT = Path("results")
-FIGS_ROOT = Path("figs")
-
-COLORS = {
-    "Desktop": "#2b7fff",
-    "Mobile": "#EA4335",
-    "ufc-hub": "#2b7fff",
-    "sigaa": "#ffd503",
-    "ufc-noticias": "#f83c5b",
-}
-
-APP_LABELS = {
-    "ufc-hub": "UFC Hub",
-    "sigaa": "SIGAA",
-    "ufc-noticias": "UFC Notícias",
-}
-
-MODULE_LABELS = {
-    "Lighthouse": "Lighthouse",
-    "PageSpeed": "PageSpeed Insights",
-}
-
-CAT_LABELS = {
-    "performance": "Performance",
-    "accessibility": "Acessibilidade",
-    "best-practices": "Boas Práticas",
-    "seo": "SEO",
-}
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .config import (  # noqa: F401 - reexportados para os geradores
+    APP_LABELS,
+    APPS,
+    CAT_LABELS,
+    CATEGORIES,
+    COLORS,
+    FIGS_MANIFEST,
+    FIGS_ROOT,
+    MODULE_LABELS,
+    MODULES,
+    PLATFORMS,
+    RESULTS_ROOT,
+)
+from .records import STAT_FIELDS, RecordTable
+from .resampling import ci_paths, yerr
+from .run_table import METRIC_COLUMNS, RUNS_PATH, SCORE_COLUMNS, SCORE_CSV_FORMAT, RunTable, csv_format
+from .stats import STAT_LABELS
+
+_plt = None
+
+
+def _pyplot():
+    """Importa o pyplot (e aplica o estilo padrão) só quando algo vai ser desenhado."""
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+
+        # Estilo padrão
+        plt.style.use("ggplot")
+        _plt = plt
+    return _plt
 
 
 def ensure_dir(path: Path) -> None:
@@ -153,24 +154,163 @@ def read_performance(app_filter: Optional[Iterable[str]] = None,
     return records
 
 
-def group_mean_stdev(records: Iterable[dict], key_fields: Sequence[str], value_field: str = "mean"):
-    acc = defaultdict(list)
-    for rec in records:
-        key = tuple(rec[k] for k in key_fields)
-        acc[key].append(rec[value_field])
-
-    result = {}
-    for key, values in acc.items():
-        if values:
-            mean_val = statistics.mean(values)
-            stdev_val = statistics.stdev(values) if len(values) > 1 else 0.0
-        else:
-            mean_val = 0.0
-            stdev_val = 0.0
-        result[key] = {"mean": mean_val, "stdev": stdev_val}
+def read_intervals(module: str, kind: str = "metrics") -> Dict[tuple, tuple]:
+    """
+    IC de bootstrap gravados por generate_statistics.py para um módulo (`kind`
+    "metrics" ou "scores"): (app, plataforma, métrica, estatística) ->
+    (valor, limite inferior, limite superior), com a estatística como em
+    src.stats (mean/median/p75). Para barras de erro, ver interval_bars.
+    """
+    path = ci_paths(module)[0 if kind == "metrics" else 1]
+    intervals: Dict[tuple, tuple] = {}
+    if not path.exists():
+        return intervals
+    apps = {label: app for app, label in APP_LABELS.items()}
+    stats = {label: stat for stat, label in STAT_LABELS.items()}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                key = (apps[row["App"]], row["Plataforma"], row.get("Métrica") or row["Categoria"],
+                       stats[row["Estatística"]])
+                intervals[key] = (float(row["Valor"]), float(row["IC inferior"]), float(row["IC superior"]))
+            except (KeyError, ValueError):
+                continue
+    return intervals
+
+
+# Sufixo dos títulos dos gráficos com barras de erro de IC (generate_charts.py --ci).
+CI_TITLE = " (barras: IC de bootstrap da média)"
+
+
+def interval_bars(intervals: Dict[tuple, tuple], keys: Sequence[tuple]):
+    """
+    Alturas e `yerr` (2, n) de uma série de barras a partir dos IC de `keys`
+    (chaves de read_intervals); chave sem IC vira barra zerada, sem erro.
+    """
+    cells = [intervals.get(key, (0.0, 0.0, 0.0)) for key in keys]
+    estimates, lows, highs = zip(*cells) if cells else ((), (), ())
+    return list(estimates), yerr(estimates, lows, highs).tolist()
+
+
+def _round_each(values: np.ndarray, decimals: int) -> np.ndarray:
+    # round() do Python, elemento a elemento: mesmo valor que o texto do CSV relido com float().
+    return np.array([round(v, decimals) for v in values.tolist()], dtype=float)
+
+
+def read_run_table(table: RunTable):
+    """
+    Registros por página a partir da tabela de execuções (results/runs.npy), com
+    as mesmas chaves, unidades e arredondamento de read_performance/read_scores:
+    gráficos e CSVs mostram os mesmos números.
+    Retorna (RecordTable de performance, RecordTable de scores).
+    """
+    keys, metric_stats, score_stats = table.page_stats()
+    # Códigos das páginas/plataformas; cada uma se repete para todas as métricas (ou categorias).
+    categories = {field: [] for field in ["module", "app", "page", "platform"]}
+    lookup = {field: {} for field in categories}
+    page_codes = {field: np.empty(len(keys), dtype=np.uint32) for field in categories}
+    for pos, key in enumerate(keys):
+        for field, value in zip(categories, key):
+            if value not in lookup[field]:
+                lookup[field][value] = len(categories[field])
+                categories[field].append(value)
+            page_codes[field][pos] = lookup[field][value]
+
+    def build(key_field: str, names: List[str], page_stats: Dict[str, np.ndarray], formats) -> RecordTable:
+        n_keys = len(names)
+        units = sorted({unit for _, unit, _ in formats})
+        codes = {field: np.repeat(values, n_keys) for field, values in page_codes.items()}
+        codes[key_field] = np.tile(np.arange(n_keys, dtype=np.uint32), len(keys))
+        codes["unit"] = np.tile(np.array([units.index(unit) for _, unit, _ in formats], dtype=np.uint32), len(keys))
+        stats = {}
+        for name in STAT_FIELDS:
+            matrix = page_stats[name]
+            columns = [_round_each(matrix[:, col] * factor, decimals)
+                       for col, (factor, _, decimals) in enumerate(formats)]
+            stats[name] = np.stack(columns, axis=1).ravel() if columns else np.empty(0)
+        return RecordTable.from_columns(key_field, {**categories, key_field: list(names), "unit": units},
+                                        codes, stats)
+
+    metrics = list(METRIC_COLUMNS)
+    score_categories = list(SCORE_COLUMNS)
+    # Scores já vêm em porcentagem de page_stats; só o arredondamento se aplica.
+    score_format = (1,) + SCORE_CSV_FORMAT[1:]
+    performance = build("metric", metrics, metric_stats, [csv_format(m) for m in metrics])
+    scores = build("category", score_categories, score_stats, [score_format] * len(score_categories))
+    return performance, scores
+
+
+class ResultsStore:
+    """
+    Registros de results/ lidos uma única vez, como RecordTable (códigos
+    categóricos + colunas float), filtrados por app, módulo, página, plataforma
+    e métrica/categoria com máscaras vetorizadas. Vêm da tabela de execuções
+    (results/runs.npy) quando ela existe; senão, dos CSVs por página.
+    Os geradores de gráficos recebem a mesma instância em vez de reler os dados.
+    """
+
+    def __init__(self, performance: RecordTable, scores: RecordTable, sources: Sequence[Path] = ()):
+        self._performance = performance
+        self._scores = scores
+        self.sources = list(sources)  # arquivos lidos, para a instrumentação
+
+    @classmethod
+    def load(cls) -> "ResultsStore":
+        table = RunTable.load(RUNS_PATH)
+        if table is not None:
+            return cls(*read_run_table(table), sources=[RUNS_PATH, RUNS_PATH.with_suffix(".json")])
+        return cls(RecordTable.from_dicts("metric", read_performance()),
+                   RecordTable.from_dicts("category", read_scores()),
+                   sources=sorted(RESULTS_ROOT.glob("*/*/*.csv")))
+
+    def performance(self, app: Optional[str] = None, module: Optional[str] = None,
+                    page: Optional[str] = None, platform: Optional[str] = None,
+                    metric: Optional[str] = None) -> RecordTable:
+        return self._performance.select(app=app, module=module, page=page, platform=platform, metric=metric)
+
+    def scores(self, app: Optional[str] = None, module: Optional[str] = None,
+               page: Optional[str] = None, platform: Optional[str] = None,
+               category: Optional[str] = None) -> RecordTable:
+        return self._scores.select(app=app, module=module, page=page, platform=platform, category=category)
+
+
+def _as_table(records) -> RecordTable:
+    if isinstance(records, RecordTable):
+        return records
+    records = list(records)
+    key_field = "category" if records and "category" in records[0] else "metric"
+    return RecordTable.from_dicts(key_field, records)
+
+
+def group_mean_stdev(records, key_fields: Sequence[str], value_field: str = "mean"):
+    """Média/DP de `value_field` por chave (aceita RecordTable ou lista de dicts)."""
+    return _as_table(records).group_mean_stdev(key_fields, value_field)
+
+
+def group_by(records, key_fields: Sequence[str]) -> Dict[tuple, RecordTable]:
+    """Agrupa os registros uma única vez: chave -> RecordTable, na ordem original."""
+    return _as_table(records).group_by(key_fields)
+
+
+def grouped_stats(records, group_fields: Sequence[str], key_fields: Sequence[str],
+                  value_field: str = "mean") -> Dict[tuple, Dict[tuple, dict]]:
+    """
+    group_mean_stdev para todos os grupos em uma passada:
+    grupo (group_fields) -> chave (key_fields) -> {"mean", "stdev"}.
+    """
+    flat = group_mean_stdev(records, list(group_fields) + list(key_fields), value_field)
+    size = len(group_fields)
+    result = defaultdict(dict)
+    for key, stats in flat.items():
+        result[key[:size]][key[size:]] = stats
     return result
 
 
+# Quando não é None, plot_grouped_series só registra a especificação do gráfico
+# aqui (ver collect_plots) e a rasterização fica para render_plots.
+_collected_plots: Optional[List[dict]] = None
+
+
 def plot_grouped_series(x_labels: Sequence[str],
                         series: Sequence[dict],
                         title: str,
@@ -180,6 +320,31 @@ def plot_grouped_series(x_labels: Sequence[str],
                         rotation: int = 0,
                         bar_width: float = 0.35,
                         value_fmt: str = "%.1f") -> None:
+    spec = {
+        "x_labels": list(x_labels),
+        "series": [dict(s) for s in series],
+        "title": title,
+        "ylabel": ylabel,
+        "out_path": Path(out_path),
+        "ylim": ylim,
+        "rotation": rotation,
+        "bar_width": bar_width,
+        "value_fmt": value_fmt,
+    }
+    if _collected_plots is not None:
+        _collected_plots.append(spec)
+        return
+    _render_plot(spec)
+    print(f"Gráfico gerado: {out_path}")
+
+
+def _render_plot(spec: dict) -> Path:
+    x_labels = spec["x_labels"]
+    series = spec["series"]
+    bar_width = spec["bar_width"]
+    out_path = spec["out_path"]
+
+    plt = _pyplot()
     x = list(range(len(x_labels)))
     fig, ax = plt.subplots(figsize=(10, 6))
     bars = []
@@ -198,19 +363,106 @@ def plot_grouped_series(x_labels: Sequence[str],
         bars.append(rects)
 
     ax.set_xticks(x)
-    ax.set_xticklabels(x_labels, rotation=rotation, fontsize=11, fontweight="bold")
-    ax.set_ylabel(ylabel, fontsize=11)
-    if ylim:
-        ax.set_ylim(*ylim)
-    ax.set_title(title, fontsize=14, pad=16)
+    ax.set_xticklabels(x_labels, rotation=spec["rotation"], fontsize=11, fontweight="bold")
+    ax.set_ylabel(spec["ylabel"], fontsize=11)
+    if spec["ylim"]:
+        ax.set_ylim(*spec["ylim"])
+    ax.set_title(spec["title"], fontsize=14, pad=16)
     if any(s.get("label") for s in series):
         ax.legend(fontsize=12)
 
     for rects in bars:
-        ax.bar_label(rects, fmt=value_fmt, padding=3, fontsize=10, fontweight="bold")
+        ax.bar_label(rects, fmt=spec["value_fmt"], padding=3, fontsize=10, fontweight="bold")
 
     ensure_dir(out_path.parent)
     plt.tight_layout()
     plt.savefig(out_path, dpi=300)
     plt.close(fig)
-    print(f"Gráfico gerado: {out_path}")
+    return out_path
+
+
+@contextmanager
+def collect_plots():
+    """
+    Dentro do bloco, plot_grouped_series apenas acumula as especificações
+    (rótulos, séries, título, caminho...) na lista devolvida, sem desenhar.
+    """
+    global _collected_plots
+    previous = _collected_plots
+    _collected_plots = []
+    try:
+        yield _collected_plots
+    finally:
+        _collected_plots = previous
+
+
+# Faz parte da impressão digital: incrementar ao mudar _render_plot redesenha tudo.
+RENDER_VERSION = 1
+
+
+def plot_fingerprint(spec: dict) -> str:
+    """Hash das entradas de um gráfico (valores, erros, rótulos, título e estilo)."""
+    payload = dict(spec, out_path=str(spec["out_path"]), render_version=RENDER_VERSION)
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(path: Path) -> Dict[str, str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: Path, manifest: Dict[str, str]) -> None:
+    ensure_dir(path.parent)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def _init_render_worker() -> None:
+    # Workers nunca abrem janelas: força o backend headless.
+    _pyplot().switch_backend("Agg")
+
+
+def render_plots(specs: Sequence[dict], jobs: int = 1,
+                 manifest_path: Optional[Path] = None, force: bool = False) -> int:
+    """
+    Rasteriza as especificações coletadas; com jobs > 1 usa um pool de processos.
+    Retorna o número de figuras efetivamente gravadas.
+
+    Com `manifest_path`, gráficos cuja impressão digital não mudou desde a última
+    execução (e cujo PNG ainda existe) são pulados; `force` redesenha todos.
+    """
+    manifest = _load_manifest(manifest_path) if manifest_path else {}
+    fingerprints = [plot_fingerprint(spec) for spec in specs]
+    if manifest_path and not force:
+        todo = [(spec, fp) for spec, fp in zip(specs, fingerprints)
+                if manifest.get(str(spec["out_path"])) != fp or not spec["out_path"].exists()]
+        skipped = len(specs) - len(todo)
+        if skipped:
+            print(f"{skipped} gráficos inalterados desde a última execução (pulados)")
+        specs = [spec for spec, _ in todo]
+        fingerprints = [fp for _, fp in todo]
+
+    _rasterize(specs, jobs)
+
+    if manifest_path:
+        for spec, fp in zip(specs, fingerprints):
+            manifest[str(spec["out_path"])] = fp
+        _save_manifest(manifest_path, manifest)
+    return len(specs)
+
+
+def _rasterize(specs: Sequence[dict], jobs: int) -> None:
+    if jobs > 1 and len(specs) > 1:
+        chunksize = max(1, len(specs) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker) as executor:
+            for out_path in executor.map(_render_plot, specs, chunksize=chunksize):
+                print(f"Gráfico gerado: {out_path}")
+    else:
+        for spec in specs:
+            print(f"Gráfico gerado: {_render_plot(spec)}")
@@ -0,0 +1,43 @@
+"""
+Constantes compartilhadas por ingestão e gráficos (apps, módulos, categorias,
+plataformas, caminhos, cores e rótulos).
+
+Não importa matplotlib: os scripts que só leem JSON e escrevem CSV dependem
+apenas deste módulo, e o pyplot fica para quando algum gráfico é desenhado.
+"""
+from pathlib import Path
+
+APPS = ["ufc-hub", "sigaa", "ufc-noticias"]
+MODULES = ["Lighthouse", "PageSpeed"]
+CATEGORIES = ["performance", "accessibility", "best-practices", "seo"]
+PLATFORMS = ["Desktop", "Mobile"]
+
+RESULTS_ROOT = Path("results")
+FIGS_ROOT = Path("figs")
+FIGS_MANIFEST = FIGS_ROOT / ".manifest.json"
+
+COLORS = {
+    "Desktop": "#2b7fff",
+    "Mobile": "#EA4335",
+    "ufc-hub": "#2b7fff",
+    "sigaa": "#ffd503",
+    "ufc-noticias": "#f83c5b",
+}
+
+APP_LABELS = {
+    "ufc-hub": "UFC Hub",
+    "sigaa": "SIGAA",
+    "ufc-noticias": "UFC Notícias",
+}
+
+MODULE_LABELS = {
+    "Lighthouse": "Lighthouse",
+    "PageSpeed": "PageSpeed Insights",
+}
+
+CAT_LABELS = {
+    "performance": "Performance",
+    "accessibility": "Acessibilidade",
+    "best-practices": "Boas Práticas",
+    "seo": "SEO",
+}
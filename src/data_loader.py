@@ -1,40 +1,550 @@
 """
 Funções utilitárias para ler JSONs de auditoria e listar arquivos por app/módulo/página.
+`extract_run` lê cada relatório uma única vez (métricas, scores e metadados).
 Compartilha lógica entre process_lighthouse.py e generate_consolidated_csv.py.
 """
+import hashlib
 import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from src.charts_common import APPS, MODULES, CATEGORIES
+from src.archive import archive_path, member as archive_member, split_member_path, ReportArchive
+from src.config import APPS, MODULES, CATEGORIES
+from src.instrumentation import Instrumentation, Stage
 
 DATA_ROOT = Path("data")
+CACHE_PATH = DATA_ROOT / ".extract_cache.sqlite"
+INDEX_PATH = DATA_ROOT / ".corpus_index.json"
 METRIC_KEYS = ["TTFB", "FCP", "TBT", "LCP", "CLS", "SI", "Total Transfer Size"]
 CATEGORY_KEYS = list(CATEGORIES)
 
+# Trechos do relatório usados pela extração: True mantém o valor inteiro, um dict
+# seleciona chaves ("*" vale para qualquer chave) e [spec] aplica spec a cada item.
+_NUMERIC_VALUE = {"numericValue": True}
+REPORT_SPEC = {
+    "fetchTime": True,
+    "lighthouseVersion": True,
+    "finalUrl": True,
+    "finalDisplayedUrl": True,
+    "categories": {"*": {"score": True}},
+    "audits": {
+        "server-response-time": _NUMERIC_VALUE,
+        "first-contentful-paint": _NUMERIC_VALUE,
+        "largest-contentful-paint": _NUMERIC_VALUE,
+        "cumulative-layout-shift": _NUMERIC_VALUE,
+        "total-blocking-time": _NUMERIC_VALUE,
+        "speed-index": _NUMERIC_VALUE,
+        "diagnostics": {"details": {"items": True}},
+        "network-requests": {"details": {"items": [{"transferSize": True}]}},
+    },
+}
 
-def list_page_files(module: str, app: str):
-    """Retorna dict page -> {"Desktop": [files], "Mobile": [files]} para o app/módulo."""
-    base = DATA_ROOT / module / app
-    if not base.exists():
-        return {}
 
-    pages = {}
-    for page_dir in sorted(p for p in base.iterdir() if p.is_dir()):
-        pages[page_dir.name] = {
-            "Desktop": sorted(page_dir.glob("*.json")),
-            "Mobile": sorted((page_dir / "mobile").glob("*.json")),
+def list_page_files(module: str, app: str, index: Optional["CorpusIndex"] = None):
+    """
+    Retorna dict page -> {"Desktop": [files], "Mobile": [files]} para o app/módulo.
+    Consulta o índice do corpus (data/.corpus_index.json), atualizado antes só
+    nos diretórios cujo mtime mudou.
+    """
+    if index is None:
+        with CorpusIndex() as index:
+            return index.page_files(module, app)
+    return index.page_files(module, app)
+
+
+def scan_corpus(modules: Iterable[str] = MODULES, apps: Iterable[str] = APPS,
+                index: Optional["CorpusIndex"] = None):
+    """Lista data/ pelo índice do corpus: (módulo, app) -> saída de list_page_files."""
+    if index is None:
+        with CorpusIndex() as index:
+            return scan_corpus(modules, apps, index)
+    return {(module, app): index.page_files(module, app) for app in apps for module in modules}
+
+
+def corpus_files(corpus) -> List[Path]:
+    """Todos os JSONs de um corpus, na ordem em que os scripts os percorrem."""
+    files = []
+    for page_files in corpus.values():
+        for files_by_platform in page_files.values():
+            files.extend(files_by_platform["Desktop"])
+            files.extend(files_by_platform["Mobile"])
+    return files
+
+
+def shard_slice(files: List[Path], shard: int, count: int) -> List[Path]:
+    """Fatia contígua `shard` (1..count) da lista de arquivos, em partes de tamanho quase igual."""
+    if not 1 <= shard <= count:
+        raise ValueError(f"shard {shard} fora de 1..{count}")
+    return files[len(files) * (shard - 1) // count:len(files) * shard // count]
+
+
+# Sufixo que navegadores e sistemas acrescentam ao salvar de novo o mesmo arquivo.
+_COPY_SUFFIX = re.compile(r" \(\d+\)$")
+
+
+def drop_duplicates(corpus, index: "CorpusIndex"):
+    """
+    Remove do corpus relatórios repetidos (o mesmo JSON salvo com outro nome,
+    ex.: "relatorio (1).json"). De cada grupo fica o arquivo de nome canônico
+    (sem o sufixo " (N)"); entre nomes equivalentes, o de mtime mais antigo.
+
+    A impressão digital barata é (tamanho, fetchTime, finalUrl), vinda do índice
+    do corpus; só quando ela coincide o hash do conteúdo confirma a duplicata.
+    Retorna (corpus sem duplicatas, [(arquivo descartado, arquivo mantido)]),
+    ambos na ordem do corpus.
+    """
+    files = [filepath
+             for page_files in corpus.values()
+             for files_by_platform in page_files.values()
+             for platform_files in files_by_platform.values()
+             for filepath in platform_files]
+
+    def preference(filepath: Path):
+        return (bool(_COPY_SUFFIX.search(Path(filepath).stem)), index.stat(filepath)[1], str(filepath))
+
+    kept: Dict[tuple, List[Path]] = {}
+    originals: Dict[Path, Path] = {}
+    for filepath in sorted(files, key=preference):
+        size, _, fetch_time, final_url = index.stat(filepath)
+        if not fetch_time:
+            continue
+        candidates = kept.setdefault((size, fetch_time, final_url), [])
+        digest = _file_digest(filepath) if candidates else None
+        original = next((c for c in candidates if _file_digest(c) == digest), None)
+        if original is None:
+            candidates.append(filepath)
+        else:
+            originals[filepath] = original
+
+    result = {
+        key: {
+            page: {platform: [f for f in platform_files if f not in originals]
+                   for platform, platform_files in files_by_platform.items()}
+            for page, files_by_platform in page_files.items()
         }
-    return pages
+        for key, page_files in corpus.items()
+    }
+    return result, [(filepath, originals[filepath]) for filepath in files if filepath in originals]
 
 
-def get_metrics(filepath: Path):
+def _open_report(filepath: Path):
+    """Abre o relatório como texto, seja um JSON em disco ou um membro de um .lharchive."""
+    if split_member_path(filepath):
+        reader, name = archive_member(filepath)
+        return reader.open(name)
+    return open(filepath, "r", encoding="utf-8")
+
+
+def read_report_bytes(filepath: Path) -> bytes:
+    """Conteúdo bruto do relatório (descomprimido, se vier de um .lharchive)."""
+    if split_member_path(filepath):
+        reader, name = archive_member(filepath)
+        return reader.read(name)
+    return Path(filepath).read_bytes()
+
+
+def _stored_size(filepath: Path) -> int:
+    """Bytes lidos do disco para obter o relatório (comprimidos, se vier de um .lharchive)."""
+    if split_member_path(filepath):
+        reader, name = archive_member(filepath)
+        return reader.members[name].length
+    return Path(filepath).stat().st_size
+
+
+def _read_report(filepath: Path) -> Optional[dict]:
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with _open_report(filepath) as f:
+            return json.load(f)
     except Exception as exc:
         print(f"Erro lendo {filepath}: {exc}")
         return None
 
+
+class _StreamReader:
+    """
+    Percorre um relatório em blocos, decodificando um valor JSON de cada vez.
+
+    Só o valor corrente fica em memória; objetos grandes que não interessam
+    (screenshots em base64, i18n, timing...) são lidos e descartados em seguida.
+    """
+    CHUNK_SIZE = 16 * 1024
+    _WS = re.compile(r"[ \t\n\r]*")
+    _STR_SPECIAL = re.compile(r'["\\]')
+    _SCALAR_END = re.compile(r"[,}\]\s]")
+    _KEY = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:')
+    _SEP = re.compile(r"[ \t\n\r]*([,}\]])")
+    _DECODER = json.JSONDecoder()
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # pos pode passar do fim do buffer quando um escape fica entre dois blocos.
+        overshoot = max(0, self.pos - len(self.buf))
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = overshoot
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = self._WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.CHUNK_SIZE):
+                raise ValueError("fim inesperado do JSON")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"esperado '{char}' na posição {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica o próximo valor, lendo mais blocos enquanto ele estiver incompleto."""
+        if self.peek() not in '{["':
+            # Números e literais só são decodificados inteiros, nunca cortados no fim do bloco.
+            while self._SCALAR_END.search(self.buf, self.pos) is None and self._fill(self.CHUNK_SIZE):
+                pass
+        size = self.CHUNK_SIZE
+        while True:
+            try:
+                obj, end = self._DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            self.pos = end
+            return obj
+
+    def skip(self) -> None:
+        """Pula o próximo valor sem materializar o que não cabe no bloco atual."""
+        char = self.peek()
+        if char not in '{["':
+            self.value()
+            return
+        try:
+            _, end = self._DECODER.raw_decode(self.buf, self.pos)
+            if end < len(self.buf):
+                self.pos = end
+                return
+        except json.JSONDecodeError:
+            pass
+
+        # Valor maior que o bloco: desce um nível e pula cada item separadamente.
+        if char == "{":
+            for _ in self.members():
+                self.skip()
+        elif char == "[":
+            for _ in self.items():
+                self.skip()
+        else:
+            self._skip_string()
+
+    def _skip_string(self) -> None:
+        self.pos += 1
+        while True:
+            if self.pos >= len(self.buf) and not self._fill(self.CHUNK_SIZE):
+                raise ValueError("fim inesperado do JSON")
+            m = self._STR_SPECIAL.search(self.buf, self.pos)
+            if m is None:
+                self.pos = len(self.buf)
+            elif m.group() == "\\":
+                self.pos = m.end() + 1
+            else:
+                self.pos = m.end()
+                return
+
+    def _close(self, end: str) -> bool:
+        """Consome o separador após um item; True quando o contêiner termina."""
+        m = self._SEP.match(self.buf, self.pos)
+        if m is not None:
+            sep = m.group(1)
+            self.pos = m.end()
+        else:
+            sep = self.peek()
+            self.pos += 1
+        if sep == end:
+            return True
+        if sep != ",":
+            raise ValueError(f"esperado ',' ou '{end}' na posição {self.pos - 1}")
+        return False
+
+    def items(self):
+        """Itera os elementos de um array; quem consome deve ler (ou pular) cada um."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self._close("]"):
+                return
+
+    def members(self):
+        """Itera as chaves de um objeto; quem consome deve ler (ou pular) cada valor."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            m = self._KEY.match(self.buf, self.pos)
+            if m is not None:
+                key = m.group(1)
+                self.pos = m.end()
+            else:
+                # Chave com escapes ou cortada no fim do bloco.
+                key = self.value()
+                self.expect(":")
+            yield key
+            if self._close("}"):
+                return
+
+
+def _select(reader: _StreamReader, spec):
+    """Lê o próximo valor mantendo apenas o que `spec` pede."""
+    if spec is True:
+        return reader.value()
+    if isinstance(spec, list):
+        if reader.peek() != "[":
+            return reader.value()
+        return [_select(reader, spec[0]) for _ in reader.items()]
+    if reader.peek() != "{":
+        return reader.value()
+    selected = {}
+    for key in reader.members():
+        sub_spec = spec.get(key, spec.get("*"))
+        if sub_spec is None:
+            reader.skip()
+        else:
+            selected[key] = _select(reader, sub_spec)
+    return selected
+
+
+def read_report_fields(filepath: Path, spec: dict = REPORT_SPEC) -> Optional[dict]:
+    """
+    Lê o relatório em blocos e monta apenas os trechos descritos em `spec`
+    (ver REPORT_SPEC); screenshots e demais audits são pulados. None se o
+    arquivo não puder ser lido.
+    """
+    try:
+        with _open_report(filepath) as f:
+            return _select(_StreamReader(f), spec)
+    except Exception as exc:
+        print(f"Erro lendo {filepath}: {exc}")
+        return None
+
+
+def read_report_header(filepath: Path, keys: Iterable[str] = ("fetchTime", "finalUrl")) -> Dict[str, object]:
+    """
+    Lê só as chaves de topo pedidas, parando assim que todas aparecem. Nos
+    relatórios do Lighthouse e do PageSpeed elas vêm antes de "audits", então
+    basta o primeiro bloco do arquivo.
+    """
+    wanted = set(keys)
+    found = {}
+    try:
+        with _open_report(filepath) as f:
+            reader = _StreamReader(f)
+            for key in reader.members():
+                if key in wanted:
+                    found[key] = reader.value()
+                    if len(found) == len(wanted):
+                        break
+                else:
+                    reader.skip()
+    except Exception as exc:
+        print(f"Erro lendo {filepath}: {exc}")
+    return found
+
+
+@dataclass
+class CorpusEntry:
+    """Um relatório de data/ como registrado no índice do corpus."""
+    module: str
+    app: str
+    page: str
+    platform: str
+    path: Path
+    size: int
+    mtime_ns: int
+    fetch_time: str
+    final_url: str
+
+
+class CorpusIndex:
+    """
+    Índice persistente de data/ (data/.corpus_index.json): para cada diretório
+    de app, página e mobile/, o mtime visto na última varredura e, nos
+    diretórios de página, tamanho, mtime, fetchTime e finalUrl de cada JSON.
+    Um data/<módulo>/<app>.lharchive entra da mesma forma, com os metadados
+    tirados do índice do próprio arquivo; seus membros têm precedência sobre
+    JSONs soltos de mesmo nome.
+
+    Um diretório só é relido quando o seu mtime muda (arquivos criados,
+    removidos ou renomeados); arquivos que mantêm tamanho e mtime reaproveitam
+    o fetchTime já registrado. Diretórios alterados há menos de RACY_NS não
+    têm o mtime confiado na próxima execução, pois uma mudança no mesmo
+    instante não alteraria o mtime.
+    """
+    VERSION = 1
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, path: Path = INDEX_PATH, root: Path = DATA_ROOT):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.dirs: Dict[str, dict] = {}
+        self.rescanned = 0
+        self.headers_read = 0
+        self._dirty = False
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == self.VERSION:
+                    self.dirs = data["dirs"]
+            except (OSError, ValueError, KeyError):
+                self.dirs = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save()
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Nome temporário por processo: shards paralelos podem salvar o índice ao mesmo tempo.
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "dirs": self.dirs}, ensure_ascii=False),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def _cached(self, directory: Path) -> dict:
+        """
+        Entrada do diretório se o mtime não mudou; {} se ele não existe; com
+        "_previous" (a entrada antiga) se precisa ser relido.
+        """
+        key = str(directory)
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            if self.dirs.pop(key, None) is not None:
+                self._dirty = True
+            return {}
+        entry = self.dirs.get(key)
+        if entry is not None and entry["mtime_ns"] == mtime_ns:
+            return entry
+        self.rescanned += 1
+        self._dirty = True
+        # Mudanças muito recentes podem não ter alterado o mtime ainda: força releitura na próxima vez.
+        trusted = mtime_ns if time.time_ns() - mtime_ns > self.RACY_NS else -1
+        return {"mtime_ns": trusted, "_previous": entry or {}}
+
+    def _subdirs(self, directory: Path) -> List[str]:
+        entry = self._cached(directory)
+        if "_previous" in entry:
+            entry.pop("_previous")
+            entry["subdirs"] = sorted(e.name for e in os.scandir(directory) if e.is_dir())
+            self.dirs[str(directory)] = entry
+        return entry.get("subdirs", [])
+
+    def _files(self, directory: Path) -> Dict[str, list]:
+        entry = self._cached(directory)
+        if "_previous" in entry:
+            previous = entry.pop("_previous").get("files", {})
+            files = {}
+            for item in sorted(os.scandir(directory), key=lambda e: e.name):
+                if item.name.startswith(".") or not item.name.endswith(".json") or not item.is_file():
+                    continue
+                st = item.stat()
+                known = previous.get(item.name)
+                if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+                    files[item.name] = known
+                else:
+                    header = read_report_header(Path(item.path))
+                    self.headers_read += 1
+                    files[item.name] = [st.st_size, st.st_mtime_ns,
+                                        header.get("fetchTime") or "", header.get("finalUrl") or ""]
+            entry["files"] = files
+            self.dirs[str(directory)] = entry
+        return entry.get("files", {})
+
+    def _archive(self, archive: Path) -> Dict[str, dict]:
+        """Membros de um .lharchive: página -> plataforma -> {nome: metadados}."""
+        entry = self._cached(archive)
+        if "_previous" in entry:
+            entry.pop("_previous")
+            pages = {}
+            with ReportArchive(archive) as reader:
+                for name, m in reader.members.items():
+                    page, *rest = name.split("/")
+                    platform = "Mobile" if rest[0] == "mobile" else "Desktop"
+                    pages.setdefault(page, {"Desktop": {}, "Mobile": {}})[platform][rest[-1]] = \
+                        [m.size, m.mtime_ns, m.fetch_time, m.final_url]
+            entry["pages"] = pages
+            self.dirs[str(archive)] = entry
+        return entry.get("pages", {})
+
+    def page_files(self, module: str, app: str):
+        """Mesmo formato de list_page_files, a partir do índice."""
+        base = self.root / module / app
+        archive = archive_path(self.root / module, app)
+        archived = self._archive(archive)
+        pages = {}
+        for page in sorted(set(self._subdirs(base)) | set(archived)):
+            pages[page] = {}
+            for platform, sub in (("Desktop", ()), ("Mobile", ("mobile",))):
+                members = archived.get(page, {}).get(platform, {})
+                paths = {name: archive.joinpath(page, *sub, name) for name in members}
+                raw_dir = base.joinpath(page, *sub)
+                paths.update((name, raw_dir / name) for name in self._files(raw_dir) if name not in members)
+                pages[page][platform] = [paths[name] for name in sorted(paths)]
+        return pages
+
+    def entries(self, modules: Iterable[str] = MODULES, apps: Iterable[str] = APPS) -> List[CorpusEntry]:
+        """Todos os relatórios indexados, com app, módulo, página, plataforma e metadados."""
+        result = []
+        for module in modules:
+            for app in apps:
+                for page, files_by_platform in self.page_files(module, app).items():
+                    for platform, files in files_by_platform.items():
+                        for filepath in files:
+                            size, mtime_ns, fetch_time, final_url = self.stat(filepath)
+                            result.append(CorpusEntry(module, app, page, platform, filepath,
+                                                      size, mtime_ns, fetch_time, final_url))
+        return result
+
+    def stat(self, filepath: Path):
+        """(tamanho, mtime_ns, fetchTime, finalUrl) registrados para um arquivo já indexado."""
+        filepath = Path(filepath)
+        in_archive = split_member_path(filepath)
+        if in_archive:
+            archive, name = in_archive
+            page, *rest = name.split("/")
+            platform = "Mobile" if rest[0] == "mobile" else "Desktop"
+            return tuple(self.dirs[str(archive)]["pages"][page][platform][rest[-1]])
+        return tuple(self.dirs[str(filepath.parent)]["files"][filepath.name])
+
+
+def _metrics_from_report(data: dict) -> Dict[str, float]:
     audits = data.get("audits", {})
 
     def get_val(key: str):
@@ -63,14 +573,7 @@ def get_metrics(filepath: Path):
     }
 
 
-def get_category_scores(filepath: Path):
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as exc:
-        print(f"Erro lendo {filepath}: {exc}")
-        return None
-
+def _scores_from_report(data: dict) -> Dict[str, float]:
     categories = data.get("categories", {})
     return {
         "performance": categories.get("performance", {}).get("score", 0),
@@ -78,3 +581,224 @@ def get_category_scores(filepath: Path):
         "best-practices": categories.get("best-practices", {}).get("score", 0),
         "seo": categories.get("seo", {}).get("score", 0),
     }
+
+
+@dataclass
+class RunRecord:
+    """Tudo o que os scripts usam de um relatório, extraído de uma única leitura."""
+    path: Path
+    metrics: Dict[str, float]
+    scores: Dict[str, float]
+    fetch_time: str = ""
+    lighthouse_version: str = ""
+    final_url: str = ""
+
+
+def extract_run(filepath: Path, streaming: bool = False) -> Optional[RunRecord]:
+    """
+    Lê o JSON uma única vez e devolve métricas, scores e metadados da execução.
+    Com streaming=True o relatório é percorrido em blocos e só os trechos usados
+    são materializados, o que reduz bastante o pico de memória por arquivo.
+    """
+    data = read_report_fields(filepath) if streaming else _read_report(filepath)
+    if data is None:
+        return None
+
+    return RunRecord(
+        path=Path(filepath),
+        metrics=_metrics_from_report(data),
+        scores=_scores_from_report(data),
+        fetch_time=data.get("fetchTime", ""),
+        lighthouse_version=data.get("lighthouseVersion", ""),
+        final_url=data.get("finalUrl") or data.get("finalDisplayedUrl", ""),
+    )
+
+
+def get_metrics(filepath: Path):
+    data = _read_report(filepath)
+    if data is None:
+        return None
+    return _metrics_from_report(data)
+
+
+def get_category_scores(filepath: Path):
+    data = _read_report(filepath)
+    if data is None:
+        return None
+    return _scores_from_report(data)
+
+
+def _file_digest(filepath: Path) -> str:
+    if split_member_path(filepath):
+        reader, name = archive_member(filepath)
+        return reader.members[name].sha1
+    digest = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def report_stat(filepath: Path) -> tuple:
+    """(tamanho, mtime_ns) do relatório; para membros de .lharchive, os do JSON original."""
+    if split_member_path(filepath):
+        reader, name = archive_member(filepath)
+        m = reader.members[name]
+        return m.size, m.mtime_ns
+    st = Path(filepath).stat()
+    return st.st_size, st.st_mtime_ns
+
+
+class ExtractionCache:
+    """
+    Cache em disco (SQLite) dos RunRecord já extraídos.
+
+    Cada relatório é identificado pelo caminho; tamanho e mtime validam a
+    entrada sem reler o arquivo e, se só o mtime mudou, o hash do conteúdo
+    decide se o JSON precisa ser decodificado de novo.
+    """
+    # Incrementar quando a extração ou o RunRecord mudarem, para invalidar o cache.
+    VERSION = 1
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS runs")
+            self.conn.execute(f"PRAGMA user_version = {self.VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha1 TEXT, record TEXT)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def get(self, filepath: Path, stat: Optional[tuple] = None) -> Optional[RunRecord]:
+        """
+        Registro em cache se o arquivo não mudou. `stat` = (tamanho, mtime_ns)
+        já conhecidos (ex.: do índice do corpus) dispensa o stat do arquivo.
+        """
+        key = str(Path(filepath).resolve())
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, sha1, record FROM runs WHERE path = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        size, mtime_ns, sha1, record = row
+        if stat is None:
+            stat = report_stat(filepath)
+        if stat[0] != size:
+            return None
+        if stat[1] != mtime_ns:
+            if _file_digest(filepath) != sha1:
+                return None
+            self.conn.execute("UPDATE runs SET mtime_ns = ? WHERE path = ?", (stat[1], key))
+        return RunRecord(path=Path(filepath), **json.loads(record))
+
+    def put(self, run: RunRecord, stat: Optional[tuple] = None, digest: Optional[str] = None) -> None:
+        """
+        Grava o registro. `digest` (hash do conteúdo) já calculado junto com a
+        extração evita reler o arquivo aqui, no processo principal.
+        """
+        if stat is None:
+            stat = report_stat(run.path)
+        fields = asdict(run)
+        del fields["path"]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+            (str(run.path.resolve()), stat[0], stat[1], digest or _file_digest(run.path), json.dumps(fields)),
+        )
+
+
+def _extract_with_digest(filepath: Path, streaming: bool = False) -> Tuple[Optional[RunRecord], Optional[str]]:
+    """extract_run e o hash do conteúdo para o cache, no mesmo processo (o worker, com jobs > 1)."""
+    run = extract_run(filepath, streaming=streaming)
+    return run, _file_digest(filepath) if run is not None else None
+
+
+def extract_runs(filepaths: Iterable[Path], jobs: int = 1,
+                 cache: Optional[ExtractionCache] = None,
+                 streaming: bool = False,
+                 stage: Optional[Stage] = None,
+                 file_stats: Optional[Dict[Path, tuple]] = None) -> List[Optional[RunRecord]]:
+    """
+    extract_run para vários arquivos, na mesma ordem da entrada.
+
+    Entradas válidas do cache são reaproveitadas; com jobs > 1 o restante é
+    decodificado em um pool de processos, em lotes, e gravado no cache.
+    O hash de conteúdo que valida o cache é calculado no próprio worker.
+    Com `stage`, os arquivos efetivamente lidos entram na instrumentação.
+    `file_stats` (arquivo -> (tamanho, mtime_ns)) evita um stat por arquivo
+    na validação do cache.
+    """
+    filepaths = list(filepaths)
+    file_stats = file_stats or {}
+    runs = [cache.get(f, file_stats.get(f)) if cache else None for f in filepaths]
+    pending = [i for i, run in enumerate(runs) if run is None]
+    if cache:
+        cache.hits += len(filepaths) - len(pending)
+        cache.misses += len(pending)
+
+    worker = partial(_extract_with_digest if cache else extract_run, streaming=streaming)
+    paths = [filepaths[i] for i in pending]
+    if stage:
+        stage.read(paths, sizes=[_stored_size(p) for p in paths])
+    if jobs > 1 and len(paths) > 1:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            extracted = list(executor.map(worker, paths, chunksize=chunksize))
+    else:
+        extracted = [worker(p) for p in paths]
+
+    for i, result in zip(pending, extracted):
+        run, digest = result if cache else (result, None)
+        runs[i] = run
+        if cache and run is not None:
+            cache.put(run, file_stats.get(run.path), digest)
+    return runs
+
+
+def load_runs(jobs: int = 1, modules: Iterable[str] = MODULES, apps: Iterable[str] = APPS,
+              instrumentation: Optional[Instrumentation] = None,
+              shard: Optional[Tuple[int, int]] = None, streaming: bool = False):
+    """
+    Varre data/ (pelo índice do corpus), descarta relatórios duplicados e
+    extrai os demais uma única vez (com cache). Retorna (corpus, runs), com runs mapeando cada arquivo ao
+    seu RunRecord. Com `instrumentation`, a varredura e a extração viram etapas medidas.
+    Com `shard` = (i, n), só a i-ésima de n fatias contíguas dos arquivos é
+    extraída; o corpus devolvido continua completo. `streaming` é repassado a
+    extract_run: menos memória por relatório, leitura mais lenta.
+    """
+    instrumentation = instrumentation or Instrumentation()
+    with instrumentation.stage("varredura de data/") as stage, CorpusIndex() as index:
+        corpus, duplicates = drop_duplicates(scan_corpus(modules, apps, index), index)
+        files = corpus_files(corpus)
+        if shard:
+            files = shard_slice(files, *shard)
+        file_stats = {f: index.stat(f)[:2] for f in files}
+        stage.records = len(files)
+        if index.rescanned:
+            print(f"Índice do corpus: {index.rescanned} diretórios relidos, "
+                  f"{index.headers_read} cabeçalhos de relatório lidos")
+        if duplicates:
+            print(f"Duplicatas ignoradas: {len(duplicates)} relatórios")
+            for duplicate, original in duplicates:
+                print(f"  {duplicate} (igual a {original.name})")
+    with instrumentation.stage("extração dos JSONs") as stage, ExtractionCache() as cache:
+        runs = dict(zip(files, extract_runs(files, jobs=jobs, cache=cache, streaming=streaming,
+                                            stage=stage, file_stats=file_stats)))
+        stage.records = sum(run is not None for run in runs.values())
+        print(f"Cache: {cache.hits} relatórios reaproveitados, {cache.misses} lidos do JSON")
+    return corpus, runs
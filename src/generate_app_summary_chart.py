@@ -3,6 +3,8 @@ Gráfico comparativo por aplicativo, agregando pontuações médias de todas as
 (Lighthouse e PageSpeed) para Performance, Acessibilidade, Boas Práticas e SEO em
 Desktop e Mobile.
 """
+from typing import Optional
+
 from .charts_common import (
     APPS,
     APP_LABELS,
@@ -11,20 +13,20 @@ from .charts_common import (
     COLORS,
     FIGS_ROOT,
     PLATFORMS,
-    read_scores,
+    ResultsStore,
     group_mean_stdev,
     plot_grouped_series,
 )
 
 
-def gerar_resumo_app(app: str) -> None:
-    records = read_scores(app_filter=[app])
+def gerar_resumo_app(store: ResultsStore, app: str) -> None:
+    records = store.scores(app=app)
     if not records:
         print(f"Diretório não encontrado ou sem dados para {app}")
         return
 
     stats = group_mean_stdev(records, key_fields=["category", "platform"])
-    modules_found = sorted({r["module"] for r in records})
+    modules_found = records.unique("module")
 
     x_labels = [CAT_LABELS.get(c, c) for c in CATEGORIES]
     series = []
@@ -54,9 +56,11 @@ def gerar_resumo_app(app: str) -> None:
     )
 
 
-def main():
+def main(store: Optional[ResultsStore] = None):
+    if store is None:
+        store = ResultsStore.load()
     for app in APPS:
-        gerar_resumo_app(app)
+        gerar_resumo_app(store, app)
 
 
 if __name__ == "__main__":
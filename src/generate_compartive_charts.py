@@ -1,32 +1,41 @@
 """
 Gera gráficos por página, aplicativo e módulo a partir dos CSVs em results/<app>/<module>,
 com barras agrupadas e lógica compartilhada via charts_common.
+
+Os registros são agrupados e as médias/DP calculadas uma vez por nível de
+agrupamento em main(); cada função de plotagem recebe apenas a sua fatia.
+Com `intervals`, os comparativos entre apps mostram a média por execução com
+o IC de bootstrap de results/<modulo>_*_ci.csv (generate_statistics.py) no
+lugar da média das páginas com o DP.
 """
-from typing import Dict, List
+from typing import Dict, Optional
 from .charts_common import (
     APPS,
     APP_LABELS,
+    CI_TITLE,
     COLORS,
     FIGS_ROOT,
     MODULE_LABELS,
     PLATFORMS,
-    read_performance,
-    read_scores,
-    group_mean_stdev,
+    RecordTable,
+    ResultsStore,
+    group_by,
+    grouped_stats,
+    interval_bars,
     plot_grouped_series,
+    read_intervals,
 )
 
 FIG_DIR = FIGS_ROOT
 
 
-def plot_metric_means(records: List[Dict], app: str, module: str, metric: str) -> None:
-    data = [r for r in records if r["app"] == app and r["module"] == module and r["metric"] == metric]
+def plot_metric_means(data: RecordTable, stats: Dict[tuple, dict], app: str, module: str, metric: str) -> None:
+    """`data`: registros de app/módulo/métrica; `stats`: (page, platform) -> média/DP."""
     if not data:
         return
 
-    stats = group_mean_stdev(data, key_fields=["page", "platform"])
-    pages = sorted({r["page"] for r in data})
-    unit = data[0].get("unit", "") if data else ""
+    pages = data.unique("page")
+    unit = data.unit()
 
     series = []
     for idx, platform in enumerate(PLATFORMS):
@@ -52,14 +61,13 @@ def plot_metric_means(records: List[Dict], app: str, module: str, metric: str) -
     )
 
 
-def plot_category_means(records: List[Dict], app: str, module: str, category: str) -> None:
-    data = [r for r in records if r["app"] == app and r["module"] == module and r["category"] == category]
+def plot_category_means(data: RecordTable, stats: Dict[tuple, dict], app: str, module: str, category: str) -> None:
+    """`data`: registros de app/módulo/categoria; `stats`: (page, platform) -> média/DP."""
     if not data:
         return
 
-    stats = group_mean_stdev(data, key_fields=["page", "platform"])
-    pages = sorted({r["page"] for r in data})
-    unit = data[0].get("unit", "") if data else ""
+    pages = data.unique("page")
+    unit = data.unit()
 
     series = []
     for platform in PLATFORMS:
@@ -86,19 +94,26 @@ def plot_category_means(records: List[Dict], app: str, module: str, category: st
     )
 
 
-def plot_metric_across_apps(records: List[Dict], module: str, metric: str) -> None:
-    data = [r for r in records if r["module"] == module and r["metric"] == metric]
+def plot_metric_across_apps(data: RecordTable, stats: Dict[tuple, dict], module: str, metric: str,
+                            intervals: Optional[Dict[tuple, tuple]] = None) -> None:
+    """
+    `data`: registros de módulo/métrica; `stats`: (app, platform) -> média/DP;
+    `intervals`: IC de read_intervals (substituem média e DP nas barras).
+    """
     if not data:
         return
 
-    stats = group_mean_stdev(data, key_fields=["app", "platform"])
-    unit = data[0].get("unit", "") if data else ""
-    apps = [a for a in APPS if any(r["app"] == a for r in data)]
+    unit = data.unit()
+    present = set(data.unique("app"))
+    apps = [a for a in APPS if a in present]
 
     series = []
     for platform in PLATFORMS:
-        values = [stats.get((app, platform), {}).get("mean", 0) for app in apps]
-        yerr = [stats.get((app, platform), {}).get("stdev", 0) for app in apps]
+        if intervals:
+            values, yerr = interval_bars(intervals, [(app, platform, metric, "mean") for app in apps])
+        else:
+            values = [stats.get((app, platform), {}).get("mean", 0) for app in apps]
+            yerr = [stats.get((app, platform), {}).get("stdev", 0) for app in apps]
         series.append({
             "label": platform,
             "values": values,
@@ -113,26 +128,33 @@ def plot_metric_across_apps(records: List[Dict], module: str, metric: str) -> No
     plot_grouped_series(
         x_labels=x_labels,
         series=series,
-        title=f"{metric} médio por aplicativo – {module_display}",
+        title=f"{metric} médio por aplicativo – {module_display}" + (CI_TITLE if intervals else ""),
         ylabel=ylabel,
         out_path=out_path,
         rotation=10,
     )
 
 
-def plot_category_across_apps(records: List[Dict], module: str, category: str) -> None:
-    data = [r for r in records if r["module"] == module and r["category"] == category]
+def plot_category_across_apps(data: RecordTable, stats: Dict[tuple, dict], module: str, category: str,
+                              intervals: Optional[Dict[tuple, tuple]] = None) -> None:
+    """
+    `data`: registros de módulo/categoria; `stats`: (app, platform) -> média/DP;
+    `intervals`: IC de read_intervals (substituem média e DP nas barras).
+    """
     if not data:
         return
 
-    stats = group_mean_stdev(data, key_fields=["app", "platform"])
-    unit = data[0].get("unit", "") if data else ""
-    apps = [a for a in APPS if any(r["app"] == a for r in data)]
+    unit = data.unit()
+    present = set(data.unique("app"))
+    apps = [a for a in APPS if a in present]
 
     series = []
     for platform in PLATFORMS:
-        values = [stats.get((app, platform), {}).get("mean", 0) for app in apps]
-        yerr = [stats.get((app, platform), {}).get("stdev", 0) for app in apps]
+        if intervals:
+            values, yerr = interval_bars(intervals, [(app, platform, category, "mean") for app in apps])
+        else:
+            values = [stats.get((app, platform), {}).get("mean", 0) for app in apps]
+            yerr = [stats.get((app, platform), {}).get("stdev", 0) for app in apps]
         series.append({
             "label": platform,
             "values": values,
@@ -143,11 +165,12 @@ def plot_category_across_apps(records: List[Dict], module: str, category: str) -
     ylabel = category if not unit else f"{category} ({unit})"
     module_display = MODULE_LABELS.get(module, module)
     x_labels = [APP_LABELS.get(a, a) for a in apps]
+    title = f"Pontuações médias de {category} por aplicativo – {module_display}"
     out_path = FIG_DIR / "comparativos" / module / f"{category}_scores_apps.png"
     plot_grouped_series(
         x_labels=x_labels,
         series=series,
-        title=f"Pontuações médias de {category} por aplicativo – {module_display}",
+        title=title + (CI_TITLE if intervals else ""),
         ylabel=ylabel,
         out_path=out_path,
         rotation=10,
@@ -155,32 +178,54 @@ def plot_category_across_apps(records: List[Dict], module: str, category: str) -
     )
 
 
-def main():
-    perf_records = read_performance()
-    score_records = read_scores()
+def main(store: Optional[ResultsStore] = None, intervals: bool = False):
+    if store is None:
+        store = ResultsStore.load()
+    perf_records = store.performance()
+    score_records = store.scores()
 
     if not perf_records and not score_records:
         print("Nenhum dado encontrado em results/. Nada a plotar.")
         return
 
-    apps = sorted({r["app"] for r in perf_records} | {r["app"] for r in score_records})
-    modules = sorted({r["module"] for r in perf_records} | {r["module"] for r in score_records})
+    apps = sorted(set(perf_records.unique("app")) | set(score_records.unique("app")))
+    modules = sorted(set(perf_records.unique("module")) | set(score_records.unique("module")))
 
     metrics_to_plot = ["LCP", "FCP", "TTFB", "TBT", "CLS", "Total Transfer Size"]
     categories_to_plot = ["performance", "accessibility", "best-practices", "seo"]
 
+    # Índices e estatísticas calculados uma vez; cada gráfico só faz lookups.
+    perf_by_page = group_by(perf_records, ["app", "module", "metric"])
+    perf_page_stats = grouped_stats(perf_records, ["app", "module", "metric"], ["page", "platform"])
+    score_by_page = group_by(score_records, ["app", "module", "category"])
+    score_page_stats = grouped_stats(score_records, ["app", "module", "category"], ["page", "platform"])
+    perf_by_app = group_by(perf_records, ["module", "metric"])
+    perf_app_stats = grouped_stats(perf_records, ["module", "metric"], ["app", "platform"])
+    score_by_app = group_by(score_records, ["module", "category"])
+    score_app_stats = grouped_stats(score_records, ["module", "category"], ["app", "platform"])
+
     for app in apps:
         for module in modules:
             for metric in metrics_to_plot:
-                plot_metric_means(perf_records, app, module, metric)
+                key = (app, module, metric)
+                plot_metric_means(perf_by_page.get(key, []), perf_page_stats.get(key, {}), app, module, metric)
             for category in categories_to_plot:
-                plot_category_means(score_records, app, module, category)
+                key = (app, module, category)
+                plot_category_means(score_by_page.get(key, []), score_page_stats.get(key, {}), app, module, category)
 
     for module in modules:
+        metric_intervals = read_intervals(module, "metrics") if intervals else None
+        score_intervals = read_intervals(module, "scores") if intervals else None
+        if intervals and not (metric_intervals and score_intervals):
+            print(f"IC de {module} não encontrados em results/ (rode generate_statistics.py); usando média e DP.")
         for metric in metrics_to_plot:
-            plot_metric_across_apps(perf_records, module, metric)
+            key = (module, metric)
+            plot_metric_across_apps(perf_by_app.get(key, []), perf_app_stats.get(key, {}), module, metric,
+                                    metric_intervals)
         for category in categories_to_plot:
-            plot_category_across_apps(score_records, module, category)
+            key = (module, category)
+            plot_category_across_apps(score_by_app.get(key, []), score_app_stats.get(key, {}), module, category,
+                                      score_intervals)
 
     print("Concluido.")
 
@@ -2,6 +2,8 @@
 Gráficos de resumo por app e módulo (Lighthouse/PageSpeed), agregando categorias
 de score (performance, accessibility, best-practices, seo) em Desktop e Mobile.
 """
+from typing import Optional
+
 from .charts_common import (
     APPS,
     CAT_LABELS,
@@ -12,14 +14,14 @@ from .charts_common import (
     MODULE_LABELS,
     PLATFORMS,
     APP_LABELS,
-    read_scores,
+    ResultsStore,
     group_mean_stdev,
     plot_grouped_series,
 )
 
 
-def gerar_resumo_app_modulo(app: str, module: str) -> None:
-    records = read_scores(app_filter=[app], module_filter=[module])
+def gerar_resumo_app_modulo(store: ResultsStore, app: str, module: str) -> None:
+    records = store.scores(app=app, module=module)
     if not records:
         print(f"Aviso: nenhum dado para {app}/{module}")
         return
@@ -50,10 +52,12 @@ def gerar_resumo_app_modulo(app: str, module: str) -> None:
     )
 
 
-def main():
+def main(store: Optional[ResultsStore] = None):
+    if store is None:
+        store = ResultsStore.load()
     for app in APPS:
         for module in MODULES:
-            gerar_resumo_app_modulo(app, module)
+            gerar_resumo_app_modulo(store, app, module)
 
 
 if __name__ == "__main__":
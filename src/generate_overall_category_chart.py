@@ -3,6 +3,8 @@ Comparação das categorias (performance, accessibility, best-practices, seo) en
 separando Desktop e Mobile. Gera um gráfico de barras por plataforma.
 """
 from collections import defaultdict
+from typing import Optional
+
 from .charts_common import (
     APPS,
     APP_LABELS,
@@ -11,20 +13,22 @@ from .charts_common import (
     COLORS,
     FIGS_ROOT,
     PLATFORMS,
-    read_scores,
+    ResultsStore,
     group_mean_stdev,
     plot_grouped_series,
 )
 
 
-def main():
-    records = read_scores()
+def main(store: Optional[ResultsStore] = None):
+    if store is None:
+        store = ResultsStore.load()
+    records = store.scores()
     if not records:
         print("Nenhum dado encontrado. Nada a plotar.")
         return
 
     stats = group_mean_stdev(records, key_fields=["platform", "category", "app"])
-    auditorias = sorted({r["module"] for r in records})
+    auditorias = records.unique("module")
     audits_str = ", ".join(auditorias)
 
     x_labels = [CAT_LABELS.get(c, c) for c in CATEGORIES]
@@ -1,33 +1,73 @@
 """
 Gráfico agregando a média de Performance de todos os apps (ufc-hub, sigaa, ufc-noticias)
 e plataformas (Desktop/Mobile) somando Lighthouse e PageSpeed.
+
+Com `intervals`, as barras são a média por execução (results/runs.npy) com o IC
+de bootstrap como barra de erro, no lugar da média das páginas com o DP.
 """
+from typing import Dict, Optional
+
 from .charts_common import (
     APPS,
     APP_LABELS,
+    CI_TITLE,
     COLORS,
     FIGS_ROOT,
     PLATFORMS,
-    read_scores,
+    ResultsStore,
     group_mean_stdev,
+    interval_bars,
     plot_grouped_series,
 )
+from .resampling import bootstrap_ci
+from .run_table import RUNS_PATH, SCORE_COLUMNS, SCORE_CSV_FORMAT, RunTable
+
+
+def performance_intervals() -> Dict[tuple, tuple]:
+    """
+    IC de bootstrap da média do score de performance (em %) por app e
+    plataforma, com Lighthouse e PageSpeed juntos, nas chaves de
+    charts_common.read_intervals. Vazio sem results/runs.npy.
+    """
+    table = RunTable.load(RUNS_PATH)
+    if table is None:
+        return {}
+    scores = table.runs[SCORE_COLUMNS["performance"]] * SCORE_CSV_FORMAT[0]
+    apps, platforms = table.categories["app"], table.categories["platform"]
+    intervals = {}
+    for app in APPS:
+        for platform in PLATFORMS:
+            if app not in apps or platform not in platforms:
+                continue
+            selected = (table.runs["app"] == apps.index(app)) & (table.runs["platform"] == platforms.index(platform))
+            if selected.any():
+                estimate, low, high = bootstrap_ci(scores[selected])["mean"]
+                intervals[(app, platform, "performance", "mean")] = (estimate[0], low[0], high[0])
+    return intervals
 
 
-def main():
-    records = read_scores(category_filter=["performance"])
+def main(store: Optional[ResultsStore] = None, intervals: bool = False):
+    if store is None:
+        store = ResultsStore.load()
+    records = store.scores(category="performance")
     if not records:
         print("Nenhum dado encontrado. Nada a plotar.")
         return
 
     stats = group_mean_stdev(records, key_fields=["app", "platform"])
-    audits_str = ", ".join(sorted({r["module"] for r in records}))
+    audits_str = ", ".join(records.unique("module"))
+    ci = performance_intervals() if intervals else None
+    if intervals and not ci:
+        print("results/runs.npy não encontrado; usando média e DP.")
 
     x_labels = [APP_LABELS.get(app, app) for app in APPS]
     series = []
     for plat in PLATFORMS:
-        values = [stats.get((app, plat), {}).get("mean", 0) for app in APPS]
-        yerr = [stats.get((app, plat), {}).get("stdev", 0) for app in APPS]
+        if ci:
+            values, yerr = interval_bars(ci, [(app, plat, "performance", "mean") for app in APPS])
+        else:
+            values = [stats.get((app, plat), {}).get("mean", 0) for app in APPS]
+            yerr = [stats.get((app, plat), {}).get("stdev", 0) for app in APPS]
         series.append({
             "label": plat,
             "values": values,
@@ -38,6 +78,8 @@ def main():
     title = "Performance Média por Site"
     if audits_str:
         title += f" ({audits_str})"
+    if ci:
+        title += CI_TITLE
 
     out_path = FIGS_ROOT / "resumo_performance_todos_apps.png"
     plot_grouped_series(
@@ -0,0 +1,128 @@
+"""
+Instrumentação por etapa dos scripts (ingestão e gráficos).
+
+Cada etapa, aberta com `Instrumentation.stage(nome)`, registra tempo de parede,
+tempo de CPU (do processo e dos processos filhos já encerrados, ex.: pools de
+--jobs), arquivos e bytes lidos, registros produzidos, figuras gravadas e o
+pico de memória residente (RSS) até o fim da etapa. Os contadores de arquivos,
+bytes, registros e figuras são preenchidos por quem executa a etapa.
+
+Com `profile_dir`, cada etapa também roda sob cProfile e o resultado é gravado
+em <profile_dir>/<ordem>_<etapa>.prof (abra com `python -m pstats` ou snakeviz). O
+cProfile só enxerga o processo principal, não os workers.
+"""
+import json
+import re
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+
+@dataclass
+class Stage:
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    files_read: int = 0
+    bytes_read: int = 0
+    records: int = 0
+    figures: int = 0
+    peak_rss_mb: float = 0.0
+
+    def read(self, paths: Iterable[Path], sizes: Optional[Iterable[int]] = None) -> None:
+        """Contabiliza arquivos lidos nesta etapa; `sizes` substitui o stat de cada um."""
+        paths = list(paths)
+        self.files_read += len(paths)
+        self.bytes_read += sum(sizes) if sizes is not None else sum(path.stat().st_size for path in paths)
+
+
+def _cpu_seconds() -> float:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Instrumentation:
+    """Coleta as etapas de uma execução e gera o resumo (tabela ou JSON)."""
+
+    def __init__(self, profile_dir: Optional[Path] = None):
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.stages: List[Stage] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        stage = Stage(name)
+        profiler = None
+        if self.profile_dir:
+            import cProfile
+
+            profiler = cProfile.Profile()
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        if profiler:
+            profiler.enable()
+        try:
+            yield stage
+        finally:
+            if profiler:
+                profiler.disable()
+            stage.wall_s = time.perf_counter() - wall
+            stage.cpu_s = _cpu_seconds() - cpu
+            stage.peak_rss_mb = _peak_rss_mb()
+            self.stages.append(stage)
+            if profiler:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                slug = re.sub(r"[^\w.-]+", "_", name).strip("_")
+                profiler.dump_stats(str(self.profile_dir / f"{len(self.stages):02d}_{slug}.prof"))
+
+    def summary(self) -> dict:
+        return {
+            "stages": [asdict(stage) for stage in self.stages],
+            "total_wall_s": sum(stage.wall_s for stage in self.stages),
+            "total_cpu_s": sum(stage.cpu_s for stage in self.stages),
+            "peak_rss_mb": max((stage.peak_rss_mb for stage in self.stages), default=0.0),
+        }
+
+    def write_json(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.summary(), indent=2, ensure_ascii=False) + "\n",
+                              encoding="utf-8")
+
+    def print_table(self) -> None:
+        header = f"{'Etapa':44s} {'Parede(s)':>9s} {'CPU(s)':>8s} {'Arquivos':>8s} " \
+                 f"{'MB lidos':>9s} {'Registros':>9s} {'Figuras':>7s} {'RSS(MB)':>8s}"
+        print(header)
+        print("-" * len(header))
+        for s in self.stages:
+            print(f"{s.name[:44]:44s} {s.wall_s:9.3f} {s.cpu_s:8.3f} {s.files_read:8d} "
+                  f"{s.bytes_read / 1e6:9.1f} {s.records:9d} {s.figures:7d} {s.peak_rss_mb:8.1f}")
+        summary = self.summary()
+        print(f"{'Total':44s} {summary['total_wall_s']:9.3f} {summary['total_cpu_s']:8.3f}")
+
+
+def add_arguments(parser) -> None:
+    """Opções --profile/--report comuns aos scripts instrumentados."""
+    parser.add_argument("--profile", type=Path, metavar="DIR",
+                        help="grava um perfil cProfile por etapa em DIR")
+    parser.add_argument("--report", type=Path, metavar="JSON",
+                        help="grava o resumo das etapas em JSON")
+
+
+def from_args(args) -> Instrumentation:
+    return Instrumentation(profile_dir=args.profile)
+
+
+def finish(instrumentation: Instrumentation, args) -> None:
+    """Imprime a tabela de etapas e, com --report, grava o JSON."""
+    print()
+    instrumentation.print_table()
+    if args.report:
+        instrumentation.write_json(args.report)
+        print(f"Resumo das etapas gravado em {args.report}")
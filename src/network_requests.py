@@ -0,0 +1,228 @@
+"""
+Tabela colunar das requisições de rede (audit network-requests) de todas as
+execuções.
+
+Cada linha é uma requisição: códigos de módulo/app/página/plataforma, o índice
+da execução em results/runs.npy, URL, domínio, entidade (terceiro), tipo de
+recurso, MIME, protocolo e prioridade como códigos inteiros de strings
+internadas, além de status, tamanhos (transferSize/resourceSize, em bytes) e
+tempos (rendererStartTime/networkRequestTime/networkEndTime, em ms). O array
+estruturado fica em results/network_requests.npy e as strings internadas em
+results/network_requests.json, como na tabela de execuções.
+
+Os JSONs são lidos uma única vez, em fluxo (só network-requests e entities são
+materializados); os agrupamentos de `NetworkRequests.rollup` são bincounts
+sobre as colunas de códigos, sem reler relatórios.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from src.config import PLATFORMS, RESULTS_ROOT
+from src.data_loader import read_report_fields
+
+REQUESTS_PATH = RESULTS_ROOT / "network_requests.npy"
+FORMAT_VERSION = 1
+
+REQUESTS_SPEC = {
+    "audits": {"network-requests": {"details": {"items": [True]}}},
+    "entities": [{"name": True, "isFirstParty": True}],
+}
+
+# Campos categóricos: coluna da tabela -> chave do item (None = derivado da URL/entidades).
+STRING_FIELDS = {
+    "url": "url",
+    "domain": None,
+    "entity": "entity",
+    "resource_type": "resourceType",
+    "mime_type": "mimeType",
+    "protocol": "protocol",
+    "priority": "priority",
+}
+# Campos numéricos: coluna -> chave do item (NaN quando ausente).
+NUMERIC_FIELDS = {
+    "transfer_size": "transferSize",
+    "resource_size": "resourceSize",
+    "renderer_start_time": "rendererStartTime",
+    "network_request_time": "networkRequestTime",
+    "network_end_time": "networkEndTime",
+}
+LABEL_FIELDS = ["module", "app", "page", "platform"]
+
+REQUEST_DTYPE = np.dtype(
+    [("run", "u4"), ("module", "u1"), ("app", "u2"), ("page", "u4"), ("platform", "u1")]
+    + [(column, "u4") for column in STRING_FIELDS]
+    + [("status_code", "i2"), ("finished", "?"), ("main_frame", "?"), ("first_party", "?")]
+    + [(column, "f8") for column in NUMERIC_FIELDS]
+)
+
+
+def extract_requests(filepath: Path) -> Optional[List[dict]]:
+    """Itens de network-requests de um relatório, com `first_party` vindo de entities."""
+    data = read_report_fields(filepath, REQUESTS_SPEC)
+    if data is None:
+        return None
+    items = data.get("audits", {}).get("network-requests", {}).get("details", {}).get("items", [])
+    first_party = {entity.get("name"): bool(entity.get("isFirstParty")) for entity in data.get("entities") or []}
+    for item in items:
+        item["first_party"] = first_party.get(item.get("entity"), False)
+    return items
+
+
+def _domain(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def build_requests_table(corpus, runs, jobs: int = 1):
+    """
+    Lê as requisições de cada execução extraída (mesma ordem e mesmo índice de
+    linha de results/runs.npy) e monta (tabela, categorias).
+    """
+    labelled = []
+    for (module, app), page_files in corpus.items():
+        for page, files_by_platform in page_files.items():
+            for platform in PLATFORMS:
+                for filepath in files_by_platform[platform]:
+                    if runs.get(filepath) is not None:
+                        labelled.append(((module, app, page, platform), filepath))
+
+    paths = [filepath for _, filepath in labelled]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            extracted = list(executor.map(extract_requests, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        extracted = [extract_requests(path) for path in paths]
+
+    categories: Dict[str, List[str]] = {field: [] for field in LABEL_FIELDS + list(STRING_FIELDS)}
+    categories["platform"] = list(PLATFORMS)
+    lookup = {field: {name: code for code, name in enumerate(names)} for field, names in categories.items()}
+
+    def code(field: str, value) -> int:
+        value = "" if value is None else str(value)
+        known = lookup[field].get(value)
+        if known is None:
+            known = lookup[field][value] = len(categories[field])
+            categories[field].append(value)
+        return known
+
+    n_rows = sum(len(items or []) for items in extracted)
+    table = np.zeros(n_rows, dtype=REQUEST_DTYPE)
+    columns = {name: np.empty(n_rows, dtype=REQUEST_DTYPE[name]) for name in REQUEST_DTYPE.names}
+    row = 0
+    for run_index, ((labels, _), items) in enumerate(zip(labelled, extracted)):
+        if not items:
+            continue
+        label_codes = [code(field, value) for field, value in zip(LABEL_FIELDS, labels)]
+        for item in items:
+            columns["run"][row] = run_index
+            for field, value in zip(LABEL_FIELDS, label_codes):
+                columns[field][row] = value
+            url = item.get("url", "")
+            for column, key in STRING_FIELDS.items():
+                columns[column][row] = code(column, item.get(key) if key else _domain(url))
+            columns["status_code"][row] = item.get("statusCode") or 0
+            columns["finished"][row] = bool(item.get("finished"))
+            columns["main_frame"][row] = bool(item.get("experimentalFromMainFrame"))
+            columns["first_party"][row] = item["first_party"]
+            for column, key in NUMERIC_FIELDS.items():
+                value = item.get(key)
+                columns[column][row] = np.nan if value is None else value
+            row += 1
+    for name, values in columns.items():
+        table[name] = values
+    return table, categories
+
+
+def write_requests_table(corpus, runs, path: Path = REQUESTS_PATH, jobs: int = 1) -> int:
+    """Grava network_requests.npy e .json (substituição atômica). Retorna o número de requisições."""
+    table, categories = build_requests_table(corpus, runs, jobs=jobs)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+    meta_path = path.with_suffix(".json")
+    tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+    meta = {
+        "version": FORMAT_VERSION,
+        "categories": categories,
+        "units": {**{column: "bytes" for column in NUMERIC_FIELDS if column.endswith("_size")},
+                  **{column: "ms" for column in NUMERIC_FIELDS if column.endswith("_time")}},
+    }
+    tmp_meta.write_text(json.dumps(meta, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_meta, meta_path)
+    return len(table)
+
+
+class NetworkRequests:
+    """Tabela de requisições aberta em memória mapeada, com filtros e agrupamentos vetorizados."""
+
+    def __init__(self, rows: np.ndarray, categories: Dict[str, List[str]]):
+        self.rows = rows
+        self.categories = categories
+        self._lookup = {field: {name: code for code, name in enumerate(names)}
+                        for field, names in categories.items()}
+
+    @classmethod
+    def load(cls, path: Path = REQUESTS_PATH, mmap: bool = True) -> Optional["NetworkRequests"]:
+        """Abre a tabela; None se ela não existir ou for de outra versão do formato."""
+        path = Path(path)
+        meta_path = path.with_suffix(".json")
+        if not path.exists() or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != FORMAT_VERSION:
+            return None
+        return cls(np.load(path, mmap_mode="r" if mmap else None), meta["categories"])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def select(self, **filters: Optional[str]) -> "NetworkRequests":
+        """Subconjunto cujos campos categóricos batem com os filtros (None = qualquer valor)."""
+        selected = np.ones(len(self.rows), dtype=bool)
+        for field, value in filters.items():
+            if value is None:
+                continue
+            code = self._lookup[field].get(value)
+            if code is None:
+                selected[:] = False
+                break
+            selected &= self.rows[field] == code
+        return NetworkRequests(self.rows[selected], self.categories)
+
+    def rollup(self, by: Sequence[str], values: Iterable[str] = ("transfer_size", "resource_size")) -> Dict[tuple, dict]:
+        """
+        Agrupa por campos categóricos (ex.: ["app", "platform", "resource_type"])
+        e devolve, por chave: requisições, execuções distintas, soma de cada
+        coluna de `values` (NaN conta como 0) e essa soma por execução.
+        """
+        if not len(self.rows):
+            return {}
+        sizes = [max(len(self.categories[field]), 1) for field in by]
+        combined = np.ravel_multi_index([self.rows[field].astype(np.intp) for field in by], sizes)
+        unique, codes = np.unique(combined, return_inverse=True)
+        codes = codes.ravel()
+        n_groups = len(unique)
+
+        requests = np.bincount(codes, minlength=n_groups)
+        # Execuções distintas por grupo: pares (grupo, execução) únicos.
+        pairs = np.unique(codes.astype(np.int64) * (int(self.rows["run"].max()) + 1) + self.rows["run"])
+        n_runs = np.bincount(pairs // (int(self.rows["run"].max()) + 1), minlength=n_groups)
+        sums = {name: np.bincount(codes, weights=np.nan_to_num(self.rows[name]), minlength=n_groups)
+                for name in values}
+
+        keys = list(zip(*[[self.categories[field][c] for c in group.tolist()]
+                          for field, group in zip(by, np.unravel_index(unique, sizes))]))
+        return {
+            key: {"requests": int(requests[g]), "runs": int(n_runs[g]),
+                  **{name: float(sums[name][g]) for name in values},
+                  **{f"{name}_per_run": float(sums[name][g] / n_runs[g]) for name in values}}
+            for g, key in enumerate(keys)
+        }
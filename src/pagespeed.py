@@ -0,0 +1,361 @@
+"""
+Coleta assíncrona de relatórios da API do PageSpeed Insights.
+
+Só biblioteca padrão: um cliente HTTP/1.1 mínimo sobre asyncio com pool
+limitado de conexões keep-alive por host, um token bucket para respeitar a
+cota da API, novas tentativas com backoff exponencial (e Retry-After) e um
+checkpoint em JSON lines, para que um lote interrompido continue de onde parou.
+
+Cada resposta tem o `lighthouseResult` gravado no layout que o data_loader lê:
+data/PageSpeed/<app>/<página>/[mobile/]<url>-<estratégia>-<fetchTime>.json, com
+o mesmo esquema de nomes dos relatórios baixados do PageSpeed.
+"""
+import asyncio
+import gzip
+import json
+import os
+import random
+import re
+import ssl
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from src.config import CATEGORIES
+
+PSI_ENDPOINT = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+STRATEGIES = ["desktop", "mobile"]
+# Falhas temporárias: cota estourada, erros do servidor (o Lighthouse do PSI falha às vezes).
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def report_filename(url: str, strategy: str, fetch_time: str) -> str:
+    """
+    Nome no esquema dos relatórios baixados do PageSpeed, ex.:
+    https://si3.ufc.br/sigaa/verTelaLogin.do, mobile, 2026-01-07T00:07:15.302Z ->
+    https-si3-ufc-brsigaaverTelaLogin-do-mobile-2026-01-07T00-07-15-302Z.json
+    """
+    slug = re.sub(r"[^\w-]", "-", url.replace("://", "-").replace("/", ""))
+    return f"{slug}-{strategy}-{re.sub(r'[:.]', '-', fetch_time)}.json"
+
+
+def report_dir(root: Path, app: str, page: str, strategy: str) -> Path:
+    page_dir = Path(root) / "PageSpeed" / app / page
+    return page_dir / "mobile" if strategy == "mobile" else page_dir
+
+
+@dataclass
+class Target:
+    app: str
+    page: str
+    url: str
+
+
+@dataclass
+class Job:
+    target: Target
+    strategy: str
+    run: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.target.app}/{self.target.page}/{self.strategy}/{self.run}"
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, body: bytes = b"", retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Segundos de espera de um cabeçalho Retry-After, em segundos ("120") ou
+    como data HTTP ("Wed, 21 Oct 2015 07:28:00 GMT"); nunca negativo. None se
+    ausente ou inválido.
+    """
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        delay = (when - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, delay)
+
+
+class TokenBucket:
+    """Até `rate` requisições por segundo, com rajadas de até `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _Connection:
+    """Uma conexão HTTP/1.1 keep-alive."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def request(self, host: str, target: str) -> Tuple[int, Dict[str, str], bytes]:
+        self.writer.write(
+            f"GET {target} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+            f"Accept-Encoding: gzip, deflate\r\nConnection: keep-alive\r\n\r\n".encode("ascii")
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("conexão encerrada pelo servidor")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = (await self.reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b"".join(parts)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            self.reusable = False
+
+        if headers.get("connection", "").lower() == "close":
+            self.reusable = False
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+        return status, headers, body
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Até `size` conexões simultâneas com um host; conexões ociosas são reaproveitadas."""
+
+    def __init__(self, endpoint: str, size: int):
+        parts = urlsplit(endpoint)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.host_header = parts.netloc
+        self.path = parts.path
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[_Connection] = []
+        self.opened = 0
+
+    async def get(self, query: str) -> Tuple[int, Dict[str, str], bytes]:
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+                conn = _Connection(reader, writer)
+                self.opened += 1
+            try:
+                response = await conn.request(self.host_header, f"{self.path}?{query}")
+            except BaseException:
+                conn.close()
+                raise
+            if conn.reusable:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return response
+
+    def close(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+class Checkpoint:
+    """Registro (JSON lines) dos jobs concluídos de um lote; sobrevive a interrupções."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.done: Dict[str, str] = {}
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # última linha truncada por uma interrupção
+                if entry.get("status") == "ok":
+                    self.done[entry["job"]] = entry["file"]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+
+    def record(self, job: Job, status: str, **fields) -> None:
+        self._f.write(json.dumps({"job": job.key, "status": status, **fields}, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        if status == "ok":
+            self.done[job.key] = fields["file"]
+
+    def close(self) -> None:
+        self._f.close()
+
+
+@dataclass
+class CollectorStats:
+    ok: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retries: int = 0
+    connections: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self.started
+        return (f"{self.ok} coletados, {self.failed} falhas, {self.skipped} já no checkpoint, "
+                f"{self.retries} novas tentativas, {self.connections} conexões em {elapsed:.1f} s "
+                f"({self.ok / elapsed if elapsed else 0:.2f} relatórios/s)")
+
+
+class Collector:
+    """
+    Executa os jobs com até `concurrency` requisições em andamento, no máximo
+    `rate` requisições por segundo e até `max_attempts` tentativas por job.
+    """
+
+    def __init__(self, data_root: Path, checkpoint: Checkpoint, endpoint: str = PSI_ENDPOINT,
+                 key: Optional[str] = None, concurrency: int = 16, rate: float = 4.0, burst: int = 4,
+                 max_attempts: int = 5, backoff: float = 2.0, max_backoff: float = 120.0, locale: str = "pt"):
+        self.data_root = Path(data_root)
+        self.checkpoint = checkpoint
+        self.endpoint = endpoint
+        self.key = key
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.locale = locale
+        self.stats = CollectorStats()
+
+    def query(self, job: Job) -> str:
+        params = [("url", job.target.url), ("strategy", job.strategy), ("locale", self.locale)]
+        params += [("category", category) for category in CATEGORIES]
+        if self.key:
+            params.append(("key", self.key))
+        return urlencode(params)
+
+    async def _fetch(self, pool: ConnectionPool, bucket: TokenBucket, job: Job) -> dict:
+        for attempt in range(1, self.max_attempts + 1):
+            await bucket.acquire()
+            try:
+                status, headers, body = await pool.get(self.query(job))
+                if status != 200:
+                    raise HTTPError(status, body, parse_retry_after(headers.get("retry-after")))
+                report = json.loads(body)["lighthouseResult"]
+                self.stats.bytes += len(body)
+                return report
+            except (HTTPError, OSError, asyncio.IncompleteReadError, ValueError, KeyError) as exc:
+                retryable = not isinstance(exc, HTTPError) or exc.status in RETRY_STATUS
+                if not retryable or attempt == self.max_attempts:
+                    raise
+                # Backoff exponencial com jitter; Retry-After do servidor tem precedência.
+                delay = getattr(exc, "retry_after", None)
+                if delay is None:
+                    delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+                self.stats.retries += 1
+                print(f"  {job.key}: {exc} (tentativa {attempt}/{self.max_attempts}, nova em {delay:.1f} s)")
+                await asyncio.sleep(delay)
+
+    def _write(self, job: Job, report: dict) -> Path:
+        directory = report_dir(self.data_root, job.target.app, job.target.page, job.strategy)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / report_filename(job.target.url, job.strategy, report.get("fetchTime", ""))
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(report, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    async def _worker(self, queue: asyncio.Queue, pool: ConnectionPool, bucket: TokenBucket) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                report = await self._fetch(pool, bucket, job)
+                # Gravação e checkpoint sem await entre eles: um cancelamento (Ctrl+C)
+                # não deixa relatório gravado fora do checkpoint.
+                path = self._write(job, report)
+                self.checkpoint.record(job, "ok", file=str(path))
+                self.stats.ok += 1
+                print(f"  {job.key}: {path.name}")
+            except Exception as exc:
+                self.checkpoint.record(job, "failed", error=str(exc))
+                self.stats.failed += 1
+                print(f"  {job.key}: FALHOU ({exc})")
+            finally:
+                queue.task_done()
+
+    async def run(self, jobs: List[Job]) -> CollectorStats:
+        pending = [job for job in jobs if job.key not in self.checkpoint.done]
+        self.stats.skipped = len(jobs) - len(pending)
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in pending:
+            queue.put_nowait(job)
+        pool = ConnectionPool(self.endpoint, self.concurrency)
+        bucket = TokenBucket(self.rate, self.burst)
+        workers = [asyncio.create_task(self._worker(queue, pool, bucket))
+                   for _ in range(min(self.concurrency, len(pending)))]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            pool.close()
+            self.stats.connections = pool.opened
+        return self.stats
+
+
+def build_jobs(targets: List[Target], strategies: List[str], runs: int) -> List[Job]:
+    """Jobs intercalados por rodada, para que uma interrupção deixe todas as páginas com dados."""
+    return [Job(target, strategy, run)
+            for run in range(1, runs + 1) for target in targets for strategy in strategies]
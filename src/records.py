@@ -0,0 +1,142 @@
+"""
+Modelo compacto dos registros por página usados pelos gráficos.
+
+Em vez de um dict por linha (com as strings de app/módulo/página/plataforma
+repetidas), `RecordTable` guarda um array estruturado do NumPy: cada campo
+categórico vira um código inteiro que indexa uma lista de nomes internados, e
+as estatísticas (mean, median, stdev, min, max) ficam em colunas float. Filtros
+são máscaras booleanas e os agrupamentos usam np.unique/np.bincount, sem laços
+em Python por registro.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .stats import grouped_mean_stdev
+
+STAT_FIELDS = ["mean", "median", "stdev", "min", "max"]
+
+
+class RecordTable:
+    """
+    Registros com campos categóricos codificados. `key_field` é "metric"
+    (performance) ou "category" (scores); a unidade também é categórica.
+    """
+
+    def __init__(self, key_field: str, data: np.ndarray, categories: Dict[str, List[str]]):
+        self.key_field = key_field
+        self.data = data
+        self.categories = categories
+        self._lookup = {field: {name: code for code, name in enumerate(names)}
+                        for field, names in categories.items()}
+
+    @property
+    def fields(self) -> List[str]:
+        return ["app", "module", "page", "platform", self.key_field]
+
+    @staticmethod
+    def dtype(key_field: str) -> np.dtype:
+        return np.dtype([(field, "u4") for field in ["app", "module", "page", "platform", key_field, "unit"]]
+                        + [(name, "f8") for name in STAT_FIELDS])
+
+    @classmethod
+    def from_columns(cls, key_field: str, categories: Dict[str, List[str]],
+                     codes: Dict[str, np.ndarray], stats: Dict[str, np.ndarray]) -> "RecordTable":
+        n = len(stats[STAT_FIELDS[0]])
+        data = np.zeros(n, dtype=cls.dtype(key_field))
+        for field, values in codes.items():
+            data[field] = values
+        for name in STAT_FIELDS:
+            data[name] = stats[name]
+        return cls(key_field, data, categories)
+
+    @classmethod
+    def from_dicts(cls, key_field: str, records: Iterable[dict]) -> "RecordTable":
+        """Converte registros no formato de read_performance/read_scores."""
+        records = list(records)
+        fields = ["app", "module", "page", "platform", key_field, "unit"]
+        categories: Dict[str, List[str]] = {field: [] for field in fields}
+        lookup: Dict[str, Dict[str, int]] = {field: {} for field in fields}
+        codes = {field: np.empty(len(records), dtype=np.uint32) for field in fields}
+        for pos, rec in enumerate(records):
+            for field in fields:
+                value = rec.get(field, "")
+                code = lookup[field].get(value)
+                if code is None:
+                    code = lookup[field][value] = len(categories[field])
+                    categories[field].append(value)
+                codes[field][pos] = code
+        stats = {name: np.array([rec[name] for rec in records], dtype=float) for name in STAT_FIELDS}
+        return cls.from_columns(key_field, categories, codes, stats)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _subset(self, data: np.ndarray) -> "RecordTable":
+        table = RecordTable.__new__(RecordTable)
+        table.key_field = self.key_field
+        table.data = data
+        table.categories = self.categories
+        table._lookup = self._lookup
+        return table
+
+    def mask(self, **filters: Optional[str]) -> np.ndarray:
+        """Máscara dos registros cujos campos batem com os filtros (None = qualquer valor)."""
+        selected = np.ones(len(self.data), dtype=bool)
+        for field, value in filters.items():
+            if value is None:
+                continue
+            code = self._lookup[field].get(value)
+            if code is None:
+                return np.zeros(len(self.data), dtype=bool)
+            selected &= self.data[field] == code
+        return selected
+
+    def select(self, **filters: Optional[str]) -> "RecordTable":
+        """Subconjunto filtrado, na ordem original."""
+        if all(value is None for value in filters.values()):
+            return self
+        return self._subset(self.data[self.mask(**filters)])
+
+    def unique(self, field: str) -> List[str]:
+        """Nomes presentes no campo, em ordem alfabética."""
+        names = self.categories[field]
+        return sorted(names[code] for code in np.unique(self.data[field]))
+
+    def unit(self) -> str:
+        return self.categories["unit"][self.data["unit"][0]] if len(self.data) else ""
+
+    def _group_codes(self, key_fields: Sequence[str]):
+        """(chaves únicas como tuplas de nomes, código do grupo de cada registro)."""
+        # Combina os códigos em um único inteiro (base mista), o que deixa np.unique em 1-D.
+        sizes = [max(len(self.categories[field]), 1) for field in key_fields]
+        combined = np.ravel_multi_index([self.data[field].astype(np.intp) for field in key_fields], sizes)
+        unique, inverse = np.unique(combined, return_inverse=True)
+        columns = [[self.categories[field][code] for code in codes.tolist()]
+                   for field, codes in zip(key_fields, np.unravel_index(unique, sizes))]
+        return list(zip(*columns)), inverse.ravel()
+
+    def group_mean_stdev(self, key_fields: Sequence[str], value_field: str = "mean") -> Dict[tuple, dict]:
+        """Média e DP de `value_field` por combinação de `key_fields`."""
+        if not len(self.data):
+            return {}
+        keys, codes = self._group_codes(key_fields)
+        means, stdevs = grouped_mean_stdev(codes, self.data[value_field], len(keys))
+        return {key: {"mean": float(means[code]), "stdev": float(stdevs[code])} for code, key in enumerate(keys)}
+
+    def group_by(self, key_fields: Sequence[str]) -> Dict[tuple, "RecordTable"]:
+        """Chave -> subconjunto de registros, cada um na ordem original."""
+        if not len(self.data):
+            return {}
+        keys, codes = self._group_codes(key_fields)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+        return {key: self._subset(self.data[rows]) for key, rows in zip(keys, np.split(order, bounds))}
+
+    def to_dicts(self) -> List[dict]:
+        """Registros no formato de dicts de read_performance/read_scores."""
+        units = self.categories["unit"]
+        return [{**{field: self.categories[field][row[field]] for field in self.fields},
+                 **{name: float(row[name]) for name in STAT_FIELDS},
+                 "unit": units[row["unit"]]}
+                for row in self.data]
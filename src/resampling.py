@@ -0,0 +1,101 @@
+"""
+Intervalos de confiança por bootstrap e testes de permutação, vetorizados.
+
+As reamostras são matrizes de índices (reamostras × execuções) sorteadas de
+uma vez com semente fixa; cada estatística é reduzida pelo eixo das execuções
+para todas as reamostras e colunas juntas. Média, mediana e P75 saem de uma
+única ordenação por reamostra, com a interpolação linear de np.percentile.
+"""
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from src.config import RESULTS_ROOT
+
+# Estatísticas com intervalo de confiança: nome -> quantil (None = média).
+CI_STATS = {"mean": None, "median": 0.5, "p75": 0.75}
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_CONFIDENCE = 0.95
+TESTS_PATH = RESULTS_ROOT / "significance_tests.csv"
+
+
+def ci_paths(module: str) -> Tuple[Path, Path]:
+    """(CSV de métricas, CSV de scores) com os IC de um módulo, ao lado dos CSVs de médias."""
+    prefix = module.lower()
+    return RESULTS_ROOT / f"{prefix}_metrics_ci.csv", RESULTS_ROOT / f"{prefix}_scores_ci.csv"
+
+
+def _sorted_quantile(sorted_values: np.ndarray, q: float, axis: int) -> np.ndarray:
+    """Quantil `q` de valores já ordenados ao longo de `axis` (método linear do NumPy)."""
+    n = sorted_values.shape[axis]
+    position = q * (n - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n - 1)
+    below = np.take(sorted_values, lower, axis=axis)
+    above = np.take(sorted_values, upper, axis=axis)
+    return below + (above - below) * (position - lower)
+
+
+def _statistics(samples: np.ndarray, axis: int) -> Dict[str, np.ndarray]:
+    ordered = np.sort(samples, axis=axis)
+    return {name: samples.mean(axis=axis) if q is None else _sorted_quantile(ordered, q, axis)
+            for name, q in CI_STATS.items()}
+
+
+def bootstrap_ci(values, n_resamples: int = DEFAULT_RESAMPLES, confidence: float = DEFAULT_CONFIDENCE,
+                 seed=0) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Intervalos percentis de bootstrap para as colunas de `values` (execuções,
+    colunas). Retorna {estatística: (estimativa, limite inferior, limite
+    superior)}, cada um com uma entrada por coluna. Sem execuções, tudo NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n_runs, n_cols = values.shape
+    if n_runs == 0:
+        empty = np.full(n_cols, np.nan)
+        return {name: (empty, empty, empty) for name in CI_STATS}
+
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, n_runs, size=(n_resamples, n_runs))
+    resampled = _statistics(values[indices], axis=1)
+    estimates = _statistics(values, axis=0)
+    alpha = (1 - confidence) / 2
+    result = {}
+    for name in CI_STATS:
+        low, high = np.percentile(resampled[name], [100 * alpha, 100 * (1 - alpha)], axis=0)
+        result[name] = (estimates[name], low, high)
+    return result
+
+
+def permutation_test(a, b, n_resamples: int = DEFAULT_RESAMPLES, seed=0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Teste de permutação bilateral da diferença de médias entre as amostras `a`
+    e `b` (execuções, colunas). Retorna (média de a - média de b, p-valor) por
+    coluna; o p-valor usa (1 + extremos) / (1 + reamostras), nunca zero.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if a.ndim == 1:
+        a, b = a[:, np.newaxis], b[:, np.newaxis]
+    observed = a.mean(axis=0) - b.mean(axis=0)
+    if not len(a) or not len(b):
+        return observed, np.full(a.shape[1], np.nan)
+
+    pooled = np.concatenate([a, b])
+    n_a, n_total = len(a), len(pooled)
+    rng = np.random.default_rng(seed)
+    permutations = rng.permuted(np.broadcast_to(np.arange(n_total), (n_resamples, n_total)), axis=1)
+    # Soma do grupo "a" em cada permutação; o grupo "b" é o complemento.
+    sum_a = pooled[permutations[:, :n_a]].sum(axis=1)
+    differences = sum_a / n_a - (pooled.sum(axis=0) - sum_a) / (n_total - n_a)
+    extreme = (np.abs(differences) >= np.abs(observed) - 1e-12).sum(axis=0)
+    return observed, (1 + extreme) / (1 + n_resamples)
+
+
+def yerr(estimates: Sequence[float], lows: Sequence[float], highs: Sequence[float]) -> np.ndarray:
+    """Barras de erro assimétricas (2, n) para o `yerr` do matplotlib a partir de um IC."""
+    estimates = np.asarray(estimates, dtype=float)
+    return np.stack([estimates - np.asarray(lows, dtype=float), np.asarray(highs, dtype=float) - estimates])
@@ -0,0 +1,188 @@
+"""
+Tabela canônica de execuções: uma linha por relatório JSON, com colunas float
+nativas e unidades fixas (tempos em ms, tamanho em bytes, CLS sem unidade,
+scores de 0 a 1).
+
+A tabela é um array estruturado do NumPy gravado em results/runs.npy, com
+app/módulo/página/plataforma e a versão do Lighthouse como códigos inteiros;
+os nomes correspondentes, as unidades e a versão do formato ficam em
+results/runs.json. O .npy é aberto com mmap_mode="r", sem copiar os dados nem
+interpretar texto. Os CSVs de
+results/ são a exportação legível das mesmas execuções.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import PLATFORMS, RESULTS_ROOT
+from src.stats import grouped_describe
+
+RUNS_PATH = RESULTS_ROOT / "runs.npy"
+FORMAT_VERSION = 2
+
+# Chave do data_loader -> (coluna da tabela, unidade gravada)
+METRIC_COLUMNS = {
+    "TTFB": ("ttfb_ms", "ms"),
+    "FCP": ("fcp_ms", "ms"),
+    "TBT": ("tbt_ms", "ms"),
+    "LCP": ("lcp_ms", "ms"),
+    "CLS": ("cls", ""),
+    "SI": ("si_ms", "ms"),
+    "Total Transfer Size": ("transfer_bytes", "bytes"),
+}
+SCORE_COLUMNS = {
+    "performance": "performance",
+    "accessibility": "accessibility",
+    "best-practices": "best_practices",
+    "seo": "seo",
+}
+CODE_FIELDS = ["module", "app", "page", "platform"]
+
+RUN_DTYPE = np.dtype(
+    [("module", "u1"), ("app", "u2"), ("page", "u4"), ("platform", "u1"),
+     ("lighthouse_version", "u1"), ("fetch_time", "datetime64[ms]")]
+    + [(column, "f8") for column, _ in METRIC_COLUMNS.values()]
+    + [(column, "f8") for column in SCORE_COLUMNS.values()]
+)
+
+# Como cada métrica aparece nos CSVs: (fator sobre a unidade da tabela, unidade, casas decimais).
+CSV_FORMAT = {
+    "Total Transfer Size": (1 / 1024, "KB", 2),
+    "CLS": (1, "", 4),
+}
+CSV_FORMAT_DEFAULT = (1, "ms", 2)
+SCORE_CSV_FORMAT = (100, "%", 2)
+
+
+def csv_format(metric: str) -> Tuple[float, str, int]:
+    return CSV_FORMAT.get(metric, CSV_FORMAT_DEFAULT)
+
+
+def _meta_path(path: Path) -> Path:
+    return Path(path).with_suffix(".json")
+
+
+def parse_fetch_time(value: str) -> np.datetime64:
+    """fetchTime do relatório ("2026-01-06T15:27:20.123Z") como datetime64[ms]; NaT se vazio."""
+    if not value:
+        return np.datetime64("NaT", "ms")
+    return np.datetime64(value.rstrip("Z"), "ms")
+
+
+def build_run_table(corpus, runs) -> Tuple[np.ndarray, Dict[str, List[str]]]:
+    """
+    Monta a tabela a partir da saída de data_loader.load_runs, na ordem do
+    corpus (módulo/app, página, Desktop e depois Mobile). Retorna (tabela, categorias).
+    """
+    categories = {field: [] for field in CODE_FIELDS + ["lighthouse_version"]}
+    codes = {field: {} for field in categories}
+    categories["platform"] = list(PLATFORMS)
+    codes["platform"] = {p: i for i, p in enumerate(PLATFORMS)}
+
+    def code(field: str, value: str) -> int:
+        if value not in codes[field]:
+            codes[field][value] = len(categories[field])
+            categories[field].append(value)
+        return codes[field][value]
+
+    rows = []
+    for (module, app), page_files in corpus.items():
+        for page, files_by_platform in page_files.items():
+            for platform in PLATFORMS:
+                for filepath in files_by_platform[platform]:
+                    run = runs.get(filepath)
+                    if run is None:
+                        continue
+                    rows.append((
+                        code("module", module), code("app", app), code("page", page), code("platform", platform),
+                        code("lighthouse_version", run.lighthouse_version), parse_fetch_time(run.fetch_time),
+                        *(float(run.metrics[key]) for key in METRIC_COLUMNS),
+                        *(float(run.scores[key]) for key in SCORE_COLUMNS),
+                    ))
+    return np.array(rows, dtype=RUN_DTYPE), categories
+
+
+def write_run_table(corpus, runs, path: Path = RUNS_PATH) -> int:
+    """Grava runs.npy e runs.json (substituição atômica). Retorna o número de linhas."""
+    table, categories = build_run_table(corpus, runs)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "version": FORMAT_VERSION,
+        "categories": categories,
+        "metrics": {key: {"column": column, "unit": unit} for key, (column, unit) in METRIC_COLUMNS.items()},
+        "scores": {key: {"column": column, "unit": "0-1"} for key, column in SCORE_COLUMNS.items()},
+    }
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+    tmp_meta = _meta_path(path).with_name(_meta_path(path).name + ".tmp")
+    tmp_meta.write_text(json.dumps(meta, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_meta, _meta_path(path))
+    return len(table)
+
+
+class RunTable:
+    """Tabela de execuções aberta em memória mapeada, com os nomes dos códigos."""
+
+    def __init__(self, runs: np.ndarray, categories: Dict[str, List[str]]):
+        self.runs = runs
+        self.categories = categories
+
+    @classmethod
+    def load(cls, path: Path = RUNS_PATH, mmap: bool = True) -> Optional["RunTable"]:
+        """Abre a tabela; None se ela não existir ou for de outra versão do formato."""
+        path = Path(path)
+        meta_path = _meta_path(path)
+        if not path.exists() or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != FORMAT_VERSION:
+            return None
+        runs = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(runs, meta["categories"])
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def pages(self):
+        """
+        Páginas (módulo, app, página) na ordem da tabela e o código de página de
+        cada linha: ([(module, app, page)], códigos).
+        """
+        fields = CODE_FIELDS[:3]
+        sizes = [max(len(self.categories[field]), 1) for field in fields]
+        combined = np.ravel_multi_index([self.runs[field].astype(np.intp) for field in fields], sizes)
+        unique, first, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        # Renumera as páginas pela ordem da primeira aparição na tabela.
+        by_appearance = np.argsort(first, kind="stable")
+        rank = np.empty(len(unique), dtype=np.intp)
+        rank[by_appearance] = np.arange(len(unique))
+        columns = [[self.categories[field][code] for code in codes.tolist()]
+                   for field, codes in zip(fields, np.unravel_index(unique[by_appearance], sizes))]
+        return list(zip(*columns)), rank[inverse.ravel()]
+
+    def page_stats(self):
+        """
+        Estatísticas por página e plataforma, como nos CSVs por página:
+        ([(module, app, page, platform)], estatísticas das métricas, estatísticas
+        dos scores), com cada estatística em um array (grupos, colunas).
+        Métricas ficam na unidade da tabela; scores em porcentagem. Uma plataforma
+        sem execuções numa página que tem execuções na outra sai zerada, como no CSV.
+        """
+        metric_columns = [column for column, _ in METRIC_COLUMNS.values()]
+        score_columns = list(SCORE_COLUMNS.values())
+        metrics = np.stack([self.runs[column] for column in metric_columns], axis=1)
+        scores = np.stack([self.runs[column] for column in score_columns], axis=1) * SCORE_CSV_FORMAT[0]
+
+        pages, page_codes = self.pages()
+        platforms = self.categories["platform"]
+        groups = page_codes * len(platforms) + self.runs["platform"].astype(np.intp)
+        n_groups = len(pages) * len(platforms)
+        keys = [page + (platform,) for page in pages for platform in platforms]
+        return keys, grouped_describe(groups, metrics, n_groups), grouped_describe(groups, scores, n_groups)
@@ -0,0 +1,181 @@
+"""
+Recalcula o score de performance do Lighthouse a partir das métricas da
+tabela de execuções (results/runs.npy) e simula cenários ("e se o LCP cair
+30%?") sobre todas as execuções de uma vez.
+
+Cada métrica vira uma nota pela curva log-normal do Lighthouse (p10 e mediana
+por versão e form factor, a mesma aproximação de erf de
+core/lib/statistics.js), com o reforço acima de 0,9 e o truncamento em 2 casas
+de Audit.computeLogNormalScore; o score da categoria é a média ponderada das
+notas, arredondada a 2 casas. Os cenários multiplicam (ou deslocam) as
+métricas e são avaliados como arrays (cenários × execuções × métricas).
+
+Nos relatórios de data/ (Lighthouse 13.0.1) o score recalculado é igual a
+`categories.performance.score` em todas as execuções.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Métricas pontuadas: chave do data_loader -> coluna de results/runs.npy.
+SCORED_METRICS = {
+    "FCP": "fcp_ms",
+    "SI": "si_ms",
+    "LCP": "lcp_ms",
+    "TBT": "tbt_ms",
+    "CLS": "cls",
+}
+
+# (p10, mediana) por form factor e pesos na categoria, na ordem de SCORED_METRICS.
+# Da versão 10 à 13 do Lighthouse as curvas e os pesos são os mesmos.
+_V10_PROFILE = {
+    "curves": {
+        "Desktop": ((934, 1600), (1311, 2300), (1200, 2400), (150, 350), (0.1, 0.25)),
+        "Mobile": ((1800, 3000), (3387, 5800), (2500, 4000), (200, 600), (0.1, 0.25)),
+    },
+    "weights": (10, 10, 25, 30, 25),
+}
+SCORING_PROFILES = {major: _V10_PROFILE for major in (10, 11, 12, 13)}
+
+# Constantes de core/lib/statistics.js.
+_INVERSE_ERFC_ONE_FIFTH = 0.9061938024368232
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+_ERF_P = 0.3275911
+
+
+def scoring_profile(version: str) -> dict:
+    """Curvas e pesos da versão do Lighthouse (pela versão principal, ex.: "13.0.1" -> 13)."""
+    try:
+        return SCORING_PROFILES[int(version.split(".")[0])]
+    except (KeyError, ValueError):
+        raise ValueError(f"sem curvas de pontuação para o Lighthouse {version!r}")
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """Aproximação de Abramowitz e Stegun 7.1.26, como no Lighthouse."""
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1 / (1 + _ERF_P * x)
+    a1, a2, a3, a4, a5 = _ERF_A
+    y = t * (a1 + t * (a2 + t * (a3 + t * (a4 + t * a5))))
+    return sign * (1 - y * np.exp(-x * x))
+
+
+def log_normal_score(values: np.ndarray, p10: np.ndarray, median: np.ndarray) -> np.ndarray:
+    """Nota de 0 a 1 de cada valor (getLogNormalScore do Lighthouse), elemento a elemento."""
+    tiny = np.finfo(np.float64).tiny
+    with np.errstate(divide="ignore", invalid="ignore"):
+        standardized = (np.log(np.maximum(tiny, values / median)) * _INVERSE_ERFC_ONE_FIFTH
+                        / -np.log(np.maximum(tiny, p10 / median)))
+    complementary = (1 - _erf(standardized)) / 2
+    score = np.where(values <= p10, np.clip(complementary, 0.9, 1),
+                     np.where(values <= median, np.clip(complementary, 0.5, 0.8999999999999999),
+                              np.clip(complementary, 0, 0.49999999999999994)))
+    return np.where(values <= 0, 1.0, score)
+
+
+def audit_score(values: np.ndarray, p10: np.ndarray, median: np.ndarray) -> np.ndarray:
+    """
+    Nota gravada no audit (Audit.computeLogNormalScore): acima de 0,9 a nota
+    ganha um reforço de 5% da distância até 0,9 e é truncada em 2 casas.
+    """
+    score = log_normal_score(values, p10, median)
+    score = np.where(score > 0.9, score + 0.05 * (score - 0.9), score)
+    return np.floor(score * 100) / 100
+
+
+def _round2(x: np.ndarray) -> np.ndarray:
+    """Math.round(x * 100) / 100 (meio para cima, como no JavaScript)."""
+    return np.floor(x * 100 + 0.5) / 100
+
+
+class ScoreSimulator:
+    """Métricas, curvas e pesos de um conjunto de execuções, prontos para avaliar cenários."""
+
+    def __init__(self, metrics: np.ndarray, p10: np.ndarray, median: np.ndarray, weights: np.ndarray):
+        self.metrics = metrics
+        self.p10 = p10
+        self.median = median
+        self.weights = weights
+
+    @classmethod
+    def from_run_table(cls, table, selected: Optional[np.ndarray] = None) -> "ScoreSimulator":
+        """Execuções de uma RunTable (todas, ou as da máscara `selected`)."""
+        runs = table.runs if selected is None else table.runs[selected]
+        metrics = np.stack([np.asarray(runs[column], dtype=np.float64) for column in SCORED_METRICS.values()],
+                           axis=1)
+        shape = metrics.shape
+        p10, median, weights = np.empty(shape), np.empty(shape), np.empty(shape)
+        versions = table.categories["lighthouse_version"]
+        platforms = table.categories["platform"]
+        for version_code in np.unique(runs["lighthouse_version"]).tolist():
+            profile = scoring_profile(versions[version_code])
+            for platform_code in np.unique(runs["platform"]).tolist():
+                rows = (runs["lighthouse_version"] == version_code) & (runs["platform"] == platform_code)
+                curves = np.array(profile["curves"][platforms[platform_code]], dtype=np.float64)
+                p10[rows], median[rows] = curves[:, 0], curves[:, 1]
+                weights[rows] = profile["weights"]
+        return cls(metrics, p10, median, weights)
+
+    def __len__(self) -> int:
+        return len(self.metrics)
+
+    def audit_scores(self, metrics: np.ndarray) -> np.ndarray:
+        """Notas por métrica (..., execuções, métricas), como gravadas nos audits."""
+        return audit_score(metrics, self.p10, self.median)
+
+    def scores(self, factors: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None,
+               chunk: int = 4096) -> np.ndarray:
+        """
+        Score de performance (0 a 1) de cada execução em cada cenário. `factors`
+        e `offsets` têm forma (cenários, métricas) ou (cenários, execuções,
+        métricas), com as métricas na ordem de SCORED_METRICS: o valor simulado é
+        métrica * fator + deslocamento. Sem cenários, devolve só o recálculo
+        (forma (execuções,)). Os cenários são avaliados em blocos de `chunk`.
+        """
+        if factors is None and offsets is None:
+            return self._category(self.metrics)
+        n_scenarios = len(factors if factors is not None else offsets)
+        factors = np.ones((n_scenarios, len(SCORED_METRICS))) if factors is None else np.asarray(factors, float)
+        offsets = np.zeros((n_scenarios, len(SCORED_METRICS))) if offsets is None else np.asarray(offsets, float)
+        out = np.empty((n_scenarios, len(self)))
+        for start in range(0, n_scenarios, chunk):
+            block = slice(start, start + chunk)
+            f, o = factors[block], offsets[block]
+            if f.ndim == 2:
+                f = f[:, None, :]
+            if o.ndim == 2:
+                o = o[:, None, :]
+            out[block] = self._category(self.metrics * f + o)
+        return out
+
+    def _category(self, metrics: np.ndarray) -> np.ndarray:
+        weighted = (self.audit_scores(metrics) * self.weights).sum(axis=-1) / self.weights.sum(axis=-1)
+        return _round2(weighted)
+
+
+def scenario(deltas: Dict[str, float]) -> np.ndarray:
+    """Fatores (métricas,) de um cenário dado em variações percentuais, ex.: {"LCP": -30}."""
+    factors = np.ones(len(SCORED_METRICS))
+    for metric, percent in deltas.items():
+        factors[list(SCORED_METRICS).index(metric)] = 1 + percent / 100
+    return factors
+
+
+def group_means(table, scores: np.ndarray, by: Sequence[str],
+                selected: Optional[np.ndarray] = None) -> Tuple[list, np.ndarray]:
+    """
+    Média de `scores` (..., execuções) por grupo de campos categóricos da
+    RunTable. Retorna ([chaves], médias (..., grupos)).
+    """
+    runs = table.runs if selected is None else table.runs[selected]
+    sizes = [max(len(table.categories[field]), 1) for field in by]
+    combined = np.ravel_multi_index([runs[field].astype(np.intp) for field in by], sizes)
+    unique, groups = np.unique(combined, return_inverse=True)
+    groups = groups.ravel()
+    onehot = np.zeros((len(runs), len(unique)))
+    onehot[np.arange(len(runs)), groups] = 1
+    means = scores @ onehot / onehot.sum(axis=0)
+    keys = list(zip(*[[table.categories[field][c] for c in codes.tolist()]
+                      for field, codes in zip(by, np.unravel_index(unique, sizes))]))
+    return keys, means
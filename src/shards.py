@@ -0,0 +1,128 @@
+"""
+Processamento em shards (map-reduce) do pipeline.
+
+Cada shard (`run_pipeline.py --shard I/N`) extrai só a sua fatia contígua da
+lista de relatórios (na ordem do índice do corpus, já sem duplicatas) e grava
+um arquivo de agregados parciais: por módulo/app/página/plataforma, o estado
+dos RunningStats de métricas e de scores (contagem, média e soma dos
+quadrados dos desvios, mínimo, máximo, sketches de quantis e as linhas ainda
+não incorporadas), mais uma linha enxuta por execução para a tabela de
+execuções.
+
+`run_pipeline.py --merge` combina os parciais na ordem dos shards. Como as
+fatias são contíguas e RunningStats.merge preserva a ordem das linhas
+pendentes, os CSVs e results/runs.npy saem idênticos aos da execução em um
+único processo enquanto nenhum grupo passar de `batch_size` execuções em um
+shard; acima disso, médias e DPs podem variar no último bit.
+"""
+import argparse
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.aggregators import RunningStats
+from src.config import PLATFORMS, RESULTS_ROOT
+from src.data_loader import CATEGORY_KEYS, METRIC_KEYS, RunRecord
+
+PARTIALS_DIR = RESULTS_ROOT / "partials"
+FORMAT_VERSION = 1
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """"I/N" -> (I, N), com 1 <= I <= N (`type` do argparse: erros viram ArgumentTypeError)."""
+    try:
+        shard, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard inválido: {text!r} (use I/N, ex.: 2/4)")
+    if not 1 <= shard <= count:
+        raise argparse.ArgumentTypeError(f"shard inválido: {text!r} (I precisa estar entre 1 e N)")
+    return shard, count
+
+
+def partial_path(directory: Path, shard: int, count: int) -> Path:
+    return Path(directory) / f"shard-{shard:03d}-of-{count:03d}.json"
+
+
+def write_partial(directory: Path, shard: Tuple[int, int], pages, runs) -> Path:
+    """
+    Grava o parcial de um shard. `pages` lista ((module, app, page), {plataforma:
+    (RunningStats de métricas, RunningStats de scores)}) na ordem do corpus, só
+    com as plataformas que têm arquivos no shard; `runs` são (module, app, page,
+    plataforma, RunRecord) das execuções extraídas, na mesma ordem.
+    """
+    partial = {
+        "version": FORMAT_VERSION,
+        "shard": list(shard),
+        "pages": [
+            {"module": module, "app": app, "page": page,
+             "platforms": {platform: {"metrics": metric_acc.to_dict(), "scores": score_acc.to_dict()}
+                           for platform, (metric_acc, score_acc) in accumulators.items()}}
+            for (module, app, page), accumulators in pages
+        ],
+        "runs": [
+            {"module": module, "app": app, "page": page, "platform": platform,
+             **asdict(run), "path": str(run.path)}
+            for module, app, page, platform, run in runs
+        ],
+    }
+    path = partial_path(directory, *shard)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(partial, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def partial_files(directory: Path) -> List[Path]:
+    """Parciais de `directory` na ordem dos shards; exige o conjunto completo 1..N."""
+    paths = sorted(Path(directory).glob("shard-*-of-*.json"))
+    if not paths:
+        raise FileNotFoundError(f"nenhum parcial em {directory}")
+    counts = {int(path.stem.rsplit("-", 1)[1]) for path in paths}
+    if len(counts) != 1:
+        raise ValueError(f"parciais de divisões diferentes em {directory}: {sorted(counts)}")
+    count = counts.pop()
+    missing = [i for i in range(1, count + 1) if not partial_path(directory, i, count).exists()]
+    if missing:
+        raise ValueError(f"faltam os shards {missing} de {count} em {directory}")
+    return [partial_path(directory, i, count) for i in range(1, count + 1)]
+
+
+def merge_partials(paths: List[Path]):
+    """
+    Combina os parciais (na ordem dada). Retorna (pages, corpus, runs):
+    pages mapeia (module, app, page) -> {plataforma: (métricas, scores)} com as
+    duas plataformas; corpus e runs têm o formato de data_loader.load_runs, só
+    com as execuções extraídas, para a tabela de execuções.
+    """
+    pages: Dict[tuple, Dict[str, list]] = {}
+    corpus: Dict[tuple, dict] = {}
+    runs: Dict[Path, RunRecord] = {}
+    for path in paths:
+        partial = json.loads(Path(path).read_text(encoding="utf-8"))
+        if partial.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: versão {partial.get('version')} não suportada")
+        for entry in partial["pages"]:
+            merged = pages.setdefault((entry["module"], entry["app"], entry["page"]), {})
+            for platform, state in entry["platforms"].items():
+                metric_acc = RunningStats.from_dict(state["metrics"])
+                score_acc = RunningStats.from_dict(state["scores"])
+                if platform in merged:
+                    merged[platform][0].merge(metric_acc)
+                    merged[platform][1].merge(score_acc)
+                else:
+                    merged[platform] = [metric_acc, score_acc]
+        for row in partial["runs"]:
+            module, app, page, platform = (row.pop(field) for field in ("module", "app", "page", "platform"))
+            run = RunRecord(**{**row, "path": Path(row["path"])})
+            page_files = corpus.setdefault((module, app), {}).setdefault(page, {p: [] for p in PLATFORMS})
+            page_files[platform].append(run.path)
+            runs[run.path] = run
+
+    for key, merged in pages.items():
+        pages[key] = {platform: tuple(merged.get(platform) or (RunningStats(len(METRIC_KEYS)),
+                                                               RunningStats(len(CATEGORY_KEYS))))
+                      for platform in PLATFORMS}
+    return pages, corpus, runs
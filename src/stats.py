@@ -0,0 +1,109 @@
+"""
+Estatísticas descritivas vetorizadas (NumPy) usadas na agregação dos relatórios.
+
+`describe` resume uma matriz execuções × colunas (métricas ou categorias) em uma
+única passada por estatística; `grouped_describe` faz o mesmo para muitos grupos
+de uma vez e `grouped_mean_stdev` faz média/DP por grupo a partir de códigos
+inteiros, sem laços em Python por grupo.
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Ordem das colunas de estatística nos CSVs por página.
+STAT_NAMES = ["mean", "median", "stdev", "min", "max", "p75", "p90", "p95", "iqr"]
+STAT_LABELS = {
+    "mean": "Média",
+    "median": "Mediana",
+    "stdev": "Desvio Padrão",
+    "min": "Mínimo",
+    "max": "Máximo",
+    "p75": "P75",
+    "p90": "P90",
+    "p95": "P95",
+    "iqr": "Amplitude Interquartil",
+}
+
+
+def describe(values) -> Dict[str, np.ndarray]:
+    """
+    Estatísticas por coluna de uma matriz (n_execuções, n_colunas).
+    Sem execuções, todas as estatísticas valem 0; com uma só, o DP é 0.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n_runs, n_cols = values.shape
+    if n_runs == 0:
+        return {name: np.zeros(n_cols) for name in STAT_NAMES}
+
+    p25, median, p75, p90, p95 = np.percentile(values, [25, 50, 75, 90, 95], axis=0)
+    return {
+        "mean": values.mean(axis=0),
+        "median": median,
+        "stdev": values.std(axis=0, ddof=1) if n_runs > 1 else np.zeros(n_cols),
+        "min": values.min(axis=0),
+        "max": values.max(axis=0),
+        "p75": p75,
+        "p90": p90,
+        "p95": p95,
+        "iqr": p75 - p25,
+    }
+
+
+def grouped_describe(codes, values, n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    describe() para vários grupos de linhas de uma vez; `codes[i]` é o grupo da
+    linha `values[i]`. Devolve arrays (n_grupos, n_colunas) iguais, bit a bit,
+    a chamar describe() em cada grupo: grupos do mesmo tamanho são empilhados
+    em um bloco (k, n, colunas) e reduzidos juntos pelo eixo das execuções.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n_cols = values.shape[1]
+    result = {name: np.zeros((n_groups, n_cols)) for name in STAT_NAMES}
+
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    for size in np.unique(counts[counts > 0]):
+        groups = np.flatnonzero(counts == size)
+        block = values[order[starts[groups, np.newaxis] + np.arange(size)]]
+        p25, median, p75, p90, p95 = np.percentile(block, [25, 50, 75, 90, 95], axis=1)
+        stats = {
+            "mean": block.mean(axis=1),
+            "median": median,
+            "stdev": block.std(axis=1, ddof=1) if size > 1 else np.zeros((len(groups), n_cols)),
+            "min": block.min(axis=1),
+            "max": block.max(axis=1),
+            "p75": p75,
+            "p90": p90,
+            "p95": p95,
+            "iqr": p75 - p25,
+        }
+        for name in STAT_NAMES:
+            result[name][groups] = stats[name]
+    return result
+
+
+def column_stats(stats: Dict[str, np.ndarray], col: int, names: Sequence[str] = STAT_NAMES) -> Dict[str, float]:
+    """Extrai de `describe` as estatísticas de uma coluna como floats."""
+    return {name: float(stats[name][col]) for name in names}
+
+
+def grouped_mean_stdev(codes, values, n_groups: int):
+    """
+    Média e DP amostral por grupo; `codes[i]` é o grupo de `values[i]`.
+    Usa duas passadas (média, depois desvios) para manter a precisão.
+    Grupos com um único valor têm DP 0; grupos vazios, média 0.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    values = np.asarray(values, dtype=float)
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    means = np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0)
+    squared = np.bincount(codes, weights=(values - means[codes]) ** 2, minlength=n_groups)
+    stdevs = np.sqrt(np.divide(squared, counts - 1, out=np.zeros(n_groups), where=counts > 1))
+    return means, stdevs